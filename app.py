@@ -1,18 +1,34 @@
+import base64
+import bisect
+import ctypes
+import ctypes.util
+import errno
+import gzip
 import hashlib
 import json
+import multiprocessing
 import os
+import queue
 import re
+import select
 import shutil
-import tempfile
+import sqlite3
+import struct
+import sys
+import threading
 import time
 import zipfile
-from collections import Counter
+import zlib
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import lru_cache, partial
 from io import BytesIO
 from pathlib import Path
+from typing import NamedTuple
 
 import fitz  # PyMuPDF
 import rarfile
-from flask import Flask, jsonify, render_template, request, send_file
+from flask import Flask, Response, has_request_context, jsonify, render_template, request, send_file
 from PIL import Image
 from unidecode import unidecode
 
@@ -36,6 +52,10 @@ DEFAULT_CONFIG = {
     "audit_case": "first",  # "ignore", "first", "title"
     "dashboard_enabled": False,
     "thumbnails_enabled": True,
+    "watch_enabled": False,
+    "verify_enabled": False,
+    "stats_enabled": False,
+    "convert_workers": 0,  # conversion processes, 0: half the CPUs
     "lang": "fr",
 }
 
@@ -53,8 +73,54 @@ def get_extensions(cfg: dict | None = None) -> set[str]:
         return DEFAULT_EXTENSIONS
     return {e.lower() for e in exts}
 
+# Action history, indexed by time, action and series (see _history_db)
+HISTORY_DB_PATH = Path(__file__).parent / "history.db"
+HISTORY_DB_VERSION = 1
+HISTORY_PAGE_SIZE = 500
+HISTORY_PAGE_MAX = 5000
+# Earlier history formats, imported once into history.db
 HISTORY_PATH = Path(__file__).parent / "history.json"
-HISTORY_MAX_ENTRIES = 500
+HISTORY_JOURNAL_PATH = Path(__file__).parent / "history.jsonl"
+HISTORY_ARCHIVE_PATH = Path(__file__).parent / "history.archive.jsonl.gz"
+
+# Thread pool size for walking source/destination trees (one task per top-level subdirectory)
+SCAN_WORKERS = 8
+
+# On-disk cache of per-file analysis results for list_files()
+SCAN_INDEX_PATH = Path(__file__).parent / "scan_index.json"
+SCAN_INDEX_VERSION = 1
+
+# SQLite catalog of destinations -> series -> volumes (see refresh_catalog)
+LIBRARY_DB_PATH = Path(__file__).parent / "library.db"
+LIBRARY_DB_VERSION = 5
+
+# Background conversion jobs (queue persisted across restarts, see submit_conversion); jobs listed
+CONVERT_JOBS_DB_PATH = Path(__file__).parent / "jobs.db"
+CONVERT_JOBS_DB_VERSION = 3
+CONVERT_JOBS_LISTED = 20
+
+# Dashboard: seconds before its counters are reconciled with a catalog refresh (in the background)
+DASHBOARD_RECONCILE_INTERVAL = 5 * 60
+
+# Content hashing for duplicate detection: head/tail block size of the partial hash, hashing threads
+HASH_BLOCK_SIZE = 64 * 1024
+HASH_WORKERS = 4
+
+# Background archive verifier: threads (at idle priority), seconds between sweeps, verified formats
+VERIFY_WORKERS = 2
+VERIFY_INTERVAL = 15 * 60
+VERIFY_EXTENSIONS = {".cbz", ".zip", ".cbr", ".rar", ".pdf"}
+
+# Background page statistics sampler: pages whose image header is read per volume, bytes read
+# per sampled page, volumes per batch, threads; pages shorter than STATS_LOW_RES_HEIGHT are low resolution
+STATS_SAMPLE_PAGES = 3
+STATS_HEADER_BYTES = 64 * 1024
+STATS_BATCH = 200
+STATS_WORKERS = 2
+STATS_LOW_RES_HEIGHT = 1200
+
+# Series guesses confirmed by organizing files: normalized guess -> series folder
+ALIASES_PATH = Path(__file__).parent / "aliases.json"
 
 # Pre-compiled regex patterns for tome detection
 _RE_BRACKETS = re.compile(r"\[.*?\]")
@@ -87,11 +153,17 @@ def load_config() -> dict:
     return dict(DEFAULT_CONFIG)
 
 
+# Set whenever the config, series catalog, aliases or corrupt-file verdicts change, so the
+# source watcher re-checks what its payloads depend on (see _watch_loop)
+_watch_inputs_changed = threading.Event()
+
+
 def save_config(cfg: dict) -> None:
     """Write configuration to config.json."""
     with open(CONFIG_PATH, "w", encoding="utf-8") as f:
         json.dump(cfg, f, indent=2, ensure_ascii=False)
         f.write("\n")
+    _watch_inputs_changed.set()
 
 
 def get_sources(cfg: dict | None = None) -> list[str]:
@@ -106,22 +178,55 @@ def get_sources(cfg: dict | None = None) -> list[str]:
     return sources
 
 
+# Pre-compiled patterns for normalize()
+_RE_NORM_PUNCT = re.compile(r"['\-:!?,./()&]")
+_RE_NORM_ARTICLES = re.compile(r"\b(l|le|la|les|the|d|de|du|des|un|une)\b")
+_RE_SPACES = re.compile(r"\s+")
+
+# Pre-compiled patterns for detect_series(), in application order. Passes are only
+# fused where a single alternation provably gives the same result as applying them
+# one after the other (disjoint matches, each cutting to the end of the string).
+_RE_BDFR_PREFIX = re.compile(r"^BD\.FR\.\-\.?\s*")
+_RE_NOISE_YEAR = re.compile(r"(?i)\b(?:digital|rip[- ]?club|prof\.?x|tch|neo|toner|pitoufos|seulementbd)\b|\b\d{4}\b")
+_RE_TOME_TAIL = re.compile(r"(?i)[\s\-]+(?:T\s?\d+|Tome\s*\d+|Vol(?:ume)?\.?\s*\d+).*$")
+_RE_DASH_NUMBER_SUB = re.compile(r"\s*-\s*\d{1,4}\s*-.*$")  # " - 01 - subtitle"
+_RE_DASH_NUMBER_END = re.compile(r"\s*-\s*\d{1,4}\s*$")     # trailing " - 01"
+_RE_NUMBER_MIDDLE = re.compile(r"\s+\d{1,3}\s+.*$")         # "series 02 subtitle"
+_RE_NUMBER_END = re.compile(r"\s+\d{1,3}$")
+_RE_ONE_SHOT = re.compile(r"\b-?\s*OS\s*-?\b")
+_RE_EDGE_SEPARATORS = re.compile(r"^[\s\-_.]+|[\s\-_.]+$")
+_RE_MULTI_SPACES = re.compile(r"\s{2,}")
+
+_RE_TITLE = re.compile(
+    r"(?i)"
+    r"(?:\btome[\s._-]*\d+|(?<![a-z])T[\s._-]?\d{1,3}(?!\d)|\bvol(?:ume)?[\s._-]*\d+)"
+    r"[\s._-]*[-–—]?\s*(.*)",
+)
+
+PARSE_CACHE_SIZE = 8192
+
+
+class ParsedName(NamedTuple):
+    series: str
+    tome: int | None
+    title: str
+    series_norm: str
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
 def normalize(name: str) -> str:
     """Normalize a series name for matching: lowercase, strip accents, articles, punctuation."""
     name = name.lower().strip()
     name = unidecode(name)  # é→e, à→a, ü→u
-    name = re.sub(r"['\-:!?,./()&]", " ", name)  # punctuation → space
-    name = re.sub(r"\b(l|le|la|les|the|d|de|du|des|un|une)\b", "", name)  # articles
-    name = re.sub(r"\s+", " ", name).strip()
+    name = _RE_NORM_PUNCT.sub(" ", name)  # punctuation → space
+    name = _RE_NORM_ARTICLES.sub("", name)  # articles
+    name = _RE_SPACES.sub(" ", name).strip()
     return name
 
 
-def detect_tome(filename: str) -> int | None:
-    """Detect tome/volume number from a filename."""
-    name = Path(filename).stem
-
+def _parse_tome(stem: str) -> int | None:
     # Strip bracket/paren metadata before detection to avoid false positives
-    cleaned = _RE_BRACKETS.sub("", name)
+    cleaned = _RE_BRACKETS.sub("", stem)
     cleaned = _RE_PARENS.sub("", cleaned)
     cleaned = _RE_DIGITAL.sub("", cleaned)
 
@@ -133,37 +238,23 @@ def detect_tome(filename: str) -> int | None:
     return None
 
 
-_RE_TITLE = re.compile(
-    r"(?i)"
-    r"(?:\btome[\s._-]*\d+|(?<![a-z])T[\s._-]?\d{1,3}(?!\d)|\bvol(?:ume)?[\s._-]*\d+)"
-    r"[\s._-]*[-–—]?\s*(.*)",
-)
-
-
-def detect_title(filename: str) -> str:
-    """Extract the title part from a filename (text after the tome indicator)."""
-    name = Path(filename).stem
-    m = _RE_TITLE.search(name)
+def _parse_title(stem: str) -> str:
+    m = _RE_TITLE.search(stem)
     if m:
-        title = m.group(1).strip().strip("-–— ").strip()
-        return title
+        return m.group(1).strip().strip("-–— ").strip()
     return ""
 
 
-def detect_series(filename: str) -> str:
-    """Guess the series name from a filename."""
-    name = Path(filename).stem
-
+def _parse_series(stem: str) -> str:
     # Strip BD.FR.- prefix
-    name = re.sub(r"^BD\.FR\.\-\.?\s*", "", name)
+    name = _RE_BDFR_PREFIX.sub("", stem)
 
     # Remove common bracket/paren blocks: (auteur), [Digital-xxx], [NEO RIP-Club], (année), (éditeur)
-    name = re.sub(r"\[.*?\]", "", name)
-    name = re.sub(r"\(.*?\)", "", name)
+    name = _RE_BRACKETS.sub("", name)
+    name = _RE_PARENS.sub("", name)
 
-    # Remove known noise patterns
-    name = re.sub(r"(?i)\b(digital|rip[- ]?club|prof\.?x|tch|neo|toner|pitoufos|seulementbd)\b", "", name)
-    name = re.sub(r"\b\d{4}\b", "", name)  # years like 2024
+    # Remove known noise patterns and years like 2024
+    name = _RE_NOISE_YEAR.sub("", name)
 
     # Replace dots/underscores used as separators with spaces
     if "." in name and " " not in name.strip():
@@ -172,128 +263,692 @@ def detect_series(filename: str) -> str:
 
     # Remove tome/volume indicators and everything after
     # "T01", "T 01", "Tome 1", "Vol.1", "- 01 -", "- Tome 1"
-    name = re.sub(r"(?i)[\s\-]+T\s?\d+.*$", "", name)
-    name = re.sub(r"(?i)[\s\-]+Tome\s*\d+.*$", "", name)
-    name = re.sub(r"(?i)[\s\-]+Vol(?:ume)?\.?\s*\d+.*$", "", name)
-    name = re.sub(r"\s*-\s*\d{1,4}\s*-.*$", "", name)  # " - 01 - subtitle"
-    name = re.sub(r"\s*-\s*\d{1,4}\s*$", "", name)      # trailing " - 01"
+    name = _RE_TOME_TAIL.sub("", name)
+    name = _RE_DASH_NUMBER_SUB.sub("", name)
+    name = _RE_DASH_NUMBER_END.sub("", name)
     # Standalone number in middle/end of name: "series 02 subtitle"
-    name = re.sub(r"\s+\d{1,3}\s+.*$", "", name)
-    name = re.sub(r"\s+\d{1,3}$", "", name)
+    name = _RE_NUMBER_MIDDLE.sub("", name)
+    name = _RE_NUMBER_END.sub("", name)
 
     # Remove "OS" (one-shot marker)
-    name = re.sub(r"\b-?\s*OS\s*-?\b", "", name)
+    name = _RE_ONE_SHOT.sub("", name)
 
     # Clean up trailing/leading separators and whitespace
-    name = re.sub(r"[\s\-_.]+$", "", name)
-    name = re.sub(r"^[\s\-_.]+", "", name)
-    name = re.sub(r"\s{2,}", " ", name)
+    name = _RE_EDGE_SEPARATORS.sub("", name)
+    name = _RE_MULTI_SPACES.sub(" ", name)
 
     return name.strip()
 
 
-_series_cache: dict | None = None
-_series_cache_time: float = 0
-_norm_cache: dict[str, str] = {}  # series_key -> normalized_key
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_filename(filename: str) -> ParsedName:
+    """Parse a filename once into series guess, tome, title and normalized series (memoized)."""
+    stem = Path(filename).stem
+    series = _parse_series(stem)
+    return ParsedName(series, _parse_tome(stem), _parse_title(stem), normalize(series))
+
+
+def detect_tome(filename: str) -> int | None:
+    """Detect tome/volume number from a filename."""
+    return parse_filename(filename).tome
+
+
+def detect_title(filename: str) -> str:
+    """Extract the title part from a filename (text after the tome indicator)."""
+    return parse_filename(filename).title
+
+
+def detect_series(filename: str) -> str:
+    """Guess the series name from a filename."""
+    return parse_filename(filename).series
 
 
-def get_existing_series(ttl: float = 30) -> dict[str, list[dict]]:
-    """Scan all destination folders and return existing series with their location.
+class SeriesIndex(NamedTuple):
+    """The cached series catalog and its matching index (see _match_candidates).
 
-    Results are cached for `ttl` seconds to avoid repeated filesystem scans.
-    Also pre-computes normalized keys for fast matching.
+    Never mutated: changes build a new one that replaces `_series_index` in a
+    single assignment, so readers always see consistent fields.
     """
-    global _series_cache, _series_cache_time, _norm_cache
-    now = time.time()
-    if _series_cache is not None and (now - _series_cache_time) < ttl:
-        return _series_cache
+    series: dict[str, list[dict]] | None  # series_key -> entries; None: not built yet
+    norms: dict[str, str]                 # series_key -> normalized_key
+    norm_keys: dict[str, set[str]]        # normalized_key -> series_keys
+    token_index: dict[str, set[str]]      # token of a normalized_key -> series_keys
+    sorted_norms: list[str]               # distinct normalized keys, sorted for prefix lookups
+    key_order: dict[str, int]             # series_key -> catalog position (tie-breaks)
+    sorted_tokens: list[str]              # distinct tokens, sorted for word-prefix lookups
+    trigram_index: dict[str, set[str]]    # trigram of a padded normalized_key -> series_keys
+    trigram_sizes: dict[str, int]         # series_key -> number of distinct trigrams
+    sig_acc: int                          # XOR of per-entry digests, so the hash updates incrementally
+    sig: str                              # content hash of the catalog (scan index invalidation)
 
-    series = {}
-    norms = {}
-    cfg = load_config()
-    for dest in cfg["destinations"]:
-        dest_path = Path(dest)
-        if not dest_path.is_dir():
+
+_EMPTY_SERIES_INDEX = SeriesIndex(None, {}, {}, {}, [], {}, [], {}, {}, 0, "")
+_series_index = _EMPTY_SERIES_INDEX
+_series_dests: dict[str, dict] = {}  # destination -> {"mtime_ns", "names"} of the last listing
+_series_lock = threading.RLock()
+_key_seq: int = 0  # next catalog position handed out to a new series key
+
+
+# A destination modified this recently may change again within the same mtime
+# tick (coarse timestamps on network shares): its listing is not trusted yet.
+SERIES_MTIME_SETTLE_NS = 2_000_000_000
+
+
+def get_existing_series() -> dict[str, list[dict]]:
+    """Return existing series folders of all destinations with their location.
+
+    The folder lists come from the library catalog, where each destination is
+    re-listed only when its directory mtime changed; only the added/removed
+    folders are applied to the cached map and its normalized keys / match index.
+    """
+    with _series_lock:
+        cfg = load_config()
+        destinations = cfg["destinations"]
+        refresh_catalog(destinations, volumes=False)
+        added: list[tuple[str, str]] = []
+        removed: list[tuple[str, str]] = []
+
+        for dest in list(_series_dests):
+            if dest not in destinations:
+                removed.extend((dest, name) for name in _series_dests.pop(dest)["names"])
+
+        for dest in destinations:
+            state = _series_dests.get(dest)
+            if (state is not None and state["mtime_ns"] is not None
+                    and _catalog_destination_mtime(dest) == state["mtime_ns"]):
+                continue
+            mtime_ns, names = _catalog_series_dirs(dest)
+            old_names = state["names"] if state is not None else set()
+            new_names = set(names)
+            added.extend((dest, name) for name in names if name not in old_names)
+            removed.extend((dest, name) for name in old_names - new_names)
+            _series_dests[dest] = {"mtime_ns": mtime_ns, "names": new_names}
+
+        if _series_index.series is None or added or removed:
+            _apply_catalog_changes(destinations, added, removed)
+        return _series_index.series
+
+
+def refresh_series(destination: str, series_name: str) -> None:
+    """Update a single catalog entry after a series folder was created, filled or removed."""
+    refresh_catalog_series(destination, series_name)
+    with _series_lock:
+        state = _series_dests.get(destination)
+        if _series_index.series is None or state is None:
+            return  # built in full on next get_existing_series()
+        exists = (Path(destination) / series_name).is_dir()
+        if exists and series_name not in state["names"]:
+            state["names"].add(series_name)
+            _apply_catalog_changes(load_config()["destinations"], [(destination, series_name)], [])
+        elif not exists and series_name in state["names"]:
+            state["names"].discard(series_name)
+            _apply_catalog_changes(load_config()["destinations"], [], [(destination, series_name)])
+        else:
+            return
+        # The destination mtime moved because of this change only: record it so
+        # the next get_existing_series() does not re-list the destination
+        state["mtime_ns"] = _record_destination_mtime(destination)
+
+
+def refresh_library_path(path: str | Path) -> None:
+    """refresh_series() for the series folder holding the volume at `path`, if it is in a destination."""
+    resolved = Path(path).resolve()
+    for dest in load_config()["destinations"]:
+        try:
+            rel = resolved.relative_to(Path(dest).resolve())
+        except ValueError:
             continue
-        dest_label = dest_path.name
-        for d in dest_path.iterdir():
-            if d.is_dir() and not d.name.startswith("@"):
-                key = d.name.lower()
-                if key not in series:
-                    series[key] = []
-                    norms[key] = normalize(key)
-                series[key].append({
-                    "name": d.name,
-                    "destination": dest,
-                    "dest_label": dest_label,
-                })
-    _series_cache = series
-    _norm_cache = norms
-    _series_cache_time = now
-    return series
+        if len(rel.parts) > 1:
+            refresh_series(dest, rel.parts[0])
+        return
+
+
+def _entry_digest(destination: str, name: str) -> int:
+    return int(hashlib.sha1(f"{destination}|{name}\n".encode("utf-8")).hexdigest(), 16)
+
+
+def _posting_add(index: dict[str, set[str]], copied: set[str], term: str, key: str) -> bool:
+    """Add key to index[term], copying a shared set once per batch. True if term is new."""
+    if term not in index:
+        index[term] = {key}
+        copied.add(term)
+        return True
+    if term not in copied:
+        index[term] = set(index[term])
+        copied.add(term)
+    index[term].add(key)
+    return False
+
+
+def _posting_remove(index: dict[str, set[str]], copied: set[str], term: str, key: str) -> bool:
+    """Remove key from index[term], copying a shared set once per batch. True if term is gone."""
+    if index[term] == {key}:
+        del index[term]
+        return True
+    if term not in copied:
+        index[term] = set(index[term])
+        copied.add(term)
+    index[term].discard(key)
+    return False
+
+
+def _apply_catalog_changes(destinations: list[str], added: list[tuple[str, str]],
+                           removed: list[tuple[str, str]]) -> None:
+    """Apply (destination, folder name) additions/removals to the catalog and match index.
+
+    Changes are made on copies that are swapped in at the end as one new
+    SeriesIndex, so readers never see a container being mutated nor a mix of
+    old and new fields.
+    """
+    global _series_index, _key_seq
+    index = _series_index
+    series = dict(index.series or {})
+    norms = dict(index.norms)
+    norm_keys = dict(index.norm_keys)
+    token_index = dict(index.token_index)
+    key_order = dict(index.key_order)
+    trigram_index = dict(index.trigram_index)
+    trigram_sizes = dict(index.trigram_sizes)
+    copied_norms: set[str] = set()
+    copied_tokens: set[str] = set()
+    copied_grams: set[str] = set()
+    dest_rank = {dest: i for i, dest in enumerate(destinations)}
+    sig_acc = index.sig_acc
+    resort_norms = resort_tokens = False
+
+    for dest, name in removed:
+        key = name.lower()
+        entries = [e for e in series.get(key, ()) if not (e["destination"] == dest and e["name"] == name)]
+        if len(entries) == len(series.get(key, ())):
+            continue
+        sig_acc ^= _entry_digest(dest, name)
+        if entries:
+            series[key] = entries
+            continue
+        del series[key]
+        del key_order[key]
+        del trigram_sizes[key]
+        s_norm = norms.pop(key)
+        resort_norms |= _posting_remove(norm_keys, copied_norms, s_norm, key)
+        for token in set(s_norm.split()):
+            resort_tokens |= _posting_remove(token_index, copied_tokens, token, key)
+        for gram in _trigrams(s_norm):
+            _posting_remove(trigram_index, copied_grams, gram, key)
+
+    for dest, name in added:
+        key = name.lower()
+        entry = {"name": name, "destination": dest, "dest_label": Path(dest).name}
+        sig_acc ^= _entry_digest(dest, name)
+        if key in series:
+            series[key] = sorted(series[key] + [entry], key=lambda e: dest_rank.get(e["destination"], len(dest_rank)))
+            continue
+        series[key] = [entry]
+        s_norm = norms[key] = normalize(key)
+        key_order[key] = _key_seq
+        _key_seq += 1
+        resort_norms |= _posting_add(norm_keys, copied_norms, s_norm, key)
+        for token in set(s_norm.split()):
+            resort_tokens |= _posting_add(token_index, copied_tokens, token, key)
+        grams = _trigrams(s_norm)
+        for gram in grams:
+            _posting_add(trigram_index, copied_grams, gram, key)
+        trigram_sizes[key] = len(grams)
+
+    _series_index = SeriesIndex(
+        series=series,
+        norms=norms,
+        norm_keys=norm_keys,
+        token_index=token_index,
+        sorted_norms=sorted(norm_keys) if resort_norms else index.sorted_norms,
+        key_order=key_order,
+        sorted_tokens=sorted(token_index) if resort_tokens else index.sorted_tokens,
+        trigram_index=trigram_index,
+        trigram_sizes=trigram_sizes,
+        sig_acc=sig_acc,
+        sig=f"{sig_acc:040x}",
+    )
+    _watch_inputs_changed.set()
 
 
 def get_norm_cache() -> dict[str, str]:
     """Return the pre-computed normalized keys (call after get_existing_series)."""
-    return _norm_cache
+    return _series_index.norms
 
 
 def invalidate_series_cache():
-    """Invalidate the series cache (call after organizing files)."""
-    global _series_cache, _series_cache_time, _norm_cache
-    _series_cache = None
-    _norm_cache = {}
-    _series_cache_time = 0
-
-
-def _load_history() -> list:
+    """Drop the whole series catalog; the next get_existing_series() rebuilds it from disk."""
+    global _series_index
+    with _series_lock:
+        _series_dests.clear()
+        _series_index = _EMPTY_SERIES_INDEX
+    _watch_inputs_changed.set()
+
+
+_HISTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    action TEXT NOT NULL,
+    series_key TEXT,            -- lowercased series name, for per-series lookups
+    entry TEXT NOT NULL         -- the full entry as JSON
+);
+CREATE INDEX IF NOT EXISTS history_time ON history (timestamp, id);
+CREATE INDEX IF NOT EXISTS history_action ON history (action, timestamp, id);
+CREATE INDEX IF NOT EXISTS history_series ON history (series_key, timestamp, id);
+CREATE TABLE IF NOT EXISTS history_daily (
+    day TEXT NOT NULL,
+    action TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (day, action)
+);
+"""
+
+_history_local = threading.local()
+_history_lock = threading.Lock()
+_history_pending: list[dict] = []  # entries logged but not written yet (group commit)
+
+
+def _history_db() -> sqlite3.Connection:
+    """Return this thread's connection to the history database, creating it if needed."""
+    conn = getattr(_history_local, "conn", None)
+    if conn is not None and _history_local.path == HISTORY_DB_PATH:
+        return conn
+    conn = _sqlite_connect(HISTORY_DB_PATH)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != HISTORY_DB_VERSION:
+        with _history_lock, conn:
+            conn.executescript(_HISTORY_SCHEMA)
+            if conn.execute("PRAGMA user_version").fetchone()[0] == 0:
+                _insert_history(conn, _legacy_history())
+            conn.execute(f"PRAGMA user_version = {HISTORY_DB_VERSION}")
+        for path in (HISTORY_PATH, HISTORY_JOURNAL_PATH, HISTORY_ARCHIVE_PATH):
+            if path.is_file():
+                path.replace(path.with_name(path.name + ".bak"))
+    _history_local.conn = conn
+    _history_local.path = HISTORY_DB_PATH
+    return conn
+
+
+def _read_journal(path: Path):
+    """Yield entries of a JSONL journal (plain or gzip), skipping torn or invalid lines."""
+    opener = gzip.open if path.suffix == ".gz" else open
+    try:
+        with opener(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(entry, dict):
+                    yield entry
+    except (OSError, EOFError):
+        return
+
+
+def _legacy_history() -> list[dict]:
+    """Entries of the previous history files (JSONL journal + archive, or history.json), oldest first."""
+    if HISTORY_JOURNAL_PATH.is_file() or HISTORY_ARCHIVE_PATH.is_file():
+        return [*_read_journal(HISTORY_ARCHIVE_PATH), *_read_journal(HISTORY_JOURNAL_PATH)]
     if HISTORY_PATH.is_file():
         try:
             with open(HISTORY_PATH, "r", encoding="utf-8") as f:
-                return json.load(f)
+                history = json.load(f)
         except (json.JSONDecodeError, IOError):
             return []
+        return [e for e in reversed(history) if isinstance(e, dict)]
     return []
 
 
-def _save_history(history: list) -> None:
-    with open(HISTORY_PATH, "w", encoding="utf-8") as f:
-        json.dump(history, f, indent=2, ensure_ascii=False)
-        f.write("\n")
+def _insert_history(conn: sqlite3.Connection, entries: list[dict]) -> None:
+    daily: Counter = Counter()
+    rows = []
+    for entry in entries:
+        timestamp = entry.get("timestamp", "")
+        action = entry.get("action", "")
+        series = entry.get("series")
+        rows.append((timestamp, action, series.lower() if isinstance(series, str) and series else None,
+                     json.dumps(entry, ensure_ascii=False)))
+        daily[(timestamp[:10], action)] += 1
+    conn.executemany("INSERT INTO history (timestamp, action, series_key, entry) VALUES (?, ?, ?, ?)", rows)
+    conn.executemany(
+        "INSERT INTO history_daily (day, action, count) VALUES (?, ?, ?)"
+        " ON CONFLICT (day, action) DO UPDATE SET count = count + excluded.count",
+        [(day, action, count) for (day, action), count in daily.items()],
+    )
+
+
+def _flush_history_locked() -> None:
+    if not _history_pending:
+        return
+    conn = _history_db()
+    with conn:
+        _insert_history(conn, _history_pending)
+    _history_pending.clear()
+
+
+@app.teardown_request
+def _flush_history(_exc=None) -> None:
+    """Group commit: write the entries logged during a request in one transaction."""
+    if _history_pending:
+        flush_history()
+
+
+def flush_history() -> None:
+    _history_db()  # created (and legacy files imported) outside of _history_lock
+    with _history_lock:
+        _flush_history_locked()
 
 
 def log_action(action: str, details: dict) -> None:
-    """Log an action to history.json."""
-    history = _load_history()
+    """Record an action in the history.
+
+    Inside a request the entry is written when the request ends, together with
+    the other actions of that request; elsewhere it is written immediately.
+    """
     entry = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "action": action, **details}
-    history.insert(0, entry)
-    if len(history) > HISTORY_MAX_ENTRIES:
-        history = history[:HISTORY_MAX_ENTRIES]
-    _save_history(history)
+    with _history_lock:
+        _history_pending.append(entry)
+    if not has_request_context():
+        flush_history()
+
+
+def _history_where(action: str, series: str, since: str, until: str) -> tuple[list[str], list]:
+    where, params = [], []
+    if action:
+        where.append("action = ?")
+        params.append(action)
+    if series:
+        where.append("series_key = ?")
+        params.append(series.lower())
+    if since:
+        where.append("timestamp >= ?")
+        params.append(since)
+    if until:
+        where.append("timestamp < ?")
+        params.append(until)
+    return where, params
+
+
+def query_history(action: str = "", series: str = "", since: str = "", until: str = "",
+                  limit: int = HISTORY_PAGE_SIZE, cursor: str = "") -> tuple[list[dict], str | None]:
+    """Return one page of history entries, newest first, plus the cursor of the next page.
+
+    since/until bound the timestamp (ISO strings, until exclusive). Each filter
+    is served by an index ending in (timestamp, id), so a page costs the same
+    whatever the size of the history. Raises ValueError for an invalid cursor.
+    """
+    after = _decode_cursor(cursor) if cursor else None
+    if cursor and (after is None or len(after) != 2 or not isinstance(after[0], str)
+                   or not isinstance(after[1], int) or isinstance(after[1], bool)):
+        raise ValueError("invalid cursor")
+    flush_history()
+    where, params = _history_where(action, series, since, until)
+    if after is not None:
+        where.append("(timestamp, id) < (?, ?)")
+        params.extend(after)
+    sql = "SELECT id, timestamp, entry FROM history"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY timestamp DESC, id DESC LIMIT ?"
+    rows = _history_db().execute(sql, [*params, limit + 1]).fetchall()
+    next_cursor = _encode_cursor((rows[limit - 1][1], rows[limit - 1][0])) if len(rows) > limit else None
+    return [json.loads(entry) for _id, _ts, entry in rows[:limit]], next_cursor
+
+
+def count_history(action: str = "", series: str = "", since: str = "", until: str = "") -> int:
+    """Count matching entries.
+
+    Without series/until filters and with a whole-day (or no) lower bound, the
+    count comes from the per-day aggregates; otherwise from an index range.
+    """
+    flush_history()
+    conn = _history_db()
+    if not series and not until and len(since) <= 10:
+        sql, params = "SELECT COALESCE(SUM(count), 0) FROM history_daily WHERE day >= ?", [since]
+        if action:
+            sql += " AND action = ?"
+            params.append(action)
+        return conn.execute(sql, params).fetchone()[0]
+    where, params = _history_where(action, series, since, until)
+    return conn.execute("SELECT COUNT(*) FROM history WHERE " + " AND ".join(where), params).fetchone()[0]
+
+
+def history_stats(since_day: str = "") -> dict:
+    """Aggregate counts per action and per day (from history_daily)."""
+    flush_history()
+    rows = _history_db().execute(
+        "SELECT day, action, count FROM history_daily WHERE day >= ? ORDER BY day, action", (since_day,)
+    ).fetchall()
+    by_action: Counter = Counter()
+    by_day: dict[str, dict[str, int]] = {}
+    for day, action, count in rows:
+        by_action[action] += count
+        by_day.setdefault(day, {})[action] = count
+    return {
+        "by_action": dict(by_action),
+        "by_day": [{"day": day, "counts": counts, "total": sum(counts.values())} for day, counts in by_day.items()],
+    }
+
+
+def iter_history():
+    """Yield the full history, oldest first."""
+    flush_history()
+    for (entry,) in _history_db().execute("SELECT entry FROM history ORDER BY id"):
+        yield json.loads(entry)
+
+
+_aliases: dict[str, dict] | None = None
+_aliases_sig = ""
+_aliases_lock = threading.Lock()
+
+
+def _aliases_from_history() -> dict[str, dict]:
+    """Rebuild the alias table from organize entries in history (latest wins, undone ones skipped)."""
+    aliases: dict[str, dict] = {}
+    learned_from: dict[str, str] = {}  # alias key -> path of the file whose organize taught it
+    for entry in iter_history():
+        if entry.get("action") == "undo_organize":
+            key = normalize(detect_series(Path(entry.get("destination", "")).name))
+            if key and learned_from.get(key) == entry.get("source"):
+                del aliases[key], learned_from[key]
+            continue
+        if entry.get("action") not in ("organize", "organize_batch"):
+            continue
+        series = entry.get("series", "")
+        source = entry.get("source", "")
+        if not series or not source or not entry.get("destination"):
+            continue
+        key = normalize(detect_series(Path(source).name))
+        if key:
+            aliases[key] = {"name": series, "destination": str(Path(entry["destination"]).parent.parent)}
+            learned_from[key] = entry["destination"]
+    return aliases
+
+
+def _load_aliases() -> dict[str, dict]:
+    """Return the alias table, loading it (or rebuilding it from history) on first use."""
+    global _aliases, _aliases_sig
+    with _aliases_lock:
+        if _aliases is None:
+            aliases = None
+            if ALIASES_PATH.is_file():
+                try:
+                    with open(ALIASES_PATH, "r", encoding="utf-8") as f:
+                        aliases = json.load(f)
+                except (json.JSONDecodeError, IOError):
+                    aliases = None
+            if not isinstance(aliases, dict):
+                aliases = _aliases_from_history()
+                _save_aliases(aliases)
+            _aliases = aliases
+            _aliases_sig = hashlib.sha1(json.dumps(aliases, sort_keys=True).encode("utf-8")).hexdigest()
+        return _aliases
+
+
+def _save_aliases(aliases: dict[str, dict]) -> None:
+    tmp_path = ALIASES_PATH.with_suffix(".tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(aliases, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        os.replace(tmp_path, ALIASES_PATH)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+
+
+def learn_aliases(pairs: list[tuple[str, str, str]]) -> None:
+    """Record (source filename, series name, destination) confirmations from an organize request."""
+    global _aliases_sig
+    aliases = _load_aliases()
+    changed = False
+    with _aliases_lock:
+        for source, series, destination in pairs:
+            key = normalize(detect_series(Path(source).name))
+            alias = {"name": series, "destination": destination}
+            if key and aliases.get(key) != alias:
+                aliases[key] = alias
+                changed = True
+        if changed:
+            _save_aliases(aliases)
+            _aliases_sig = hashlib.sha1(json.dumps(aliases, sort_keys=True).encode("utf-8")).hexdigest()
+            _watch_inputs_changed.set()
+
+
+def forget_aliases(pairs: list[tuple[str, str, str]]) -> None:
+    """Drop the aliases taught by organize confirmations that were undone, unless taught otherwise since."""
+    global _aliases_sig
+    aliases = _load_aliases()
+    changed = False
+    with _aliases_lock:
+        for source, series, destination in pairs:
+            key = normalize(detect_series(Path(source).name))
+            alias = aliases.get(key)
+            if alias is not None and alias["name"] == series and Path(alias["destination"]) == Path(destination):
+                del aliases[key]
+                changed = True
+        if changed:
+            _save_aliases(aliases)
+            _aliases_sig = hashlib.sha1(json.dumps(aliases, sort_keys=True).encode("utf-8")).hexdigest()
+            _watch_inputs_changed.set()
+
+
+def lookup_alias(guessed_name: str, existing: dict[str, list[dict]]) -> dict | None:
+    """Return the catalog entry a guess was previously organized into, if it still exists."""
+    alias = _load_aliases().get(normalize(guessed_name)) if guessed_name else None
+    if alias is None:
+        return None
+    for entry in existing.get(alias["name"].lower(), ()):
+        if Path(entry["destination"]) == Path(alias["destination"]):
+            return entry
+    return None
+
+
+SEARCH_FUZZY_MIN = 0.45  # minimum trigram similarity for typo-tolerant results
+
+
+def _trigrams(norm: str) -> set[str]:
+    """Return the trigrams of a normalized name, padded so word edges count."""
+    padded = f" {norm} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _search_rank(q_norm: str, series_key: str, key_norm: str, similarity: float) -> tuple | None:
+    """Rank a series for a search query, or None if it doesn't match.
+
+    Tiers: 0 prefix, 1 word prefix, 2 substring, 3 fuzzy (trigram similarity).
+    """
+    if key_norm.startswith(q_norm):
+        return (0, 0.0, series_key)
+    if f" {q_norm}" in f" {key_norm}":
+        return (1, 0.0, series_key)
+    if len(q_norm) >= 3 and q_norm in key_norm:
+        return (2, 0.0, series_key)
+    if len(q_norm) >= 3 and similarity >= SEARCH_FUZZY_MIN:
+        return (3, -similarity, series_key)
+    return None
+
+
+def _search_candidates(index: SeriesIndex, q_norm: str, limit: int) -> dict[str, float]:
+    """Return series_key -> trigram similarity for catalog series that may match q_norm.
+
+    Tiers are collected in rank order and later tiers are skipped once `limit`
+    series are already certain to rank ahead of them.
+    """
+    candidates: dict[str, float] = {}
+    # Prefix matches, found by bisecting the sorted normalized names
+    i = bisect.bisect_left(index.sorted_norms, q_norm)
+    while i < len(index.sorted_norms) and index.sorted_norms[i].startswith(q_norm):
+        for key in index.norm_keys.get(index.sorted_norms[i], ()):
+            candidates[key] = 0.0
+        i += 1
+    if len(candidates) >= limit:
+        return candidates
+    # Word-prefix matches: some token starts with the first word of the query
+    first = q_norm.split()[0]
+    i = bisect.bisect_left(index.sorted_tokens, first)
+    while i < len(index.sorted_tokens) and index.sorted_tokens[i].startswith(first):
+        for key in index.token_index.get(index.sorted_tokens[i], ()):
+            if f" {q_norm}" in f" {index.norms[key]}":
+                candidates[key] = 0.0
+        i += 1
+    if len(q_norm) < 3 or len(candidates) >= limit:
+        return candidates
+    # Substring and fuzzy matches share trigrams with the query: a substring
+    # contains all of its inner trigrams, a fuzzy match needs enough similarity.
+    grams = _trigrams(q_norm)
+    inner = len({q_norm[i:i + 3] for i in range(len(q_norm) - 2)})
+    shared: Counter = Counter()
+    for gram in grams:
+        shared.update(index.trigram_index.get(gram, ()))
+    for key, count in shared.items():
+        similarity = 2 * count / (len(grams) + index.trigram_sizes.get(key, 0))
+        if similarity >= SEARCH_FUZZY_MIN or count >= inner:
+            candidates.setdefault(key, similarity)
+    return candidates
 
 
 def search_series(query: str, existing: dict[str, list[dict]], limit: int = 10) -> list[dict]:
-    """Search existing series by query string (normalized + raw substring)."""
+    """Search existing series for autocomplete, ranked and typo-tolerant.
+
+    Prefix matches come first, then word-prefix, substring (3+ characters) and
+    finally fuzzy matches by trigram similarity. When `existing` is the cached
+    catalog, candidates come from the prebuilt prefix/trigram index.
+    """
     if not query:
         return []
 
-    q = query.lower().strip()
-    q_norm = normalize(query)
+    q_norm = normalize(query) or unidecode(query.lower().strip())  # a query made of articles only
+    if not q_norm:
+        return []
+    index = _series_index  # one consistent snapshot of the catalog and its index
+    norms = index.norms
+
+    if existing is index.series:
+        candidates = _search_candidates(index, q_norm, limit)
+    else:
+        q_grams = _trigrams(q_norm)
+        candidates = {}
+        for series_key in existing:
+            grams = _trigrams(norms.get(series_key) or normalize(series_key))
+            candidates[series_key] = 2 * len(q_grams & grams) / (len(q_grams) + len(grams))
+
+    ranked = []
+    for series_key, similarity in candidates.items():
+        key_norm = norms.get(series_key) or normalize(series_key)
+        rank = _search_rank(q_norm, series_key, key_norm, similarity)
+        if rank is not None:
+            ranked.append(rank)
+    ranked.sort()
+
     results = []
     seen = set()
-    norms = get_norm_cache()
-
-    for series_key, entries in existing.items():
-        key_norm = norms.get(series_key, normalize(series_key))
-        if q in series_key or q_norm in key_norm:
-            for entry in entries:
-                uid = f"{entry['name']}|{entry['destination']}"
-                if uid not in seen:
-                    seen.add(uid)
-                    results.append(entry)
-
-    # Sort: exact prefix matches first, then by name
-    results.sort(key=lambda e: (0 if normalize(e["name"]).startswith(q_norm) else 1, e["name"].lower()))
+    for _tier, _similarity, series_key in ranked:
+        for entry in existing[series_key]:
+            uid = f"{entry['name']}|{entry['destination']}"
+            if uid not in seen:
+                seen.add(uid)
+                results.append(entry)
+        if len(results) >= limit:
+            break
     return results[:limit]
 
 
@@ -335,6 +990,32 @@ def score_match(guessed_name: str, series_key: str, g_norm: str = "", s_norm: st
     return overlap * 0.5  # low score for poor overlap
 
 
+def _match_candidates(index: SeriesIndex, guessed_name: str, g_norm: str) -> list[str]:
+    """Return the catalog keys that can score above 0 against a guess, in catalog order.
+
+    Every other key scores exactly 0.0 in score_match: no raw or normalized equality,
+    no prefix relation with a length ratio >= 0.5, and no shared token.
+    """
+    candidates: set[str] = set()
+    key = guessed_name.lower().strip()
+    if index.series is not None and key in index.series:
+        candidates.add(key)
+    candidates.update(index.norm_keys.get(g_norm, ()))
+    if g_norm:
+        # Series whose normalized name is a prefix of the guess (at least half its length)
+        for length in range((len(g_norm) + 1) // 2, len(g_norm)):
+            candidates.update(index.norm_keys.get(g_norm[:length], ()))
+        # Series whose normalized name starts with the guess (at most twice its length)
+        i = bisect.bisect_left(index.sorted_norms, g_norm)
+        while i < len(index.sorted_norms) and index.sorted_norms[i].startswith(g_norm):
+            if len(index.sorted_norms[i]) <= 2 * len(g_norm):
+                candidates.update(index.norm_keys.get(index.sorted_norms[i], ()))
+            i += 1
+        for token in set(g_norm.split()):
+            candidates.update(index.token_index.get(token, ()))
+    return sorted(candidates, key=lambda k: index.key_order.get(k, 0))
+
+
 def find_best_match(guessed_name: str, existing: dict[str, list[dict]], threshold: float = 0.6) -> tuple[dict | None, float]:
     """Find the best existing series match for a guessed name.
 
@@ -342,6 +1023,9 @@ def find_best_match(guessed_name: str, existing: dict[str, list[dict]], threshol
     score >= 0.9: high confidence (auto-match)
     0.6 <= score < 0.9: suggestion (user confirms)
     score < threshold: no match returned
+
+    When `existing` is the cached catalog, only candidates from the matching index
+    are scored; results are identical to scoring every series.
     """
     if not guessed_name:
         return None, 0.0
@@ -349,9 +1033,16 @@ def find_best_match(guessed_name: str, existing: dict[str, list[dict]], threshol
     best_entry = None
     best_score = 0.0
     g_norm = normalize(guessed_name)
-    norms = get_norm_cache()
+    index = _series_index  # one consistent snapshot of the catalog and its index
+    norms = index.norms
+
+    if existing is index.series:
+        series_keys = _match_candidates(index, guessed_name, g_norm)
+    else:
+        series_keys = existing
 
-    for series_key, entries in existing.items():
+    for series_key in series_keys:
+        entries = existing[series_key]
         s_norm = norms.get(series_key, "")
         s = score_match(guessed_name, series_key, g_norm, s_norm)
         if s > best_score:
@@ -365,58 +1056,346 @@ def find_best_match(guessed_name: str, existing: dict[str, list[dict]], threshol
     return None, 0.0
 
 
-def list_files(sources: list[str]) -> list[dict]:
-    """List comic files in all source directories (recursive, skips .trash/)."""
+def _scan_tree(top: str, prefix: str, skip_hidden: bool, extensions: set[str] | None,
+               out: list[tuple[str, os.stat_result]]) -> None:
+    """Depth-first scandir walk of `top`, appending (relative_path, stat) for each file."""
+    stack = [(top, prefix)]
+    while stack:
+        path, rel = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if skip_hidden and entry.name.startswith("."):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append((entry.path, rel + entry.name + os.sep))
+                        elif entry.is_file():
+                            if extensions is not None and os.path.splitext(entry.name)[1].lower() not in extensions:
+                                continue
+                            out.append((rel + entry.name, entry.stat()))
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+def walk_files(root: str | Path, skip_hidden: bool = True, extensions: set[str] | None = None,
+               workers: int = 1) -> list[tuple[str, os.stat_result]]:
+    """Recursively list files under root as (relative_path, stat) tuples sorted by path.
+
+    Hidden entries (.trash, .thumbnails, dotfiles) are pruned during descent when
+    skip_hidden is set, and only files whose suffix is in `extensions` are stat'ed.
+    With workers > 1, top-level subdirectories are walked in parallel on a thread
+    pool, which hides per-syscall latency on network filesystems.
+    """
+    root = str(root)
+    files: list[tuple[str, os.stat_result]] = []
+    subdirs = []
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
+                if skip_hidden and entry.name.startswith("."):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry)
+                    elif entry.is_file():
+                        if extensions is not None and os.path.splitext(entry.name)[1].lower() not in extensions:
+                            continue
+                        files.append((entry.name, entry.stat()))
+                except OSError:
+                    continue
+    except OSError:
+        return []
+
+    def walk_subdir(entry: os.DirEntry) -> list[tuple[str, os.stat_result]]:
+        out: list[tuple[str, os.stat_result]] = []
+        _scan_tree(entry.path, entry.name + os.sep, skip_hidden, extensions, out)
+        return out
+
+    if workers > 1 and len(subdirs) > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(subdirs))) as pool:
+            for out in pool.map(walk_subdir, subdirs):
+                files.extend(out)
+    else:
+        for entry in subdirs:
+            files.extend(walk_subdir(entry))
+
+    files.sort(key=lambda item: item[0].split(os.sep))
+    return files
+
+
+_scan_index: dict | None = None
+_scan_index_lock = threading.Lock()
+
+
+def _load_scan_index() -> dict:
+    """Return the in-memory scan index, loading it from disk on first use."""
+    global _scan_index
+    if _scan_index is None:
+        index = {}
+        if SCAN_INDEX_PATH.is_file():
+            try:
+                with open(SCAN_INDEX_PATH, "r", encoding="utf-8") as f:
+                    index = json.load(f)
+            except (json.JSONDecodeError, IOError):
+                index = {}
+        if not isinstance(index, dict) or index.get("version") != SCAN_INDEX_VERSION:
+            index = {"version": SCAN_INDEX_VERSION, "signature": "", "files": {}}
+        _scan_index = index
+    return _scan_index
+
+
+def _save_scan_index(index: dict) -> None:
+    tmp_path = SCAN_INDEX_PATH.with_suffix(".tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, SCAN_INDEX_PATH)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _scan_signature(cfg: dict) -> str:
+    """Hash of everything cached matches depend on: the config, the series catalog and aliases."""
+    _load_aliases()
+    h = hashlib.sha1(json.dumps(cfg, sort_keys=True).encode("utf-8"))
+    h.update(_series_index.sig.encode("utf-8"))
+    h.update(_aliases_sig.encode("utf-8"))
+    return h.hexdigest()
+
+
+def _analyze_file(filename: str, st: os.stat_result) -> dict:
+    """Parse a filename into a scan index record (match fields are filled separately)."""
+    parsed = parse_filename(filename)
+    return {
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "ino": st.st_ino,
+        "series_guess": parsed.series,
+        "tome": parsed.tome,
+        "title": parsed.title,
+        "match": None,
+        "match_score": 0.0,
+    }
+
+
+def _match_record(record: dict, existing: dict[str, list[dict]]) -> None:
+    match = lookup_alias(record["series_guess"], existing)
+    if match is not None:
+        match_score = 1.0  # confirmed by a previous organize
+    else:
+        match, match_score = find_best_match(record["series_guess"], existing)
+    record["match"] = match
+    record["match_score"] = match_score
+
+
+def _file_payload(cfg: dict, record: dict, source_dir: str, rel_name: str, st: os.stat_result,
+                  series_listings: dict[Path, set[str]]) -> dict:
+    """Build the /api/files entry for one analyzed file.
+
+    series_listings memoizes target folder contents across calls (duplicate check).
+    """
+    match = record["match"]
+    match_score = record["match_score"]
+    tome = record["tome"]
+    ext = os.path.splitext(rel_name)[1].lower()
+
+    # Proactive duplicate detection for high-confidence matches
+    duplicate = False
+    if match is not None and match_score >= 0.9:
+        tpl, tpl_no_tome = get_template_for_dest(cfg, match["destination"])
+        new_name = apply_template(tpl, match["name"], int(tome) if tome is not None else None, ext, tpl_no_tome, record["title"])
+        series_dir = Path(match["destination"]) / match["name"]
+        if series_dir not in series_listings:
+            try:
+                series_listings[series_dir] = set(os.listdir(series_dir))
+            except OSError:
+                series_listings[series_dir] = set()
+        duplicate = new_name in series_listings[series_dir]
+
+    return {
+        "name": rel_name,
+        "source_dir": source_dir,
+        "source_label": Path(source_dir).name,
+        "size": st.st_size,
+        "size_human": format_size(st.st_size),
+        "tome": tome,
+        "extension": ext,
+        "series_guess": record["series_guess"],
+        "series_match": match,
+        "match_score": round(match_score, 2),
+        "duplicate": duplicate,
+        "corrupt": corrupt_error(os.path.join(source_dir, rel_name), st.st_size, st.st_mtime_ns),
+    }
+
+
+def iter_files(sources: list[str]):
+    """Yield comic files from all source directories as they are analyzed (recursive, skips .trash/).
+
+    Analysis results are cached in the scan index keyed by (path, size, mtime, inode):
+    only new or changed files are re-parsed, and matches are recomputed when the
+    config or the series catalog changes. If the consumer stops early, what was
+    analyzed so far is kept but nothing is pruned from the index.
+    """
     cfg = load_config()
     existing = get_existing_series()
     extensions = get_extensions(cfg)
+    signature = _scan_signature(cfg)
+    series_listings: dict[Path, set[str]] = {}
+
+    # The index is read and written under the lock, but files are analyzed and
+    # streamed without it, so a slow consumer does not hold up other scans
+    with _scan_index_lock:
+        index = _load_scan_index()
+        cached = dict(index["files"])
+        same_signature = index.get("signature") == signature
+    dirty = not same_signature
+    seen: dict[str, dict] = {}
+    complete = False
+    try:
+        for source_dir in sources:
+            source = Path(source_dir)
+            if not source.is_dir():
+                continue
 
-    files = []
-    for source_dir in sources:
-        source = Path(source_dir)
-        if not source.is_dir():
+            # Hidden folders (.trash/.thumbnails) are pruned by the walker
+            for rel_name, st in walk_files(source, extensions=extensions, workers=SCAN_WORKERS):
+                path_key = os.path.join(str(source), rel_name)
+                record = cached.get(path_key)
+                if record is None or (record["size"], record["mtime_ns"], record["ino"]) != (st.st_size, st.st_mtime_ns, st.st_ino):
+                    record = _analyze_file(os.path.basename(rel_name), st)
+                    _match_record(record, existing)
+                    dirty = True
+                elif not same_signature:
+                    record = dict(record)  # the cached one may be read concurrently
+                    _match_record(record, existing)
+                seen[path_key] = record
+                yield _file_payload(cfg, record, source_dir, rel_name, st, series_listings)
+        complete = True
+    finally:
+        if complete and (dirty or len(seen) != len(cached)):
+            with _scan_index_lock:
+                index = _load_scan_index()
+                index["files"] = seen
+                index["signature"] = signature
+                _save_scan_index(index)
+        elif not complete and dirty and same_signature:
+            with _scan_index_lock:
+                index = _load_scan_index()
+                if index.get("signature") == signature:
+                    index["files"].update(seen)
+                    _save_scan_index(index)
+
+
+def list_files(sources: list[str]) -> list[dict]:
+    """List comic files in all source directories (see iter_files)."""
+    return list(iter_files(sources))
+
+
+FILES_PAGE_MAX = 1000
+FILES_SORT_KEYS = {
+    "name": lambda f: f["name"].lower(),
+    "series": lambda f: (f["series_guess"] or "").lower(),
+    "tome": lambda f: f["tome"] if f["tome"] is not None else 9999,
+    "size": lambda f: f["size"],
+    "score": lambda f: f["match_score"],
+}
+
+
+def filter_files(files: list[dict], args) -> list[dict]:
+    """Apply /api/files query filters: series, status, ext, duplicate, min_score, max_score."""
+    series = args.get("series", "").strip().lower()
+    status = args.get("status", "")
+    exts = {e.strip().lower() for e in args.get("ext", "").split(",") if e.strip()}
+    exts = {e if e.startswith(".") else "." + e for e in exts}
+    duplicate = args.get("duplicate", "")
+    try:
+        min_score = float(args.get("min_score", "") or 0)
+        max_score = float(args.get("max_score", "") or 1)
+    except ValueError:
+        min_score, max_score = 0.0, 1.0
+
+    out = []
+    for f in files:
+        score = f["match_score"] if f["series_match"] else 0.0
+        if series and series not in (f["series_guess"] or "").lower():
+            continue
+        if exts and f["extension"] not in exts:
+            continue
+        if duplicate in ("1", "true") and not f["duplicate"]:
+            continue
+        if duplicate in ("0", "false") and f["duplicate"]:
+            continue
+        if not min_score <= score <= max_score:
+            continue
+        if status == "matched" and score < 0.9:
             continue
-        source_label = source.name
+        if status == "suggested" and not 0.6 <= score < 0.9:
+            continue
+        if status == "unmatched" and f["series_match"]:
+            continue
+        if status == "duplicates" and not f["duplicate"]:
+            continue
+        if status == "corrupt" and not f["corrupt"]:
+            continue
+        out.append(f)
+    return out
 
-        for f in sorted(source.rglob("*")):
-            # Skip .trash/.thumbnails and hidden folders
-            try:
-                rel = f.relative_to(source)
-            except ValueError:
-                continue
-            if any(part.startswith(".") for part in rel.parts):
-                continue
-            if f.is_file() and f.suffix.lower() in extensions:
-                rel_name = str(rel) if len(rel.parts) > 1 else f.name
-                guessed = detect_series(f.name)
-                match, match_score = find_best_match(guessed, existing)
-                size = f.stat().st_size
-                tome = detect_tome(f.name)
-                ext = f.suffix.lower()
-
-                # Proactive duplicate detection for high-confidence matches
-                duplicate = False
-                if match is not None and match_score >= 0.9:
-                    tpl, tpl_no_tome = get_template_for_dest(cfg, match["destination"])
-                    title = detect_title(f.name)
-                    new_name = apply_template(tpl, match["name"], int(tome) if tome is not None else None, ext, tpl_no_tome, title)
-                    target_path = Path(match["destination"]) / match["name"] / new_name
-                    duplicate = target_path.exists()
-
-                files.append({
-                    "name": rel_name,
-                    "source_dir": source_dir,
-                    "source_label": source_label,
-                    "size": size,
-                    "size_human": format_size(size),
-                    "tome": tome,
-                    "extension": ext,
-                    "series_guess": guessed,
-                    "series_match": match,
-                    "match_score": round(match_score, 2),
-                    "duplicate": duplicate,
-                })
-    return files
+
+def _encode_cursor(key: tuple) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple | None:
+    try:
+        return tuple(json.loads(base64.urlsafe_b64decode(cursor.encode("ascii"))))
+    except (ValueError, TypeError):
+        return None
+
+
+def _files_cursor_key(cursor: str, sort: str) -> tuple:
+    """Decode a file list cursor into the sort key it points at (ValueError if it does not fit `sort`)."""
+    after = _decode_cursor(cursor)
+    if after is None or len(after) != 4 or after[0] != sort or not all(isinstance(v, str) for v in after[2:]):
+        raise ValueError("invalid cursor")
+    value = after[1]
+    if sort in ("name", "series"):
+        valid = isinstance(value, str)
+    else:
+        valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+    if not valid:
+        raise ValueError("invalid cursor")
+    return after[1:]
+
+
+def paginate_files(files: list[dict], sort: str, order: str, limit: int, cursor: str = "") -> tuple[list[dict], str | None]:
+    """Return one page of `files` sorted server-side, plus the cursor of the next page.
+
+    The cursor is the sort key of the last returned row, so pages stay stable
+    while files are added or removed between requests. Raises ValueError for a
+    cursor that is invalid or was made under another sort.
+    """
+    if sort not in FILES_SORT_KEYS:
+        sort = "name"
+    sort_value = FILES_SORT_KEYS[sort]
+    keyed = sorted(((sort_value(f), f["source_dir"], f["name"]), f) for f in files)
+    keys = [k for k, _f in keyed]
+    after = _files_cursor_key(cursor, sort) if cursor else None
+
+    if order == "desc":
+        end = bisect.bisect_left(keys, after) if after is not None else len(keys)
+        start = max(0, end - limit)
+        page = keyed[start:end][::-1]
+        has_more = start > 0
+    else:
+        start = bisect.bisect_right(keys, after) if after is not None else 0
+        page = keyed[start:start + limit]
+        has_more = start + limit < len(keyed)
+
+    next_cursor = _encode_cursor((sort, *page[-1][0])) if page and has_more else None
+    return [f for _k, f in page], next_cursor
 
 
 def is_safe_filename(filename: str, base_dir: str) -> bool:
@@ -494,10 +1473,52 @@ def index():
 
 @app.route("/api/files")
 def api_files():
+    """List incoming files.
+
+    ?stream=1 returns NDJSON ({"file": ...} per line, then {"done": true, ...}) as files
+    are analyzed. ?limit=N returns one page sorted by ?sort/&order, filtered by
+    series/status/ext/duplicate/min_score/max_score, continued with ?cursor.
+    """
     cfg = load_config()
     sources = get_sources(cfg)
-    files = list_files(sources)
-    return jsonify({"files": files, "sources": sources})
+    files = None
+    if cfg.get("watch_enabled", False):
+        start_watcher()
+        files = watcher_snapshot(sources)
+    if cfg.get("verify_enabled", False):
+        start_verifier()
+
+    if request.args.get("stream", "") in ("1", "true"):
+        def stream():
+            count = 0
+            for f in (files if files is not None else iter_files(sources)):
+                count += 1
+                yield json.dumps({"file": f}, ensure_ascii=False) + "\n"
+            yield json.dumps({"done": True, "total": count, "sources": sources}, ensure_ascii=False) + "\n"
+        return Response(stream(), mimetype="application/x-ndjson",
+                        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+    if files is None:
+        files = list_files(sources)
+    if "limit" not in request.args:
+        return jsonify({"files": files, "sources": sources})
+
+    try:
+        limit = max(1, min(FILES_PAGE_MAX, int(request.args.get("limit", ""))))
+    except ValueError:
+        return jsonify({"error": "Paramètre limit invalide"}), 400
+    filtered = filter_files(files, request.args)
+    try:
+        page, next_cursor = paginate_files(
+            filtered,
+            request.args.get("sort", "name"),
+            request.args.get("order", "asc"),
+            limit,
+            request.args.get("cursor", ""),
+        )
+    except ValueError:
+        return jsonify({"error": "Curseur invalide"}), 400
+    return jsonify({"files": page, "sources": sources, "total": len(filtered), "next_cursor": next_cursor})
 
 
 @app.route("/api/detect-tome", methods=["POST"])
@@ -540,10 +1561,8 @@ def _audit_series(series_name: str, dest: str, dest_label: str, files: list[dict
     # Missing tomes detection
     missing_tomes = []
     if len(tomes) >= 2:
-        tomes_sorted = sorted(set(tomes))
-        for i in range(tomes_sorted[0], tomes_sorted[-1] + 1):
-            if i not in tomes_sorted:
-                missing_tomes.append(i)
+        tome_set = set(tomes)
+        missing_tomes = [i for i in range(min(tome_set), max(tome_set) + 1) if i not in tome_set]
 
     # Duplicate tomes
     tome_counts = Counter(tomes)
@@ -562,6 +1581,9 @@ def _audit_series(series_name: str, dest: str, dest_label: str, files: list[dict
 
     mixed_extensions = len(extensions) > 1
 
+    # Archives the background verifier found corrupt
+    corrupt_files = [{"name": f["name"], "error": f["corrupt"]} for f in files if f.get("corrupt")]
+
     return {
         "series_name": series_name,
         "destination": dest,
@@ -572,70 +1594,225 @@ def _audit_series(series_name: str, dest: str, dest_label: str, files: list[dict
         "missing_tomes": missing_tomes,
         "duplicate_tomes": duplicate_tomes,
         "naming_issues": naming_issues,
+        "corrupt_files": corrupt_files,
         "mixed_extensions": mixed_extensions,
         "extensions": extensions,
         "is_empty": len(files) == 0,
         "has_issues": bool(
-            missing_tomes or duplicate_tomes or naming_issues
+            missing_tomes or duplicate_tomes or naming_issues or corrupt_files
             or mixed_extensions or len(files) == 0 or len(files) == 1
         ),
     }
 
 
-def audit_collections() -> dict:
-    """Scan all destination folders and return quality audit results."""
+AUDIT_WORKERS_PER_DESTINATION = 4  # series folders listed concurrently on each destination
+
+_audit_cache: dict[tuple[str, str], tuple[tuple, dict]] = {}  # (destination, series) -> (key, result)
+_audit_cache_lock = threading.Lock()
+_audit_jobs: dict[str, threading.Event] = {}  # running streamed audits: id -> cancel event
+
+
+def _audit_cached(conn: sqlite3.Connection, dest: str, dest_label: str, series_id: int, series_name: str,
+                  mtime_ns: int | None, template: str, template_no_tome: str, audit_case: str,
+                  ext_sql: str, ext_params: list[str]) -> dict:
+    """Audit one series from the catalog, reusing the cached result while its folder is unchanged.
+
+    The cache key is the folder mtime recorded in the catalog plus the effective
+    template, audit_case and extensions and the verifier's verdicts version; a
+    folder whose mtime has not settled yet is always re-audited.
+    """
+    key = (mtime_ns, template, template_no_tome, audit_case, tuple(ext_params), _verdicts_version)
+    with _audit_cache_lock:
+        cached = _audit_cache.get((dest, series_name))
+    if mtime_ns is not None and cached is not None and cached[0] == key:
+        return cached[1]
+    files = []
+    volumes = conn.execute(
+        f"SELECT v.name, v.tome, v.title, v.extension, v.size, v.mtime_ns FROM volumes v"
+        f" WHERE v.series_id = ? AND {ext_sql} ORDER BY v.name",
+        [series_id, *ext_params],
+    )
+    for name, tome, title, ext, size, file_mtime_ns in volumes:
+        files.append({
+            "name": name,
+            "tome": tome,
+            "title": title,
+            "extension": ext,
+            "size": size,
+            "size_human": format_size(size),
+            "corrupt": corrupt_error(os.path.join(dest, series_name, name), size, file_mtime_ns),
+        })
+    entry = _audit_series(series_name, dest, dest_label, files, template, template_no_tome, audit_case)
+    with _audit_cache_lock:
+        _audit_cache[(dest, series_name)] = (key, entry)
+    return entry
+
+
+def iter_audit(cancel: threading.Event | None = None):
+    """Audit all destinations in parallel, yielding ("total", n) and ("series", result) events.
+
+    Each destination gets its own worker (which lists its series folders on
+    AUDIT_WORKERS_PER_DESTINATION threads), so the audit takes as long as the
+    slowest disk. A "total" event gives the number of series of a destination
+    once it is listed; "series" events arrive as each series is audited.
+    Setting `cancel` stops the workers after their current series.
+    """
     cfg = load_config()
+    destinations = cfg["destinations"]
     extensions = get_extensions(cfg)
     audit_case = cfg.get("audit_case", "first")
+    ext_sql, ext_params = _ext_filter(extensions)
+    if cancel is None:
+        cancel = threading.Event()
+    events: queue.Queue = queue.Queue()
+
+    conn = _catalog_db()
+    with _catalog_lock, conn:
+        _prune_catalog(conn, destinations)
+    with _audit_cache_lock:
+        for key in [k for k in _audit_cache if k[0] not in destinations]:
+            del _audit_cache[key]
+
+    def audit_destination(dest: str) -> None:
+        try:
+            listing = list_catalog_destination(dest)
+            if listing is None:
+                return
+            dest_mtime, dirs = listing
+            events.put(("total", sum(1 for name, _p, _m in dirs if not name.startswith("."))))
+            dest_label = Path(dest).name
+            template, template_no_tome = get_template_for_dest(cfg, dest)
+            conn = _catalog_db()
+            seen = set()
+            for series_id, name, mtime_ns in iter_catalog_destination(
+                    dest, dest_mtime, dirs, AUDIT_WORKERS_PER_DESTINATION, cancel):
+                if name.startswith("."):
+                    continue
+                seen.add(name)
+                entry = _audit_cached(conn, dest, dest_label, series_id, name, mtime_ns,
+                                      template, template_no_tome, audit_case, ext_sql, ext_params)
+                events.put(("series", {**entry, "page_stats": series_page_stats(conn, series_id)}))
+            if not cancel.is_set():
+                with _audit_cache_lock:
+                    for key in [k for k in _audit_cache if k[0] == dest and k[1] not in seen]:
+                        del _audit_cache[key]
+        finally:
+            events.put(None)
+
+    pool = ThreadPoolExecutor(max_workers=max(1, len(destinations)))
+    finished = False
+    try:
+        futures = [pool.submit(audit_destination, dest) for dest in destinations]
+        running = len(futures)
+        while running:
+            event = events.get()
+            if event is None:
+                running -= 1
+            else:
+                yield event
+        for future in futures:
+            future.result()
+        finished = True
+    finally:
+        if not finished:
+            cancel.set()
+        pool.shutdown(wait=False)
 
-    results: dict = {"series": [], "summary": {}}
 
-    for dest in cfg["destinations"]:
-        dest_path = Path(dest)
-        if not dest_path.is_dir():
-            continue
-        dest_label = dest_path.name
-        template, template_no_tome = get_template_for_dest(cfg, dest)
+def _audit_summary(series: list[dict]) -> dict:
+    return {
+        "total_series": len(series),
+        "series_with_gaps": sum(1 for x in series if x["missing_tomes"]),
+        "series_with_naming_issues": sum(1 for x in series if x["naming_issues"]),
+        "empty_folders": sum(1 for x in series if x["is_empty"]),
+        "single_file_series": sum(1 for x in series if x["file_count"] == 1),
+        "duplicate_tomes": sum(1 for x in series if x["duplicate_tomes"]),
+        "corrupt_files": sum(len(x["corrupt_files"]) for x in series),
+        "low_res_volumes": sum(x["page_stats"]["low_res"] for x in series),
+    }
 
-        for series_dir in sorted(dest_path.iterdir()):
-            if not series_dir.is_dir() or series_dir.name.startswith((".", "@")):
-                continue
 
-            files = []
-            for f in sorted(series_dir.iterdir()):
-                if f.is_file() and f.suffix.lower() in extensions:
-                    tome = detect_tome(f.name)
-                    title = detect_title(f.name)
-                    size = f.stat().st_size
-                    files.append({
-                        "name": f.name,
-                        "tome": tome,
-                        "title": title,
-                        "extension": f.suffix.lower(),
-                        "size": size,
-                        "size_human": format_size(size),
-                    })
-
-            entry = _audit_series(series_dir.name, dest, dest_label, files, template, template_no_tome, audit_case)
-            results["series"].append(entry)
-
-    s = results["series"]
-    results["summary"] = {
-        "total_series": len(s),
-        "series_with_gaps": sum(1 for x in s if x["missing_tomes"]),
-        "series_with_naming_issues": sum(1 for x in s if x["naming_issues"]),
-        "empty_folders": sum(1 for x in s if x["is_empty"]),
-        "single_file_series": sum(1 for x in s if x["file_count"] == 1),
-        "duplicate_tomes": sum(1 for x in s if x["duplicate_tomes"]),
+def _audit_row(entry: dict) -> dict:
+    """Summary of one series audit for the /api/audit list: issue flags and counts, no file list."""
+    return {
+        "series_name": entry["series_name"],
+        "destination": entry["destination"],
+        "dest_label": entry["dest_label"],
+        "file_count": entry["file_count"],
+        "missing_tomes": entry["missing_tomes"],
+        "naming_issue_count": len(entry["naming_issues"]),
+        "duplicate_tome_count": len(entry["duplicate_tomes"]),
+        "corrupt_count": len(entry["corrupt_files"]),
+        "mixed_extensions": entry["mixed_extensions"],
+        "extensions": entry["extensions"],
+        "is_empty": entry["is_empty"],
+        "has_issues": entry["has_issues"],
+        "page_stats": entry["page_stats"],
     }
-    return results
 
 
-@app.route("/api/dashboard")
-def api_dashboard():
-    """Return collection statistics for the dashboard."""
+def audit_one_series(dest: str, series_name: str) -> dict | None:
+    """Audit a single series folder of a configured destination (None if it does not exist)."""
+    if not series_name or series_name.startswith((".", "@")) or Path(series_name).name != series_name:
+        return None
     cfg = load_config()
-    extensions = get_extensions(cfg)
+    conn = _catalog_db()
+    query = "SELECT id, mtime_ns FROM series WHERE destination = ? AND name = ?"
+    row = conn.execute(query, (dest, series_name)).fetchone()
+    try:
+        mtime_ns = (Path(dest) / series_name).stat().st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    if row is None or mtime_ns is None or row[1] != mtime_ns:
+        refresh_catalog_series(dest, series_name)
+        row = conn.execute(query, (dest, series_name)).fetchone()
+    if row is None:
+        return None
+    template, template_no_tome = get_template_for_dest(cfg, dest)
+    ext_sql, ext_params = _ext_filter(get_extensions(cfg))
+    entry = _audit_cached(conn, dest, Path(dest).name, row[0], series_name, row[1], template, template_no_tome,
+                          cfg.get("audit_case", "first"), ext_sql, ext_params)
+    volume_stats = {name: {"pages": pages, "formats": formats, "width": width, "height": height}
+                    for name, pages, formats, width, height in conn.execute(
+                        "SELECT name, pages, formats, width, height FROM volumes WHERE series_id = ? AND pages > 0",
+                        (row[0],))}
+    files = [{**f, "page_stats": volume_stats.get(f["name"])} for f in entry["files"]]
+    return {**entry, "files": files, "page_stats": series_page_stats(conn, row[0])}
+
+
+def audit_collections() -> dict:
+    """Audit all destination folders from the library catalog and return quality results.
+
+    Series are ordered by destination (config order) then name; see iter_audit().
+    """
+    order = {dest: i for i, dest in enumerate(load_config()["destinations"])}
+    series = [entry for kind, entry in iter_audit() if kind == "series"]
+    series.sort(key=lambda x: (order.get(x["destination"], len(order)), x["series_name"]))
+    return {"series": series, "summary": _audit_summary(series)}
+
+
+@app.route("/api/dashboard")
+def api_dashboard():
+    """Return collection statistics for the dashboard.
+
+    Counters come from the catalog's per-series totals, which organize, convert,
+    rename and undo keep up to date. Stale-while-revalidate: when the last full
+    refresh is older than DASHBOARD_RECONCILE_INTERVAL, the current numbers are
+    returned and the catalog is reconciled in the background.
+    """
+    cfg = load_config()
+    extensions = get_extensions(cfg)
+    if cfg.get("stats_enabled", False):
+        start_sampler()
+
+    conn = _catalog_db()
+    known = {path for (path,) in conn.execute("SELECT path FROM destinations")}
+    reconciling = False
+    if any(dest not in known and Path(dest).is_dir() for dest in cfg["destinations"]):
+        refresh_catalog(cfg["destinations"])  # nothing to serve yet
+    elif catalog_age() > DASHBOARD_RECONCILE_INTERVAL:
+        reconciling = True  # started once the current numbers are read
+    ext_sql, ext_params = _ext_filter(extensions, "t.extension")
 
     total_series = 0
     total_volumes = 0
@@ -647,20 +1824,21 @@ def api_dashboard():
         dest_path = Path(dest)
         if not dest_path.is_dir():
             continue
-        d_series = 0
+        d_series = conn.execute(
+            "SELECT COUNT(*) FROM series WHERE destination = ? AND name NOT LIKE '.%'", (dest,)
+        ).fetchone()[0]
         d_volumes = 0
         d_size = 0
-        for series_dir in dest_path.iterdir():
-            if not series_dir.is_dir() or series_dir.name.startswith((".", "@")):
-                continue
-            d_series += 1
-            for f in series_dir.iterdir():
-                if f.is_file() and f.suffix.lower() in extensions:
-                    d_volumes += 1
-                    sz = f.stat().st_size
-                    d_size += sz
-                    ext = f.suffix.lower()
-                    format_counts[ext] = format_counts.get(ext, 0) + 1
+        rows = conn.execute(
+            "SELECT t.extension, SUM(t.volumes), SUM(t.bytes) FROM series_totals t JOIN series s ON s.id = t.series_id"
+            f" WHERE s.destination = ? AND s.name NOT LIKE '.%' AND {ext_sql}"
+            " GROUP BY t.extension HAVING SUM(t.volumes) > 0",
+            [dest, *ext_params],
+        )
+        for ext, count, size in rows:
+            d_volumes += count
+            d_size += size
+            format_counts[ext] = format_counts.get(ext, 0) + count
         by_dest.append({
             "label": dest_path.name,
             "path": dest,
@@ -674,17 +1852,38 @@ def api_dashboard():
         total_size += d_size
 
     # Recent activity (last 7 days)
-    recent_activity = 0
-    history = _load_history()
-    if history:
-        cutoff = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(time.time() - 7 * 86400))
-        recent_activity = sum(1 for h in history if h.get("timestamp", "") >= cutoff)
+    cutoff = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(time.time() - 7 * 86400))
+    recent_activity = count_history(since=cutoff)
 
     by_format = sorted(
         [{"ext": ext, "count": cnt} for ext, cnt in format_counts.items()],
         key=lambda x: x["count"],
         reverse=True,
     )
+    if reconciling:
+        reconcile_catalog_async()
+
+    # Page statistics of the volumes sampled so far
+    ext_sql, ext_params = _ext_filter(extensions)
+    dest_sql = ",".join("?" * len(cfg["destinations"]))
+    scope = (f"FROM volumes v JOIN series s ON s.id = v.series_id WHERE s.destination IN ({dest_sql})"
+             f" AND s.name NOT LIKE '.%' AND {ext_sql}")
+    params = [*cfg["destinations"], *ext_params]
+    sampled, pages, height, low_res = conn.execute(
+        f"SELECT COUNT(*), SUM(v.pages), AVG(v.height), SUM(v.height < ?) {scope} AND v.pages > 0",
+        [STATS_LOW_RES_HEIGHT, *params],
+    ).fetchone()
+    image_formats = conn.execute(
+        f"SELECT v.formats, COUNT(*) {scope} AND v.pages > 0 GROUP BY v.formats ORDER BY 2 DESC", params
+    ).fetchall()
+    page_stats = {
+        "sampled": sampled,
+        "pages": pages or 0,
+        "avg_pages": round(pages / sampled) if sampled else None,
+        "avg_height": round(height) if height is not None else None,
+        "low_res": low_res or 0,
+        "by_image_format": [{"formats": formats, "count": count} for formats, count in image_formats],
+    }
 
     return jsonify({
         "total_series": total_series,
@@ -694,13 +1893,71 @@ def api_dashboard():
         "by_destination": by_dest,
         "by_format": by_format,
         "recent_activity": recent_activity,
+        "reconciling": reconciling,
+        "page_stats": page_stats,
     })
 
 
 @app.route("/api/audit")
 def api_audit():
-    results = audit_collections()
-    return jsonify(results)
+    """Audit the collection: summary and per-series issue flags (details from /api/audit/series).
+
+    ?stream=1 returns NDJSON as destinations are audited in parallel: {"audit_id": ...}
+    first, then {"series": ..., "progress": {"done", "total"}} per series and finally
+    {"done": true, "cancelled": ..., "summary": ...}. POST /api/audit/<id>/cancel stops it.
+    """
+    cfg = load_config()
+    if cfg.get("verify_enabled", False):
+        start_verifier()
+    if cfg.get("stats_enabled", False):
+        start_sampler()
+    if request.args.get("stream", "") not in ("1", "true"):
+        results = audit_collections()
+        return jsonify({"series": [_audit_row(x) for x in results["series"]], "summary": results["summary"]})
+
+    audit_id = os.urandom(8).hex()
+    cancel = threading.Event()
+    _audit_jobs[audit_id] = cancel
+
+    def stream():
+        series = []
+        total = 0
+        try:
+            yield json.dumps({"audit_id": audit_id}) + "\n"
+            for kind, value in iter_audit(cancel):
+                if kind == "total":
+                    total += value
+                    continue
+                series.append(value)
+                yield json.dumps({"series": _audit_row(value), "progress": {"done": len(series), "total": total}},
+                                 ensure_ascii=False) + "\n"
+            yield json.dumps({"done": True, "cancelled": cancel.is_set(), "summary": _audit_summary(series)}) + "\n"
+        finally:
+            _audit_jobs.pop(audit_id, None)
+
+    return Response(stream(), mimetype="application/x-ndjson",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@app.route("/api/audit/series")
+def api_audit_series():
+    """Full audit of one series: files, naming issues, duplicate and missing tomes."""
+    dest = request.args.get("destination", "")
+    if dest not in load_config()["destinations"]:
+        return jsonify({"error": "Destination inconnue"}), 400
+    entry = audit_one_series(dest, request.args.get("series", ""))
+    if entry is None:
+        return jsonify({"error": "Série introuvable"}), 404
+    return jsonify(entry)
+
+
+@app.route("/api/audit/<audit_id>/cancel", methods=["POST"])
+def api_audit_cancel(audit_id):
+    cancel = _audit_jobs.get(audit_id)
+    if cancel is None:
+        return jsonify({"error": "Audit introuvable ou terminé"}), 404
+    cancel.set()
+    return jsonify({"success": True})
 
 
 @app.route("/api/audit/fix-naming", methods=["POST"])
@@ -713,6 +1970,7 @@ def api_fix_naming():
         return jsonify({"error": "Aucun fichier à corriger"}), 400
 
     results = []
+    touched = set()
     for fix in fixes:
         dest = fix.get("destination", "")
         series_name = fix.get("series_name", "")
@@ -738,20 +1996,46 @@ def api_fix_naming():
             current_path.rename(expected_path)
             results.append({"current": current, "expected": expected, "success": True})
             log_action("fix_naming", {"series": series_name, "current": current, "expected": expected})
+            touched.add((dest, series_name))
         except Exception as e:
             results.append({"current": current, "error": str(e)})
 
-    invalidate_series_cache()
+    for dest, series_name in touched:
+        refresh_series(dest, series_name)
     return jsonify({"results": results})
 
 
 @app.route("/api/history")
 def api_history():
-    history = _load_history()
-    action_filter = request.args.get("action", "")
-    if action_filter:
-        history = [h for h in history if h["action"] == action_filter]
-    return jsonify({"history": history, "total": len(history)})
+    """History page, newest first: ?action, ?series, ?since, ?until, ?limit, ?cursor."""
+    args = request.args
+    try:
+        limit = min(int(args.get("limit", HISTORY_PAGE_SIZE)), HISTORY_PAGE_MAX)
+    except ValueError:
+        return jsonify({"error": "Paramètre limit invalide"}), 400
+    if limit < 1:
+        return jsonify({"error": "Paramètre limit invalide"}), 400
+    action = args.get("action", "")
+    series = args.get("series", "").strip()
+    since = args.get("since", "")
+    until = args.get("until", "")
+    try:
+        history, next_cursor = query_history(action, series, since, until, limit, args.get("cursor", ""))
+    except ValueError:
+        return jsonify({"error": "Paramètre cursor invalide"}), 400
+    total = count_history(action, series, since, until)
+    return jsonify({"history": history, "total": total, "next_cursor": next_cursor})
+
+
+@app.route("/api/history/stats")
+def api_history_stats():
+    """Counts per action and per day over the last ?days days (default 30)."""
+    try:
+        days = int(request.args.get("days", 30))
+    except ValueError:
+        return jsonify({"error": "Paramètre days invalide"}), 400
+    since_day = time.strftime("%Y-%m-%d", time.localtime(time.time() - max(days - 1, 0) * 86400))
+    return jsonify(history_stats(since_day))
 
 
 @app.route("/api/undo", methods=["POST"])
@@ -784,7 +2068,8 @@ def api_undo():
             "destination": str(restore_path),
             "original_action": action,
         })
-        invalidate_series_cache()
+        forget_aliases([(source_name, dest_path.parent.name, str(dest_path.parent.parent))])
+        refresh_library_path(dest_path)
         return jsonify({"success": True})
 
     elif action == "fix_naming":
@@ -816,7 +2101,7 @@ def api_undo():
             "current": expected,
             "expected": current,
         })
-        invalidate_series_cache()
+        refresh_library_path(target_path)
         return jsonify({"success": True})
 
     elif action == "convert":
@@ -842,6 +2127,7 @@ def api_undo():
             "deleted": str(cbz_path),
             "original_source": data.get("source", ""),
         })
+        refresh_library_path(cbz_path)
         return jsonify({"success": True})
 
     else:
@@ -872,6 +2158,8 @@ def api_organize_matched():
         return jsonify({"error": "Aucun fichier à organiser"}), 400
 
     results = []
+    learned = []
+    touched = set()
     for item in items:
         series_name = item.get("series_name", "").strip()
         destination = item.get("destination", "").strip()
@@ -894,6 +2182,7 @@ def api_organize_matched():
 
         series_dir = Path(destination) / series_name
         series_dir.mkdir(parents=True, exist_ok=True)
+        touched.add((destination, series_name))
 
         source_path = Path(source_dir) / source_name
         if not source_path.is_file():
@@ -908,6 +2197,10 @@ def api_organize_matched():
         if dest_path.exists():
             results.append({"source": source_name, "error": f"{new_name} existe déjà"})
             continue
+        copy = None if item.get("force") else find_library_copy(str(source_path))
+        if copy is not None:  # confirmed by sending the item again with "force": true
+            results.append({"source": source_name, "warning": f"Fichier identique déjà présent : {copy}", "duplicate_of": copy})
+            continue
 
         try:
             shutil.move(str(source_path), str(dest_path))
@@ -922,8 +2215,11 @@ def api_organize_matched():
             "success": True,
         })
         log_action("organize_batch", {"source": source_name, "destination": str(dest_path), "new_name": new_name, "series": series_name})
+        learned.append((source_name, series_name, destination))
 
-    invalidate_series_cache()
+    learn_aliases(learned)
+    for destination, series_name in touched:
+        refresh_series(destination, series_name)
     return jsonify({"results": results})
 
 
@@ -964,6 +2260,7 @@ def api_organize():
     series_dir.mkdir(parents=True, exist_ok=True)
 
     results = []
+    learned = []
     for file_info in files:
         source_name = file_info.get("source", "")
         tome = file_info.get("tome")
@@ -988,6 +2285,11 @@ def api_organize():
         if dest_path.exists():
             results.append({"source": source_name, "error": f"{new_name} existe déjà"})
             continue
+        # Same release already filed elsewhere in the library: the client confirms with a per-file "force"
+        copy = None if file_info.get("force") else find_library_copy(str(source_path))
+        if copy is not None:
+            results.append({"source": source_name, "warning": f"Fichier identique déjà présent : {copy}", "duplicate_of": copy})
+            continue
 
         try:
             shutil.move(str(source_path), str(dest_path))
@@ -1002,8 +2304,10 @@ def api_organize():
             "success": True,
         })
         log_action("organize", {"source": source_name, "destination": str(dest_path), "new_name": new_name, "series": series_name})
+        learned.append((source_name, series_name, destination))
 
-    invalidate_series_cache()
+    learn_aliases(learned)
+    refresh_series(destination, series_name)
     return jsonify({"results": results, "series_dir": str(series_dir)})
 
 
@@ -1067,19 +2371,12 @@ def api_trash():
         if not trash_dir.is_dir():
             continue
         source_label = Path(source_dir).name
-        for f in sorted(trash_dir.rglob("*")):
-            if not f.is_file():
-                continue
-            try:
-                rel = f.relative_to(trash_dir)
-            except ValueError:
-                continue
-            stat = f.stat()
+        for rel, stat in walk_files(trash_dir, skip_hidden=False):
             size = stat.st_size
             total_size += size
             deleted_at = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(stat.st_mtime))
             files.append({
-                "name": str(rel),
+                "name": rel,
                 "source_dir": source_dir,
                 "source_label": source_label,
                 "size": size,
@@ -1291,6 +2588,13 @@ def api_save_config():
 
     dashboard_enabled = bool(data.get("dashboard_enabled", False))
     thumbnails_enabled = bool(data.get("thumbnails_enabled", True))
+    watch_enabled = bool(data.get("watch_enabled", False))
+    verify_enabled = bool(data.get("verify_enabled", False))
+    stats_enabled = bool(data.get("stats_enabled", False))
+    try:
+        workers = max(0, min(32, int(data.get("convert_workers", 0) or 0)))
+    except (TypeError, ValueError):
+        workers = 0
 
     # Normalize extensions: lowercase, ensure leading dot
     raw_exts = data.get("extensions", list(DEFAULT_EXTENSIONS))
@@ -1325,153 +2629,375 @@ def api_save_config():
         "audit_case": audit_case,
         "dashboard_enabled": dashboard_enabled,
         "thumbnails_enabled": thumbnails_enabled,
+        "watch_enabled": watch_enabled,
+        "verify_enabled": verify_enabled,
+        "stats_enabled": stats_enabled,
+        "convert_workers": workers,
         "lang": lang,
     }
     save_config(cfg)
-    invalidate_series_cache()
+    if watch_enabled:
+        start_watcher()  # restarts on the new sources if they changed
+    else:
+        stop_watcher()
+    if verify_enabled:
+        start_verifier()
+    else:
+        stop_verifier()
+    if stats_enabled:
+        start_sampler()
+    else:
+        stop_sampler()
     result = {"success": True, "config": cfg}
     if warnings:
         result["warnings"] = warnings
     return jsonify(result)
 
 
+CONVERT_CHUNK_SIZE = 1024 * 1024
+
+# PDF rendering: encoded pages in flight per render process (peak memory is about that many
+# pages per process), render processes per conversion
+RENDER_AHEAD = 1
+RENDER_WORKERS_MAX = 16
+
+# CBZ page recompression: target format -> (Pillow format, page extension, encoder options);
+# formats missing from the installed Pillow are not offered (see recompress_formats)
+RECOMPRESS_FORMATS = {
+    "webp": ("WEBP", ".webp", {"method": 6}),
+    "avif": ("AVIF", ".avif", {}),
+    "jpeg": ("JPEG", ".jpg", {"optimize": True, "progressive": True}),
+}
+
+
+def _check_written(zip_path: Path, written: dict[str, tuple[int, int]]) -> None:
+    """Compare the central directory of a new ZIP with the (size, crc) of what was written."""
+    with zipfile.ZipFile(str(zip_path), "r") as zf:
+        entries = {i.filename: (i.file_size, i.CRC) for i in zf.infolist() if not i.is_dir()}
+    if entries != written:
+        bad = sorted(set(entries.items()) ^ set(written.items()))
+        raise ValueError(f"Fichier corrompu dans le CBZ: {bad[0][0]}" if bad else "CBZ invalide")
+
+
 def convert_cbr_to_cbz(cbr_path: Path, delete_original: bool = False) -> dict:
-    """Convert a .cbr (RAR) file to .cbz (ZIP) with post-conversion integrity check."""
+    """Convert a .cbr (RAR) file to .cbz (ZIP) with post-conversion integrity check.
+
+    Each RAR member is streamed straight into its ZIP entry (no extraction to a
+    temporary folder); CRCs are checked against the RAR headers while copying,
+    and the result is verified from the ZIP central directory.
+    """
     cbz_path = cbr_path.with_suffix(".cbz")
     if cbz_path.exists():
         raise FileExistsError(f"{cbz_path.name} existe déjà")
+    part_path = cbz_path.with_name(cbz_path.name + ".part")  # renamed once verified
 
-    with tempfile.TemporaryDirectory() as tmp:
+    written: dict[str, tuple[int, int]] = {}  # arcname -> (size, crc)
+    try:
         with rarfile.RarFile(str(cbr_path)) as rf:
-            rf.extractall(tmp)
+            members = sorted((i for i in rf.infolist() if not i.is_dir()), key=lambda i: i.filename)
+            if not members:
+                raise ValueError(f"Aucun fichier extrait de {cbr_path.name}")
+            with zipfile.ZipFile(str(part_path), "w", zipfile.ZIP_STORED) as zf:
+                for info in members:
+                    zinfo = zipfile.ZipInfo(info.filename, date_time=max(info.date_time or (1980, 1, 1, 0, 0, 0),
+                                                                         (1980, 1, 1, 0, 0, 0)))
+                    zinfo.file_size = info.file_size  # lets zipfile switch to ZIP64 for huge pages
+                    size = crc = 0
+                    with rf.open(info) as src, zf.open(zinfo, "w") as dst:
+                        while chunk := src.read(CONVERT_CHUNK_SIZE):
+                            crc = zlib.crc32(chunk, crc)
+                            size += len(chunk)
+                            dst.write(chunk)
+                    if size != info.file_size or (info.CRC is not None and crc != info.CRC):
+                        raise ValueError(f"Fichier corrompu dans le CBR: {info.filename}")
+                    written[info.filename] = (size, crc)
+
+        _check_written(part_path, written)
+    except zipfile.BadZipFile as e:
+        part_path.unlink(missing_ok=True)
+        raise ValueError(f"CBZ invalide: {e}")
+    except Exception:
+        part_path.unlink(missing_ok=True)
+        raise
 
-        # Collect extracted files
-        extracted_files = []
-        for root, _dirs, fnames in os.walk(tmp):
-            for fname in sorted(fnames):
-                extracted_files.append(Path(root) / fname)
-        extracted_count = len(extracted_files)
+    if part_path.stat().st_size == 0:
+        part_path.unlink(missing_ok=True)
+        raise ValueError("Le fichier CBZ créé est vide")
 
-        if extracted_count == 0:
-            raise ValueError(f"Aucun fichier extrait de {cbr_path.name}")
+    os.replace(part_path, cbz_path)
+    if delete_original:
+        cbr_path.unlink()
 
-        # Create ZIP
-        with zipfile.ZipFile(str(cbz_path), "w", zipfile.ZIP_STORED) as zf:
-            for fpath in extracted_files:
-                arcname = str(fpath.relative_to(tmp))
-                zf.write(fpath, arcname)
+    return {"cbz_path": cbz_path, "verified": True, "files_count": len(written)}
+
+
+def _embedded_page_image(doc, page) -> tuple[str, bytes] | None:
+    """Return (extension, bytes) of the image a page consists of, or None for mixed content.
+
+    A page qualifies when it shows one upright image covering the whole page and
+    nothing else visible (text other than an invisible OCR layer, drawings, annotations).
+    """
+    if page.rotation or page.first_annot or page.first_widget:
+        return None
+    images = page.get_images(full=True)
+    if len(images) != 1:
+        return None
+    placements = page.get_image_rects(images[0][0], transform=True)
+    if len(placements) != 1:
+        return None
+    rect, matrix = placements[0]
+    box = page.rect
+    tol_x, tol_y = max(1.0, box.width * 0.01), max(1.0, box.height * 0.01)
+    if (abs(matrix.b) > 1e-3 or abs(matrix.c) > 1e-3 or matrix.a <= 0 or matrix.d <= 0
+            or abs(rect.x0 - box.x0) > tol_x or abs(rect.x1 - box.x1) > tol_x
+            or abs(rect.y0 - box.y0) > tol_y or abs(rect.y1 - box.y1) > tol_y):
+        return None
+    if page.get_drawings() or any(span["type"] != 3 for span in page.get_texttrace()):
+        return None
+    image = doc.extract_image(images[0][0])
+    if not image or image["smask"] or image["ext"] not in ("jpeg", "png") or image["colorspace"] not in (1, 3):
+        return None
+    return ("jpg" if image["ext"] == "jpeg" else "png"), image["image"]
+
+
+def _encode_pdf_page(doc, index: int, zoom: float, image_format: str,
+                     jpeg_quality: int) -> tuple[str, bytes, bool]:
+    """Encode one page in memory; return (file name, image bytes, copied).
+
+    Pages made of a single full-page image get that image's original stream;
+    the others are rendered.
+    """
+    page = doc[index]
+    embedded = _embedded_page_image(doc, page)
+    if embedded is not None:
+        return f"page_{index + 1:04d}.{embedded[0]}", embedded[1], True
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+    if image_format == "jpeg":
+        return f"page_{index + 1:04d}.jpg", pix.tobytes("jpeg", jpg_quality=jpeg_quality), False
+    return f"page_{index + 1:04d}.png", pix.tobytes("png"), False
+
+
+_render_doc = None  # in a render process: the PDF being converted (see _open_render_doc)
 
-        # Integrity verification
-        try:
-            with zipfile.ZipFile(str(cbz_path), "r") as zf:
-                bad_file = zf.testzip()
-                if bad_file is not None:
-                    raise ValueError(f"Fichier corrompu dans le CBZ: {bad_file}")
-                cbz_count = len([i for i in zf.infolist() if not i.is_dir()])
-                if cbz_count != extracted_count:
-                    raise ValueError(f"Nombre de fichiers incorrect: {cbz_count} vs {extracted_count} attendus")
-        except zipfile.BadZipFile as e:
-            cbz_path.unlink(missing_ok=True)
-            raise ValueError(f"CBZ invalide: {e}")
-        except ValueError:
-            cbz_path.unlink(missing_ok=True)
-            raise
 
-        if cbz_path.stat().st_size == 0:
-            cbz_path.unlink(missing_ok=True)
-            raise ValueError("Le fichier CBZ créé est vide")
+def _open_render_doc(pdf_path: str) -> None:
+    global _render_doc
+    _render_doc = fitz.open(pdf_path)
 
-        if delete_original:
-            cbr_path.unlink()
 
-    return {"cbz_path": cbz_path, "verified": True, "files_count": cbz_count}
+def _encode_render_page(index: int, zoom: float, image_format: str, jpeg_quality: int) -> tuple[str, bytes, bool]:
+    """_encode_pdf_page on the document opened by this render process."""
+    return _encode_pdf_page(_render_doc, index, zoom, image_format, jpeg_quality)
+
+
+def _ordered_map(fn, tasks, workers: int, initializer=None, initargs=()):
+    """Yield fn(*task) in task order, computed by up to `workers` processes.
+
+    At most workers * RENDER_AHEAD tasks are in flight: a result is only
+    requested once the caller has consumed the previous ones.
+    """
+    if workers <= 1:
+        for task in tasks:
+            yield fn(*task)
+        return
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=initializer, initargs=initargs)
+    try:
+        pending: deque = deque()
+        for task in tasks:
+            pending.append(pool.submit(fn, *task))
+            if len(pending) >= workers * RENDER_AHEAD:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(cancel_futures=True)
 
 
 def convert_pdf_to_cbz(pdf_path: Path, delete_original: bool = False,
                         dpi: int = 200, image_format: str = "jpeg",
-                        jpeg_quality: int = 90) -> dict:
-    """Convert a .pdf file to .cbz by rendering pages to images."""
+                        jpeg_quality: int = 90, workers: int = 1) -> dict:
+    """Convert a .pdf file to .cbz by rendering pages to images.
+
+    Pages are encoded in memory by `workers` processes and written straight into
+    the CBZ in page order; the result is verified from the ZIP central directory.
+    Pages that are a single full-page image are copied losslessly instead of
+    rendered (pages_copied).
+    """
     cbz_path = pdf_path.with_suffix(".cbz")
     if cbz_path.exists():
         raise FileExistsError(f"{cbz_path.name} existe déjà")
+    part_path = cbz_path.with_name(cbz_path.name + ".part")  # renamed once verified
 
     dpi = max(150, min(300, dpi))
     jpeg_quality = max(70, min(100, jpeg_quality))
     if image_format not in ("jpeg", "png"):
         image_format = "jpeg"
+    options = {"zoom": dpi / 72, "image_format": image_format, "jpeg_quality": jpeg_quality}
 
-    ext = "jpg" if image_format == "jpeg" else "png"
-    zoom = dpi / 72
-    mat = fitz.Matrix(zoom, zoom)
-
-    with tempfile.TemporaryDirectory() as tmp:
-        doc = fitz.open(str(pdf_path))
+    written: dict[str, tuple[int, int]] = {}  # name -> (size, crc)
+    copied = 0
+    with fitz.open(str(pdf_path)) as doc:
         page_count = len(doc)
-
         if page_count == 0:
-            doc.close()
             raise ValueError(f"Aucune page dans {pdf_path.name}")
+        workers = max(1, min(RENDER_WORKERS_MAX, workers, page_count))
+        if workers == 1:
+            pages = (_encode_pdf_page(doc, i, **options) for i in range(page_count))
+        else:
+            pages = _ordered_map(partial(_encode_render_page, **options), ((i,) for i in range(page_count)),
+                                 workers, initializer=_open_render_doc, initargs=(str(pdf_path),))
+        try:
+            with zipfile.ZipFile(str(part_path), "w", zipfile.ZIP_STORED) as zf:
+                for name, data, page_copied in pages:
+                    zf.writestr(zipfile.ZipInfo(name, date_time=time.localtime()[:6]), data)
+                    written[name] = (len(data), zlib.crc32(data))
+                    copied += page_copied
+            _check_written(part_path, written)
+        except zipfile.BadZipFile as e:
+            part_path.unlink(missing_ok=True)
+            raise ValueError(f"CBZ invalide: {e}")
+        except Exception:
+            part_path.unlink(missing_ok=True)
+            raise
+        finally:
+            pages.close()  # stops the render processes if writing failed
 
-        extracted_files = []
-        for i in range(page_count):
-            page = doc[i]
-            pix = page.get_pixmap(matrix=mat)
-            page_filename = f"page_{i + 1:04d}.{ext}"
-            page_path = Path(tmp) / page_filename
-            if image_format == "jpeg":
-                pix.save(str(page_path), jpg_quality=jpeg_quality)
-            else:
-                pix.save(str(page_path))
-            extracted_files.append(page_path)
+    if part_path.stat().st_size == 0:
+        part_path.unlink(missing_ok=True)
+        raise ValueError("Le fichier CBZ créé est vide")
 
-        doc.close()
-        extracted_count = len(extracted_files)
+    os.replace(part_path, cbz_path)
+    if delete_original:
+        pdf_path.unlink()
+
+    return {"cbz_path": cbz_path, "verified": True, "files_count": len(written), "pages": page_count,
+            "pages_copied": copied, "pages_rendered": page_count - copied}
+
+
+def recompress_formats() -> list[str]:
+    """Recompression formats the installed Pillow can write."""
+    Image.init()
+    return [name for name, (pil_format, _ext, _options) in RECOMPRESS_FORMATS.items() if pil_format in Image.SAVE]
+
+
+def _to_srgb(img: Image.Image, icc_profile: bytes) -> Image.Image:
+    """Convert an image tagged with a non-RGB ICC profile (CMYK scans) to sRGB through that profile."""
+    from PIL import ImageCms  # needs Pillow built with LittleCMS; ImportError otherwise
+
+    profile = ImageCms.ImageCmsProfile(BytesIO(icc_profile))
+    return ImageCms.profileToProfile(img, profile, ImageCms.createProfile("sRGB"), outputMode="RGB")
 
-        # Create CBZ
-        with zipfile.ZipFile(str(cbz_path), "w", zipfile.ZIP_STORED) as zf:
-            for fpath in extracted_files:
-                zf.write(fpath, fpath.name)
 
-        # Integrity verification
+def _recompress_page(name: str, data: bytes, image_format: str, quality: int) -> tuple[str, bytes, bool]:
+    """Re-encode one CBZ entry (runs in a worker process); return (name, bytes, recompressed).
+
+    The entry is returned unchanged when it is not a page, is already in the target
+    format or re-encoding would not shrink it. The ICC profile and EXIF are kept.
+    """
+    if not _is_page(name):
+        return name, data, False
+    pil_format, ext, options = RECOMPRESS_FORMATS[image_format]
+    try:
+        with Image.open(BytesIO(data)) as img:
+            if img.format == pil_format or getattr(img, "n_frames", 1) > 1:
+                return name, data, False
+            icc_profile = img.info.get("icc_profile")
+            metadata = {"exif": img.info["exif"]} if img.info.get("exif") else {}
+            if "A" in img.getbands() or "transparency" in img.info:
+                if pil_format == "JPEG":
+                    return name, data, False
+                img = img.convert("RGBA")
+            elif img.mode not in ("L", "RGB"):
+                if icc_profile:  # the profile describes the source colour space, not RGB
+                    img, icc_profile = _to_srgb(img, icc_profile), None
+                else:
+                    img = img.convert("RGB")
+            if icc_profile:
+                metadata["icc_profile"] = icc_profile
+            out = BytesIO()
+            img.save(out, pil_format, quality=quality, **options, **metadata)
+    except Exception:  # undecodable page or profile: left as is
+        return name, data, False
+    if out.tell() >= len(data):
+        return name, data, False
+    return str(Path(name).with_suffix(ext)), out.getvalue(), True
+
+
+def recompress_cbz(cbz_path: Path, image_format: str = "webp", quality: int = 80, workers: int = 1) -> dict:
+    """Re-encode the pages of a CBZ to `image_format`, replacing it only if the result is smaller.
+
+    Pages are re-encoded by `workers` processes and keep their original bytes when
+    that does not save space. The new CBZ is checked (central directory and page
+    count) before it atomically replaces the original.
+    """
+    if image_format not in RECOMPRESS_FORMATS:
+        raise ValueError(f"Format non pris en charge : {image_format}")
+    quality = max(30, min(100, quality))
+    part_path = cbz_path.with_name(cbz_path.name + ".part")  # renamed once verified
+    bytes_before = cbz_path.stat().st_size
+
+    written: dict[str, tuple[int, int]] = {}  # name -> (size, crc)
+    recompressed = 0
+    with zipfile.ZipFile(str(cbz_path)) as src:
+        infos = [i for i in src.infolist() if not i.is_dir()]
+        names = {i.filename for i in infos}
+        workers = max(1, min(RENDER_WORKERS_MAX, workers, len(infos)))
+        pages = _ordered_map(_recompress_page, ((i.filename, src.read(i), image_format, quality) for i in infos),
+                             workers)
         try:
-            with zipfile.ZipFile(str(cbz_path), "r") as zf:
-                bad_file = zf.testzip()
-                if bad_file is not None:
-                    raise ValueError(f"Fichier corrompu dans le CBZ: {bad_file}")
-                cbz_count = len([info for info in zf.infolist() if not info.is_dir()])
-                if cbz_count != extracted_count:
-                    raise ValueError(f"Nombre de fichiers incorrect: {cbz_count} vs {extracted_count} attendus")
+            with zipfile.ZipFile(str(part_path), "w", zipfile.ZIP_STORED) as zf:
+                for info, (name, data, changed) in zip(infos, pages):
+                    if changed and name != info.filename and (name in names or name in written):
+                        name, data, changed = info.filename, src.read(info), False  # new name already taken
+                    zinfo = zipfile.ZipInfo(name, date_time=info.date_time)
+                    zinfo.compress_type = zipfile.ZIP_STORED if changed else info.compress_type
+                    zf.writestr(zinfo, data)
+                    written[name] = (len(data), zlib.crc32(data))
+                    recompressed += changed
+            _check_written(part_path, written)
+            with zipfile.ZipFile(str(part_path)) as zf:
+                page_count = sum(_is_page(i.filename) for i in zf.infolist() if not i.is_dir())
+            expected = sum(_is_page(i.filename) for i in infos)
+            if page_count != expected:
+                raise ValueError(f"Nombre de pages incorrect: {page_count} vs {expected} attendues")
         except zipfile.BadZipFile as e:
-            cbz_path.unlink(missing_ok=True)
+            part_path.unlink(missing_ok=True)
             raise ValueError(f"CBZ invalide: {e}")
-        except ValueError:
-            cbz_path.unlink(missing_ok=True)
+        except Exception:
+            part_path.unlink(missing_ok=True)
             raise
+        finally:
+            pages.close()
 
-        if cbz_path.stat().st_size == 0:
-            cbz_path.unlink(missing_ok=True)
-            raise ValueError("Le fichier CBZ créé est vide")
-
-        if delete_original:
-            pdf_path.unlink()
-
-    return {"cbz_path": cbz_path, "verified": True, "files_count": cbz_count, "pages": page_count}
+    bytes_after = part_path.stat().st_size
+    if recompressed and bytes_after < bytes_before:
+        os.replace(part_path, cbz_path)
+    else:
+        part_path.unlink()
+        bytes_after = bytes_before
+    return {"cbz_path": cbz_path, "verified": True, "files_count": len(written),
+            "pages_recompressed": recompressed if bytes_after < bytes_before else 0,
+            "bytes_before": bytes_before, "bytes_after": bytes_after}
 
 
 @app.route("/api/series-folders")
 def api_series_folders():
     """Return all series folders across all destinations (for convert path picker)."""
     q = request.args.get("q", "").strip().lower()
-    existing = get_existing_series()
+    destinations = load_config()["destinations"]
+    refresh_catalog(destinations, volumes=False)
+    rows = _catalog_db().execute(
+        f"SELECT name, destination FROM series WHERE destination IN ({','.join('?' * len(destinations))})",
+        destinations,
+    )
     folders = []
-    for _key, entries in existing.items():
-        for entry in entries:
-            folder_path = str(Path(entry["destination"]) / entry["name"])
-            folders.append({
-                "name": entry["name"],
-                "path": folder_path,
-                "dest_label": entry["dest_label"],
-            })
+    for name, destination in rows:
+        folders.append({
+            "name": name,
+            "path": str(Path(destination) / name),
+            "dest_label": Path(destination).name,
+        })
     folders.sort(key=lambda f: f["name"].lower())
     if q:
         q_norm = normalize(q)
@@ -1498,11 +3024,8 @@ def api_scan_cbr():
     scan_extensions = {".cbr", ".pdf"}
 
     groups: dict[str, dict] = {}
-    for f in sorted(base.rglob("*")):
-        if f.suffix.lower() not in scan_extensions:
-            continue
-        if any(part.startswith(".") for part in f.relative_to(base).parts):
-            continue
+    for rel, st in walk_files(base, extensions=scan_extensions, workers=SCAN_WORKERS):
+        f = base / rel
         parent = f.parent
         group_key = str(parent)
         if group_key not in groups:
@@ -1515,8 +3038,8 @@ def api_scan_cbr():
         groups[group_key]["files"].append({
             "name": f.name,
             "path": str(f),
-            "size": f.stat().st_size,
-            "size_human": format_size(f.stat().st_size),
+            "size": st.st_size,
+            "size_human": format_size(st.st_size),
             "tome": detect_tome(f.name),
             "has_cbz": cbz_sibling.exists(),
             "format": f.suffix.lower().lstrip("."),
@@ -1527,6 +3050,11 @@ def api_scan_cbr():
 
 @app.route("/api/convert", methods=["POST"])
 def api_convert():
+    """Queue the selected CBR/PDF files as a background conversion job.
+
+    Returns {"job_id": ..., "results": [...]} where results lists the rejected items;
+    progress is read from GET /api/convert/jobs/<id>.
+    """
     data = request.get_json()
     items = data.get("items", [])
     delete_original = data.get("delete_original", False)
@@ -1534,55 +3062,1725 @@ def api_convert():
     if not items:
         return jsonify({"error": "Aucun fichier sélectionné"}), 400
 
+    image_format = data.get("image_format", "jpeg")
+    if image_format not in ("jpeg", "png"):
+        return jsonify({"error": f"Format non pris en charge : {image_format}"}), 400
+    try:
+        dpi = max(150, min(300, int(data.get("dpi", 200))))
+    except (TypeError, ValueError):
+        return jsonify({"error": "Paramètre dpi invalide"}), 400
+    try:
+        jpeg_quality = max(70, min(100, int(data.get("jpeg_quality", 90))))
+    except (TypeError, ValueError):
+        return jsonify({"error": "Paramètre jpeg_quality invalide"}), 400
     cfg = load_config()
+    try:
+        render_workers = page_workers(int(data.get("render_workers", 1)), cfg)
+    except (TypeError, ValueError):
+        return jsonify({"error": "Paramètre render_workers invalide"}), 400
     allowed = [Path(d).resolve() for d in cfg["destinations"]]
 
     results = []
+    paths = []
     for item in items:
         cbr_path = Path(item.get("path", "")).resolve()
         if not any(cbr_path.is_relative_to(a) for a in allowed):
             results.append({"source": cbr_path.name, "error": "Chemin non autorisé"})
             continue
-        file_ext = cbr_path.suffix.lower()
-        if not cbr_path.is_file() or file_ext not in (".cbr", ".pdf"):
+        if not cbr_path.is_file() or cbr_path.suffix.lower() not in (".cbr", ".pdf"):
             results.append({"source": str(cbr_path), "error": "Fichier CBR/PDF introuvable"})
             continue
+        paths.append(str(cbr_path))
+
+    job_id = None
+    if paths:
+        job_id = submit_conversion(paths, {
+            "delete_original": bool(delete_original),
+            "dpi": dpi,
+            "image_format": image_format,
+            "jpeg_quality": jpeg_quality,
+            "render_workers": render_workers,
+        })
+    return jsonify({"job_id": job_id, "results": results})
+
+
+@app.route("/api/convert/jobs")
+def api_convert_jobs():
+    """Recent conversion jobs, newest first (items omitted)."""
+    start_converter()
+    return jsonify({"jobs": list_conversion_jobs()})
+
+
+@app.route("/api/convert/jobs/<int:job_id>")
+def api_convert_job(job_id):
+    """Progress of one conversion job, with the status of each item."""
+    start_converter()
+    job = conversion_job(job_id)
+    if job is None:
+        return jsonify({"error": "Conversion introuvable"}), 404
+    return jsonify(job)
+
+
+@app.route("/api/convert/jobs/<int:job_id>/cancel", methods=["POST"])
+def api_convert_job_cancel(job_id):
+    """Cancel the queued items of a conversion job; items being converted finish."""
+    if not cancel_conversion(job_id):
+        return jsonify({"error": "Conversion introuvable"}), 404
+    return jsonify(conversion_job(job_id))
+
+
+@app.route("/api/recompress", methods=["POST"])
+def api_recompress():
+    """Queue the CBZs under a folder (default: every destination) for page recompression.
+
+    Body: {"path"?, "image_format", "quality", "workers"}. Returns {"job_id", "volumes"};
+    progress and bytes saved are read from GET /api/convert/jobs/<id>.
+    """
+    data = request.get_json() or {}
+    image_format = data.get("image_format", "webp")
+    if image_format not in recompress_formats():
+        return jsonify({"error": f"Format non pris en charge : {image_format}"}), 400
+
+    try:
+        quality = max(30, min(100, int(data.get("quality", 80))))
+    except (TypeError, ValueError):
+        return jsonify({"error": "Paramètre quality invalide"}), 400
+    cfg = load_config()
+    try:
+        workers = page_workers(int(data.get("workers", 1)), cfg)
+    except (TypeError, ValueError):
+        return jsonify({"error": "Paramètre workers invalide"}), 400
+    allowed = [Path(d).resolve() for d in cfg["destinations"]]
+    scan_path = (data.get("path") or "").strip()
+    if scan_path:
+        base = Path(scan_path).resolve()
+        if not base.is_dir():
+            return jsonify({"error": "Dossier introuvable"}), 400
+        if not any(base == a or base.is_relative_to(a) for a in allowed):
+            return jsonify({"error": "Ce dossier n'est pas dans une destination configurée"}), 403
+        roots = [base]
+    else:
+        roots = [a for a in allowed if a.is_dir()]
+
+    paths = [str(root / rel) for root in roots
+             for rel, _st in walk_files(root, extensions={".cbz"}, workers=SCAN_WORKERS)]
+    job_id = None
+    if paths:
+        job_id = submit_conversion(paths, {
+            "mode": "recompress",
+            "image_format": image_format,
+            "quality": quality,
+            "workers": workers,
+        })
+    return jsonify({"job_id": job_id, "volumes": len(paths)})
+
+
+@app.route("/api/recompress/report")
+def api_recompress_report():
+    """Bytes saved by page recompression, per series folder."""
+    series = recompression_report()
+    saved = sum(s["saved"] for s in series)
+    return jsonify({"series": series, "saved": saved, "saved_human": format_size(saved),
+                    "formats": recompress_formats()})
+
+
+# ─── CONVERSION JOBS ────────────────────────────────────
+
+_JOBS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created TEXT NOT NULL,
+    options TEXT NOT NULL,      -- JSON: delete_original, dpi, image_format, jpeg_quality
+    cancelled INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS job_items (
+    job_id INTEGER NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    idx INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    status TEXT NOT NULL,       -- queued, running, done, error, cancelled
+    destination TEXT,
+    verified INTEGER,
+    files_count INTEGER,
+    pages_copied INTEGER,       -- PDF: pages whose embedded image was copied as is
+    pages_rendered INTEGER,     -- PDF: pages rasterized
+    pages_recompressed INTEGER, -- recompression: pages re-encoded (the others kept as is)
+    bytes_before INTEGER,       -- recompression: CBZ size before and after (equal if not replaced)
+    bytes_after INTEGER,
+    error TEXT,
+    PRIMARY KEY (job_id, idx)
+);
+CREATE INDEX IF NOT EXISTS job_items_status ON job_items (status, job_id, idx);
+"""
+
+# Columns added to job_items by each schema upgrade (index i: version i + 1 -> i + 2)
+_JOBS_MIGRATIONS = [
+    ("pages_copied", "pages_rendered"),
+    ("pages_recompressed", "bytes_before", "bytes_after"),
+]
+
+_jobs_local = threading.local()
+_jobs_lock = threading.Lock()  # serializes job writes (request threads and the dispatcher)
+_converting: set[tuple[int, int]] = set()  # (job_id, idx) handed to a process pool by this server
+
+
+def _jobs_db() -> sqlite3.Connection:
+    """Return this thread's connection to the conversion jobs database, creating it if needed."""
+    conn = getattr(_jobs_local, "conn", None)
+    if conn is not None and _jobs_local.path == CONVERT_JOBS_DB_PATH:
+        return conn
+    conn = _sqlite_connect(CONVERT_JOBS_DB_PATH)
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version != CONVERT_JOBS_DB_VERSION:
+        with _jobs_lock, conn:
+            conn.executescript(_JOBS_SCHEMA)
+            for columns in _JOBS_MIGRATIONS[version - 1:] if version else ():
+                for column in columns:
+                    conn.execute(f"ALTER TABLE job_items ADD COLUMN {column} INTEGER")
+            conn.execute(f"PRAGMA user_version = {CONVERT_JOBS_DB_VERSION}")
+    _jobs_local.conn = conn
+    _jobs_local.path = CONVERT_JOBS_DB_PATH
+    return conn
+
+
+def convert_workers(cfg: dict | None = None) -> int:
+    """Number of conversion processes: convert_workers from config, or half the CPUs."""
+    if cfg is None:
+        cfg = load_config()
+    workers = cfg.get("convert_workers") or 0
+    return workers if isinstance(workers, int) and workers > 0 else max(1, (os.cpu_count() or 2) // 2)
+
+
+def page_workers(requested: int, cfg: dict | None = None) -> int:
+    """Clamp the page processes of one conversion so that, with convert_workers() files at once, they fit the CPUs."""
+    budget = max(1, (os.cpu_count() or 1) // convert_workers(cfg))
+    return max(1, min(RENDER_WORKERS_MAX, budget, requested))
+
+
+def submit_conversion(paths: list[str], options: dict) -> int:
+    """Record a conversion job for the given files and wake the dispatcher; return the job id."""
+    conn = _jobs_db()
+    with _jobs_lock, conn:
+        job_id = conn.execute(
+            "INSERT INTO jobs (created, options) VALUES (?, ?)",
+            (time.strftime("%Y-%m-%dT%H:%M:%S"), json.dumps(options)),
+        ).lastrowid
+        conn.executemany(
+            "INSERT INTO job_items (job_id, idx, path, status) VALUES (?, ?, ?, 'queued')",
+            [(job_id, idx, path) for idx, path in enumerate(paths)],
+        )
+    start_converter()
+    return job_id
+
+
+def cancel_conversion(job_id: int) -> bool:
+    """Mark a job cancelled and drop its queued items; False if the job does not exist."""
+    conn = _jobs_db()
+    with _jobs_lock, conn:
+        if conn.execute("UPDATE jobs SET cancelled = 1 WHERE id = ?", (job_id,)).rowcount == 0:
+            return False
+        conn.execute("UPDATE job_items SET status = 'cancelled' WHERE job_id = ? AND status = 'queued'", (job_id,))
+    return True
+
+
+def _job_summary(conn: sqlite3.Connection, job_id: int, created: str, cancelled: int) -> dict:
+    counts = dict(conn.execute("SELECT status, COUNT(*) FROM job_items WHERE job_id = ? GROUP BY status", (job_id,)))
+    total = sum(counts.values())
+    pending = counts.get("queued", 0) + counts.get("running", 0)
+    status = "running" if pending else "cancelled" if cancelled else "done"
+    saved = conn.execute("SELECT SUM(bytes_before - bytes_after) FROM job_items WHERE job_id = ?",
+                         (job_id,)).fetchone()[0]
+    return {"id": job_id, "created": created, "status": status, "total": total, "done": total - pending,
+            "errors": counts.get("error", 0), "saved": saved,
+            "saved_human": format_size(saved) if saved is not None else None}
+
+
+def list_conversion_jobs() -> list[dict]:
+    conn = _jobs_db()
+    rows = conn.execute("SELECT id, created, cancelled FROM jobs ORDER BY id DESC LIMIT ?", (CONVERT_JOBS_LISTED,))
+    return [_job_summary(conn, *row) for row in rows.fetchall()]
+
+
+def conversion_job(job_id: int) -> dict | None:
+    """Summary of a job plus the status (and result or error) of each of its items."""
+    conn = _jobs_db()
+    row = conn.execute("SELECT id, created, cancelled FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    if row is None:
+        return None
+    job = _job_summary(conn, *row)
+    job["items"] = [
+        {"path": path, "source": Path(path).name, "status": status,
+         "destination": Path(destination).name if destination else None,
+         "verified": bool(verified), "files_count": files_count,
+         "pages_copied": pages_copied, "pages_rendered": pages_rendered, "pages_recompressed": recompressed,
+         "bytes_before": before, "bytes_after": after, "error": error}
+        for (path, status, destination, verified, files_count, pages_copied, pages_rendered,
+             recompressed, before, after, error) in conn.execute(
+            "SELECT path, status, destination, verified, files_count, pages_copied, pages_rendered,"
+            " pages_recompressed, bytes_before, bytes_after, error FROM job_items"
+            " WHERE job_id = ? ORDER BY idx", (job_id,))
+    ]
+    return job
+
+
+def recompression_report() -> list[dict]:
+    """Bytes saved by the completed recompressions per series folder, largest savings first."""
+    report: dict[str, dict] = {}
+    rows = _jobs_db().execute(
+        "SELECT path, bytes_before - bytes_after FROM job_items WHERE status = 'done' AND bytes_before IS NOT NULL")
+    for path, saved in rows:
+        folder = Path(path).parent
+        entry = report.setdefault(str(folder), {"series": folder.name, "path": str(folder), "volumes": set(), "saved": 0})
+        entry["volumes"].add(path)
+        entry["saved"] += saved
+    for entry in report.values():
+        entry["volumes"] = len(entry["volumes"])
+        entry["saved_human"] = format_size(entry["saved"])
+    return sorted(report.values(), key=lambda e: (-e["saved"], e["path"]))
+
+
+def _convert_worker(path: str, options: dict) -> dict:
+    """Convert one file, or recompress one CBZ (runs in a worker process)."""
+    src = Path(path)
+    if options.get("mode") == "recompress":
+        result = recompress_cbz(src, options["image_format"], options["quality"], options.get("workers", 1))
+        return {"destination": str(result["cbz_path"]), "verified": result["verified"],
+                "files_count": result["files_count"], "pages_recompressed": result["pages_recompressed"],
+                "bytes_before": result["bytes_before"], "bytes_after": result["bytes_after"]}
+    if src.suffix.lower() == ".pdf":
+        result = convert_pdf_to_cbz(src, options["delete_original"], options["dpi"],
+                                    options["image_format"], options["jpeg_quality"],
+                                    options.get("render_workers", 1))
+    else:
+        result = convert_cbr_to_cbz(src, options["delete_original"])
+    return {"destination": str(result["cbz_path"]), "verified": result["verified"],
+            "files_count": result["files_count"], "pages_copied": result.get("pages_copied"),
+            "pages_rendered": result.get("pages_rendered")}
+
+
+def _resume_conversions() -> None:
+    """Requeue the items a previous dispatcher left running, dropping their unfinished CBZ."""
+    conn = _jobs_db()
+    with _jobs_lock, conn:
+        rows = conn.execute("SELECT job_id, idx, path FROM job_items WHERE status = 'running'").fetchall()
+        for job_id, idx, path in rows:
+            if (job_id, idx) in _converting:  # still owned by a dispatcher that is shutting down
+                continue
+            Path(path).with_suffix(".cbz.part").unlink(missing_ok=True)
+            conn.execute("UPDATE job_items SET status = 'queued' WHERE job_id = ? AND idx = ?", (job_id, idx))
+
+
+def _claim_conversion() -> tuple | None:
+    """Mark the oldest queued item running; return (job_id, idx, path, options) or None."""
+    conn = _jobs_db()
+    with _jobs_lock, conn:
+        row = conn.execute(
+            "SELECT i.job_id, i.idx, i.path, j.options FROM job_items i JOIN jobs j ON j.id = i.job_id"
+            " WHERE i.status = 'queued' ORDER BY i.job_id, i.idx LIMIT 1"
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE job_items SET status = 'running' WHERE job_id = ? AND idx = ?", row[:2])
+        _converting.add(row[:2])
+    return row[0], row[1], row[2], json.loads(row[3])
+
+
+def _finish_conversion(job_id: int, idx: int, path: str, options: dict, future) -> None:
+    """Record the outcome of one item; log and catalog the CBZ it produced (or shrank)."""
+    conn = _jobs_db()
+    _converting.discard((job_id, idx))
+    if future.cancelled():
+        with _jobs_lock, conn:
+            conn.execute(
+                "UPDATE job_items SET status = CASE WHEN (SELECT cancelled FROM jobs WHERE id = ?)"
+                " THEN 'cancelled' ELSE 'queued' END WHERE job_id = ? AND idx = ?", (job_id, job_id, idx))
+        return
+    try:
+        result = future.result()
+    except Exception as e:
+        with _jobs_lock, conn:
+            conn.execute("UPDATE job_items SET status = 'error', error = ? WHERE job_id = ? AND idx = ?",
+                         (str(e) or type(e).__name__, job_id, idx))
+        return
+    if options.get("mode") == "recompress":
+        log_action("recompress", {
+            "source": path,
+            "series": Path(path).parent.name,
+            "format": options["image_format"],
+            "quality": options["quality"],
+            "files_count": result["files_count"],
+            "pages_recompressed": result["pages_recompressed"],
+            "bytes_before": result["bytes_before"],
+            "bytes_after": result["bytes_after"],
+            "saved_human": format_size(result["bytes_before"] - result["bytes_after"]),
+        })
+    else:
+        details = {
+            "source": path,
+            "destination": result["destination"],
+            "deleted_original": options["delete_original"],
+            "verified": result["verified"],
+            "files_count": result["files_count"],
+            "format": Path(path).suffix.lower().lstrip("."),
+        }
+        if result.get("pages_copied") is not None:
+            details.update(pages_copied=result["pages_copied"], pages_rendered=result["pages_rendered"])
+        log_action("convert", details)
+    try:
+        refresh_library_path(Path(result["destination"]))
+    except Exception:  # the next catalog refresh picks the CBZ up
+        app.logger.exception("Catalog refresh after conversion failed")
+    with _jobs_lock, conn:
+        conn.execute(
+            "UPDATE job_items SET status = 'done', destination = ?, verified = ?, files_count = ?,"
+            " pages_copied = ?, pages_rendered = ?, pages_recompressed = ?, bytes_before = ?, bytes_after = ?"
+            " WHERE job_id = ? AND idx = ?",
+            (result["destination"], result["verified"], result["files_count"],
+             result.get("pages_copied"), result.get("pages_rendered"), result.get("pages_recompressed"),
+             result.get("bytes_before"), result.get("bytes_after"), job_id, idx),
+        )
+
+
+def _convert_loop(stop: threading.Event) -> None:
+    """Feed queued items to a process pool until the queue is empty (or the service is stopped)."""
+    _resume_conversions()
+    workers = convert_workers()
+    running: dict = {}  # future -> (job_id, idx, path, options)
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        while not stop.is_set():
+            while len(running) < workers and (item := _claim_conversion()) is not None:
+                running[pool.submit(_convert_worker, item[2], item[3])] = item
+            if not running:
+                # Checked again under the services lock: a job submitted from now on starts a new dispatcher
+                with _services_lock:
+                    if _jobs_db().execute("SELECT 1 FROM job_items WHERE status = 'queued' LIMIT 1").fetchone():
+                        continue
+                    if _services.get("converter", {}).get("stop") is stop:
+                        del _services["converter"]
+                    return
+            done, _pending = wait(running, timeout=1, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    _finish_conversion(*running.pop(future), future)
+                except Exception:
+                    app.logger.exception("Recording a conversion failed")
+    finally:
+        pool.shutdown(cancel_futures=True)  # conversions already started run to completion
+        for future, item in running.items():
+            try:
+                _finish_conversion(*item, future)
+            except Exception:
+                app.logger.exception("Recording a conversion failed")
+
+
+def start_converter() -> None:
+    """Start the conversion dispatcher (no-op if already running); resumes jobs left by a restart."""
+    if _jobs_db().execute("SELECT 1 FROM job_items WHERE status IN ('queued', 'running') LIMIT 1").fetchone():
+        _start_service("converter", _convert_loop)
+
+
+def stop_converter() -> None:
+    """Stop the conversion dispatcher; items being converted finish, queued ones stay queued."""
+    _stop_service("converter")
+
+
+# ─── LIBRARY CATALOG ────────────────────────────────────
+
+_CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS destinations (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER            -- NULL: listing not settled yet, re-list on next refresh
+);
+CREATE TABLE IF NOT EXISTS series (
+    id INTEGER PRIMARY KEY,
+    destination TEXT NOT NULL,
+    name TEXT NOT NULL,
+    mtime_ns INTEGER,           -- NULL: volumes not listed (or not settled) yet
+    UNIQUE (destination, name)
+);
+CREATE TABLE IF NOT EXISTS volumes (
+    series_id INTEGER NOT NULL REFERENCES series(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    tome INTEGER,
+    title TEXT NOT NULL,
+    extension TEXT NOT NULL,
+    pages INTEGER,              -- page statistics (see sample_archives); NULL: not sampled yet, -1: file missing or changed
+    formats TEXT,
+    width INTEGER,
+    height INTEGER,
+    PRIMARY KEY (series_id, name)
+);
+CREATE INDEX IF NOT EXISTS volumes_extension ON volumes (extension);
+CREATE INDEX IF NOT EXISTS volumes_unsampled ON volumes (series_id) WHERE pages IS NULL;
+CREATE INDEX IF NOT EXISTS volumes_size ON volumes (size);
+-- Per-series, per-format counters kept up to date by the triggers below (dashboard)
+CREATE TABLE IF NOT EXISTS series_totals (
+    series_id INTEGER NOT NULL REFERENCES series (id) ON DELETE CASCADE,
+    extension TEXT NOT NULL,
+    volumes INTEGER NOT NULL,
+    bytes INTEGER NOT NULL,
+    PRIMARY KEY (series_id, extension)
+);
+CREATE TRIGGER IF NOT EXISTS volumes_insert AFTER INSERT ON volumes BEGIN
+    INSERT INTO series_totals (series_id, extension, volumes, bytes) VALUES (NEW.series_id, NEW.extension, 1, NEW.size)
+    ON CONFLICT (series_id, extension) DO UPDATE SET volumes = volumes + 1, bytes = bytes + excluded.bytes;
+END;
+CREATE TRIGGER IF NOT EXISTS volumes_delete AFTER DELETE ON volumes BEGIN
+    UPDATE series_totals SET volumes = volumes - 1, bytes = bytes - OLD.size
+    WHERE series_id = OLD.series_id AND extension = OLD.extension;
+END;
+CREATE TRIGGER IF NOT EXISTS volumes_update AFTER UPDATE OF size, extension ON volumes BEGIN
+    UPDATE series_totals SET volumes = volumes - 1, bytes = bytes - OLD.size
+    WHERE series_id = OLD.series_id AND extension = OLD.extension;
+    INSERT INTO series_totals (series_id, extension, volumes, bytes) VALUES (NEW.series_id, NEW.extension, 1, NEW.size)
+    ON CONFLICT (series_id, extension) DO UPDATE SET volumes = volumes + 1, bytes = bytes + excluded.bytes;
+END;
+CREATE TABLE IF NOT EXISTS hashes (
+    dev INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    partial TEXT,               -- hash of the head and tail blocks
+    full TEXT,                  -- hash of the whole file
+    PRIMARY KEY (dev, inode)
+);
+CREATE TABLE IF NOT EXISTS verdicts (
+    dev INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    path TEXT NOT NULL,         -- last known location
+    error TEXT,                 -- NULL: archive is sound
+    PRIMARY KEY (dev, inode)
+);
+CREATE INDEX IF NOT EXISTS verdicts_error ON verdicts (error) WHERE error IS NOT NULL;
+CREATE TABLE IF NOT EXISTS archive_stats (
+    dev INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    pages INTEGER NOT NULL,
+    formats TEXT NOT NULL,
+    width INTEGER,
+    height INTEGER,
+    PRIMARY KEY (dev, inode)
+);
+"""
+
+_catalog_local = threading.local()
+_catalog_lock = threading.Lock()  # serializes refreshes (SQLite allows a single writer)
+_catalog_reconciled = float("-inf")  # time of the last full refresh
+_reconcile_lock = threading.Lock()
+_reconcile_thread: threading.Thread | None = None
+
+
+def _sqlite_connect(path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+
+def _sql_statements(script: str) -> list[str]:
+    """Split an SQL script into single statements (trigger bodies stay whole)."""
+    statements = []
+    current = ""
+    for line in script.splitlines(keepends=True):
+        current += line
+        if sqlite3.complete_statement(current):
+            statements.append(current.strip())
+            current = ""
+    return statements
+
+
+def _catalog_db() -> sqlite3.Connection:
+    """Return this thread's connection to the library catalog, creating the schema if needed."""
+    conn = getattr(_catalog_local, "conn", None)
+    if conn is not None and _catalog_local.path == LIBRARY_DB_PATH:
+        return conn
+    conn = _sqlite_connect(LIBRARY_DB_PATH)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != LIBRARY_DB_VERSION:
+        # One reset for all threads and processes: the version is read again once the
+        # write lock is held, and the statements run one by one in that transaction
+        # (executescript() would commit it first)
+        with _catalog_lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if conn.execute("PRAGMA user_version").fetchone()[0] != LIBRARY_DB_VERSION:
+                    for table in ("series_totals", "volumes", "series", "destinations", "hashes",
+                                  "verdicts", "archive_stats"):
+                        conn.execute(f"DROP TABLE IF EXISTS {table}")
+                    for statement in _sql_statements(_CATALOG_SCHEMA):
+                        conn.execute(statement)
+                    conn.execute(f"PRAGMA user_version = {LIBRARY_DB_VERSION}")
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+    _catalog_local.conn = conn
+    _catalog_local.path = LIBRARY_DB_PATH
+    return conn
+
+
+def _settled(mtime_ns: int) -> int | None:
+    """Return mtime_ns, or None if it is too recent to trust (see SERIES_MTIME_SETTLE_NS)."""
+    return mtime_ns if time.time_ns() - mtime_ns >= SERIES_MTIME_SETTLE_NS else None
+
+
+def _list_volumes(path: str) -> dict[str, tuple[int, int]]:
+    """List the files of a series folder as {name: (size, mtime_ns)}, without touching the catalog."""
+    listing = {}
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+                listing[entry.name] = (st.st_size, st.st_mtime_ns)
+    except OSError:
+        pass
+    return listing
+
+
+def _apply_volumes(conn: sqlite3.Connection, series_id: int, listing: dict[str, tuple[int, int]]) -> None:
+    """Apply new/changed/removed files of a series folder listing to the volumes table."""
+    known = {name: (size, mtime_ns) for name, size, mtime_ns in
+             conn.execute("SELECT name, size, mtime_ns FROM volumes WHERE series_id = ?", (series_id,))}
+    for name, (size, mtime_ns) in listing.items():
+        if known.get(name) == (size, mtime_ns):
+            continue
+        parsed = parse_filename(name)
+        conn.execute(
+            "INSERT INTO volumes (series_id, name, size, mtime_ns, tome, title, extension)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (series_id, name) DO UPDATE SET size = excluded.size,"
+            " mtime_ns = excluded.mtime_ns, tome = excluded.tome, title = excluded.title, extension = excluded.extension,"
+            " pages = NULL, formats = NULL, width = NULL, height = NULL",
+            (series_id, name, size, mtime_ns, parsed.tome, parsed.title, os.path.splitext(name)[1].lower()),
+        )
+    conn.executemany("DELETE FROM volumes WHERE series_id = ? AND name = ?",
+                     [(series_id, name) for name in known.keys() - listing.keys()])
+
+
+def _series_row(conn: sqlite3.Connection, destination: str, series_name: str) -> int:
+    """Return the id of a series row, inserting it if needed."""
+    conn.execute("INSERT OR IGNORE INTO series (destination, name) VALUES (?, ?)", (destination, series_name))
+    return conn.execute("SELECT id FROM series WHERE destination = ? AND name = ?",
+                        (destination, series_name)).fetchone()[0]
+
+
+def _refresh_series_names(dest: str, dest_mtime: int, dirs: list[tuple[str, str, int]]) -> None:
+    """Sync the series rows of one destination with its folders, without listing volumes."""
+    conn = _catalog_db()
+    present = {name for name, _path, _mtime in dirs}
+    with _catalog_lock, conn:
+        known = {name for (name,) in conn.execute("SELECT name FROM series WHERE destination = ?", (dest,))}
+        conn.executemany("INSERT INTO series (destination, name) VALUES (?, ?)",
+                         [(dest, name) for name in present - known])
+        conn.executemany("DELETE FROM series WHERE destination = ? AND name = ?",
+                         [(dest, name) for name in known - present])
+        conn.execute("INSERT OR REPLACE INTO destinations (path, mtime_ns) VALUES (?, ?)",
+                     (dest, _settled(dest_mtime)))
+
+
+def refresh_catalog(destinations: list[str] | None = None, volumes: bool = True) -> None:
+    """Bring the library catalog up to date with the destination folders.
+
+    A destination is re-listed when its mtime changed, and with `volumes` each
+    series folder whose mtime changed is re-listed too; unchanged folders cost
+    one stat. Without `volumes` only the series folder list is refreshed.
+    Folders are listed outside the catalog lock and written in one short
+    transaction per folder (see iter_catalog_destination).
+    """
+    global _catalog_reconciled
+    if destinations is None:
+        destinations = load_config()["destinations"]
+    started = time.time()
+    conn = _catalog_db()
+    with _catalog_lock, conn:
+        known = _prune_catalog(conn, destinations)
+    for dest in destinations:
+        if not volumes:
+            try:
+                if os.stat(dest).st_mtime_ns == known.get(dest):
+                    continue
+            except OSError:
+                pass
+        listed = list_catalog_destination(dest)
+        if listed is None:
+            continue
+        if volumes:
+            for _series in iter_catalog_destination(dest, *listed, workers=SCAN_WORKERS):
+                pass
+        else:
+            _refresh_series_names(dest, *listed)
+    if volumes:
+        _catalog_reconciled = started
+
+
+def catalog_age() -> float:
+    """Seconds since the catalog was last fully refreshed (inf if never in this process)."""
+    return time.time() - _catalog_reconciled
+
+
+def reconcile_catalog_async() -> threading.Thread:
+    """Refresh the whole catalog on a background thread (one at a time) and return that thread."""
+    global _reconcile_thread
+    with _reconcile_lock:
+        if _reconcile_thread is None or not _reconcile_thread.is_alive():
+            destinations = load_config()["destinations"]
+
+            def reconcile() -> None:
+                try:
+                    refresh_catalog(destinations)
+                except Exception:
+                    app.logger.exception("Catalog reconciliation failed")
+
+            _reconcile_thread = threading.Thread(target=reconcile, name="tana-reconcile", daemon=True)
+            _reconcile_thread.start()
+        return _reconcile_thread
+
+
+def _prune_catalog(conn: sqlite3.Connection, destinations: list[str]) -> dict[str, int | None]:
+    """Drop destinations that are no longer configured; return {path: mtime_ns} of the known ones."""
+    known = dict(conn.execute("SELECT path, mtime_ns FROM destinations"))
+    for path in known.keys() - set(destinations):
+        conn.execute("DELETE FROM series WHERE destination = ?", (path,))
+        conn.execute("DELETE FROM destinations WHERE path = ?", (path,))
+    return known
+
+
+def list_catalog_destination(dest: str) -> tuple[int, list[tuple[str, str, int]]] | None:
+    """List the series folders of a destination as (mtime_ns, [(name, path, mtime_ns)]).
+
+    Returns None, after dropping it from the catalog, if the destination is gone.
+    """
+    dirs = []
+    try:
+        dest_mtime = os.stat(dest).st_mtime_ns
+        with os.scandir(dest) as it:
+            for entry in it:
+                if entry.name.startswith("@"):
+                    continue
+                try:
+                    if entry.is_dir():
+                        dirs.append((entry.name, entry.path, entry.stat().st_mtime_ns))
+                except OSError:
+                    continue
+    except OSError:
+        conn = _catalog_db()
+        with _catalog_lock, conn:
+            conn.execute("DELETE FROM series WHERE destination = ?", (dest,))
+            conn.execute("DELETE FROM destinations WHERE path = ?", (dest,))
+        return None
+    return dest_mtime, dirs
+
+
+def iter_catalog_destination(dest: str, dest_mtime: int, dirs: list[tuple[str, str, int]],
+                             workers: int = 1, cancel: threading.Event | None = None):
+    """Bring the series of one destination up to date, yielding (series_id, name, mtime_ns) per folder.
+
+    `dest_mtime` and `dirs` come from list_catalog_destination(). Changed folders
+    are listed on `workers` threads outside the catalog lock and written in a
+    short transaction each, so several destinations can be refreshed at once.
+    Vanished series are dropped and the destination mtime recorded only when the
+    whole listing went through without being cancelled.
+    """
+    conn = _catalog_db()
+    rows = {name: (series_id, mtime_ns) for series_id, name, mtime_ns in
+            conn.execute("SELECT id, name, mtime_ns FROM series WHERE destination = ?", (dest,))}
+
+    def list_series(item: tuple[str, str, int]) -> tuple[str, int, dict | None]:
+        name, path, mtime_ns = item
+        if name in rows and rows[name][1] == mtime_ns:
+            return name, mtime_ns, None
+        return name, mtime_ns, _list_volumes(path)
+
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        for name, mtime_ns, listing in pool.map(list_series, dirs):
+            if cancel is not None and cancel.is_set():
+                return
+            if listing is None:
+                series_id = rows[name][0]
+            else:
+                mtime_ns = _settled(mtime_ns)
+                with _catalog_lock, conn:
+                    series_id = _series_row(conn, dest, name)
+                    _apply_volumes(conn, series_id, listing)
+                    conn.execute("UPDATE series SET mtime_ns = ? WHERE id = ?", (mtime_ns, series_id))
+            yield series_id, name, mtime_ns
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    present = {name for name, _path, _mtime in dirs}
+    with _catalog_lock, conn:
+        conn.executemany("DELETE FROM series WHERE id = ?",
+                         [(series_id,) for name, (series_id, _m) in rows.items() if name not in present])
+        conn.execute("INSERT OR REPLACE INTO destinations (path, mtime_ns) VALUES (?, ?)",
+                     (dest, _settled(dest_mtime)))
+
+
+def refresh_catalog_series(destination: str, series_name: str) -> None:
+    """Re-list a single series folder (after organize/convert), adding or dropping it as needed."""
+    path = Path(destination) / series_name
+    try:
+        series_mtime = path.stat().st_mtime_ns if path.is_dir() else None
+    except OSError:
+        series_mtime = None
+    listing = _list_volumes(str(path)) if series_mtime is not None else None
+    conn = _catalog_db()
+    with _catalog_lock, conn:
+        if listing is None:
+            conn.execute("DELETE FROM series WHERE destination = ? AND name = ?", (destination, series_name))
+            return
+        series_id = _series_row(conn, destination, series_name)
+        _apply_volumes(conn, series_id, listing)
+        conn.execute("UPDATE series SET mtime_ns = ? WHERE id = ?", (_settled(series_mtime), series_id))
+
+
+def _catalog_series_dirs(dest: str) -> tuple[int | None, list[str]]:
+    """Return (listing mtime_ns, series folder names) of a destination from the catalog."""
+    conn = _catalog_db()
+    row = conn.execute("SELECT mtime_ns FROM destinations WHERE path = ?", (dest,)).fetchone()
+    if row is None:
+        return None, []
+    names = [name for (name,) in conn.execute("SELECT name FROM series WHERE destination = ? ORDER BY id", (dest,))]
+    return row[0], names
+
+
+def _record_destination_mtime(dest: str) -> int | None:
+    """Store the current mtime of a destination whose folder change the catalog already has; return it.
+
+    Whole-second timestamps (network shares, FAT) are only trusted once settled,
+    as another change within the same tick would not move them.
+    """
+    try:
+        mtime_ns = os.stat(dest).st_mtime_ns
+    except OSError:
+        return None
+    if mtime_ns % 1_000_000_000 == 0:
+        mtime_ns = _settled(mtime_ns)
+    conn = _catalog_db()
+    with _catalog_lock, conn:
+        conn.execute("UPDATE destinations SET mtime_ns = ? WHERE path = ?", (mtime_ns, dest))
+    return mtime_ns
 
+
+def _catalog_destination_mtime(dest: str) -> int | None:
+    row = _catalog_db().execute("SELECT mtime_ns FROM destinations WHERE path = ?", (dest,)).fetchone()
+    return row[0] if row is not None else None
+
+
+def _ext_filter(extensions: set[str], column: str = "v.extension") -> tuple[str, list[str]]:
+    """SQL fragment and parameters restricting volumes to the configured extensions."""
+    exts = sorted(extensions)
+    return f"{column} IN ({','.join('?' * len(exts))})", exts
+
+
+# ─── DUPLICATES ─────────────────────────────────────────
+
+def _partial_hash(path: str, size: int) -> str:
+    """Hash the first and last HASH_BLOCK_SIZE bytes of a file (the whole file if it is small)."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        h.update(f.read(HASH_BLOCK_SIZE))
+        if size > 2 * HASH_BLOCK_SIZE:
+            f.seek(-HASH_BLOCK_SIZE, os.SEEK_END)
+        h.update(f.read(HASH_BLOCK_SIZE))
+    return h.hexdigest()
+
+
+def _full_hash(path: str, size: int) -> str:
+    h = hashlib.blake2b()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def hash_files(stats: dict[str, os.stat_result], full: bool = False) -> dict[str, str]:
+    """Return {path: partial or full content hash} for the given files.
+
+    Hashes are cached in the library catalog by (device, inode, size, mtime), so a
+    file is read again only after it changed; missing ones are computed on
+    HASH_WORKERS threads. Unreadable files are left out.
+    """
+    column = "full" if full else "partial"
+    conn = _catalog_db()
+    digests = {}
+    todo = []
+    for path, st in stats.items():
+        row = conn.execute(f"SELECT size, mtime_ns, {column} FROM hashes WHERE dev = ? AND inode = ?",
+                           (st.st_dev, st.st_ino)).fetchone()
+        if row is not None and row[2] and (row[0], row[1]) == (st.st_size, st.st_mtime_ns):
+            digests[path] = row[2]
+        else:
+            todo.append(path)
+    if not todo:
+        return digests
+
+    hash_file = _full_hash if full else _partial_hash
+
+    def compute(path: str) -> tuple[str, str | None]:
+        try:
+            return path, hash_file(path, stats[path].st_size)
+        except OSError:
+            return path, None
+
+    with ThreadPoolExecutor(max_workers=min(HASH_WORKERS, len(todo))) as pool:
+        computed = [(path, digest) for path, digest in pool.map(compute, todo) if digest is not None]
+    other = "partial" if full else "full"
+    with _catalog_lock, conn:
+        for path, digest in computed:
+            st = stats[path]
+            digests[path] = digest
+            conn.execute(
+                f"INSERT INTO hashes (dev, inode, size, mtime_ns, {column}) VALUES (?, ?, ?, ?, ?)"
+                f" ON CONFLICT (dev, inode) DO UPDATE SET {column} = excluded.{column},"
+                f" {other} = CASE WHEN size = excluded.size AND mtime_ns = excluded.mtime_ns THEN {other} END,"
+                f" size = excluded.size, mtime_ns = excluded.mtime_ns",
+                (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, digest),
+            )
+    return digests
+
+
+def _identical_groups(stats: dict[str, os.stat_result]) -> list[list[str]]:
+    """Group files with identical contents: by size, then partial hash, then full hash.
+
+    Hard links to one inode count once (the first path is kept).
+    """
+    by_inode = {}
+    for path, st in stats.items():
+        by_inode.setdefault((st.st_dev, st.st_ino), path)
+    groups: dict = {}
+    for path in by_inode.values():
+        groups.setdefault(stats[path].st_size, []).append(path)
+    for full in (False, True):
+        candidates = {path: stats[path] for paths in groups.values() if len(paths) > 1 for path in paths}
+        digests = hash_files(candidates, full=full)
+        regrouped: dict = {}
+        for key, paths in groups.items():
+            if len(paths) < 2:
+                continue
+            for path in paths:
+                if path in digests:
+                    regrouped.setdefault((key, digests[path]), []).append(path)
+        groups = regrouped
+    return [paths for paths in groups.values() if len(paths) > 1]
+
+
+def find_duplicates() -> dict:
+    """Find volumes with identical contents anywhere in the library (e.g. one release filed under two series)."""
+    cfg = load_config()
+    refresh_catalog(cfg["destinations"])
+    conn = _catalog_db()
+    ext_sql, ext_params = _ext_filter(get_extensions(cfg))
+    volumes = {}
+    rows = conn.execute(
+        f"SELECT s.destination, s.name, v.name FROM volumes v JOIN series s ON s.id = v.series_id"
+        f" WHERE {ext_sql} AND v.size > 0 AND v.size IN"
+        f" (SELECT v.size FROM volumes v WHERE {ext_sql} GROUP BY v.size HAVING COUNT(*) > 1)",
+        [*ext_params, *ext_params],
+    )
+    stats = {}
+    for dest, series_name, name in rows:
+        path = os.path.join(dest, series_name, name)
+        try:
+            stats[path] = os.stat(path)
+        except OSError:
+            continue
+        volumes[path] = {
+            "path": path,
+            "destination": dest,
+            "dest_label": Path(dest).name,
+            "series_name": series_name,
+            "name": name,
+        }
+
+    groups = []
+    reclaimable = 0
+    for paths in _identical_groups(stats):
+        size = stats[paths[0]].st_size
+        reclaimable += size * (len(paths) - 1)
+        groups.append({
+            "size": size,
+            "size_human": format_size(size),
+            "files": sorted((volumes[path] for path in paths), key=lambda v: (v["dest_label"], v["series_name"], v["name"])),
+        })
+    groups.sort(key=lambda g: g["size"] * (len(g["files"]) - 1), reverse=True)
+    return {"groups": groups, "reclaimable": reclaimable, "reclaimable_human": format_size(reclaimable)}
+
+
+def find_library_copy(path: str) -> str | None:
+    """Return a library volume that is probably the same release as `path` (an incoming file), if any.
+
+    Only sizes and partial hashes are compared (for a CBZ the tail block holds the
+    central directory, with the CRC of every page), so a request reads a few blocks
+    per file and never whole files; library hashes come from the catalog cache.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if st.st_size == 0:
+        return None
+    conn = _catalog_db()
+    stats = {}
+    rows = conn.execute(
+        "SELECT s.destination, s.name, v.name FROM volumes v JOIN series s ON s.id = v.series_id WHERE v.size = ?",
+        (st.st_size,),
+    )
+    for dest, series_name, name in rows:
+        candidate = os.path.join(dest, series_name, name)
+        try:
+            stats[candidate] = os.stat(candidate)
+        except OSError:
+            continue
+    if not stats:
+        return None
+    try:
+        digest = _partial_hash(path, st.st_size)
+    except OSError:
+        return None
+    return next((p for p, d in hash_files(stats).items() if d == digest), None)
+
+
+@app.route("/api/duplicates")
+def api_duplicates():
+    """Groups of identical volumes across all destinations, largest reclaimable space first."""
+    return jsonify(find_duplicates())
+
+
+# ─── VERIFIER ───────────────────────────────────────────
+
+_services: dict[str, dict] = {}  # background services (verifier, sampler): name -> {thread, stop}
+_services_lock = threading.Lock()
+_corrupt_cache: tuple | None = None  # (version, {path: (size, mtime_ns, error)})
+_verdicts_version = 0  # bumped whenever the set of corrupt files may have changed
+
+
+def verify_archive(path: str) -> str | None:
+    """Check an archive (ZIP CRCs, RAR headers, PDF opening); return an error message or None if sound."""
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        if ext in (".cbz", ".zip"):
+            with zipfile.ZipFile(path) as zf:
+                bad_file = zf.testzip()
+            if bad_file is not None:
+                return f"Fichier corrompu dans l'archive: {bad_file}"
+        elif ext in (".cbr", ".rar"):
+            with rarfile.RarFile(path) as rf:
+                if not rf.infolist():
+                    return "Archive RAR vide"
+        elif ext == ".pdf":
+            with fitz.open(path) as doc:
+                if doc.page_count == 0:
+                    return "PDF sans page"
+    except (zipfile.BadZipFile, rarfile.Error, RuntimeError, ValueError, EOFError, zlib.error) as e:
+        return f"Archive illisible: {e}"
+    return None
+
+
+_IOPRIO_SET = {"x86_64": 251, "i386": 289, "i686": 289, "aarch64": 30, "armv7l": 314}  # syscall numbers (Linux)
+_IOPRIO_CLASS_IDLE = 3 << 13
+_IOPRIO_WHO_PROCESS = 1
+
+
+def _lower_io_priority() -> None:
+    """Run the calling thread at the lowest CPU priority and, on Linux, in the idle I/O class."""
+    tid = threading.get_native_id()
+    try:
+        os.setpriority(os.PRIO_PROCESS, tid, 19)
+    except (AttributeError, OSError):
+        pass
+    nr = _IOPRIO_SET.get(os.uname().machine) if sys.platform.startswith("linux") else None
+    libc = _libc() if nr is not None else None
+    if libc is not None:
+        libc.syscall(nr, _IOPRIO_WHO_PROCESS, tid, _IOPRIO_CLASS_IDLE)  # best effort: errors ignored
+
+
+def corrupt_files() -> dict[str, tuple[int, int, str]]:
+    """Return {path: (size, mtime_ns, error)} of the archives found corrupt so far."""
+    global _corrupt_cache
+    cached = _corrupt_cache
+    if cached is not None and cached[0] == _verdicts_version:
+        return cached[1]
+    version = _verdicts_version
+    rows = _catalog_db().execute("SELECT path, size, mtime_ns, error FROM verdicts WHERE error IS NOT NULL")
+    corrupt = {path: (size, mtime_ns, error) for path, size, mtime_ns, error in rows}
+    _corrupt_cache = (version, corrupt)
+    return corrupt
+
+
+def corrupt_error(path: str, size: int, mtime_ns: int) -> str | None:
+    """Return the verifier's error for this version of a file, or None if it was not found corrupt."""
+    verdict = corrupt_files().get(path)
+    if verdict is None or (verdict[0], verdict[1]) != (size, mtime_ns):
+        return None
+    return verdict[2]
+
+
+def verify_files(paths: list[str], stop: threading.Event | None = None) -> int:
+    """Verify the archives in `paths` that have no verdict for their (inode, size, mtime) yet.
+
+    Runs on VERIFY_WORKERS low-priority threads (idle I/O class on Linux); verdicts are stored as they
+    come, so a stopped run resumes where it left off. Returns the number of
+    files verified.
+    """
+    global _verdicts_version
+    conn = _catalog_db()
+    todo = {}
+    moved = []
+    for path in paths:
+        if os.path.splitext(path)[1].lower() not in VERIFY_EXTENSIONS:
+            continue
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        row = conn.execute("SELECT size, mtime_ns, path, error FROM verdicts WHERE dev = ? AND inode = ?",
+                           (st.st_dev, st.st_ino)).fetchone()
+        if row is None or (row[0], row[1]) != (st.st_size, st.st_mtime_ns):
+            todo[path] = st
+        elif row[2] != path:
+            moved.append((path, st.st_dev, st.st_ino, row[3] is not None))
+    if moved:
+        with _catalog_lock, conn:
+            conn.executemany("UPDATE verdicts SET path = ? WHERE dev = ? AND inode = ?",
+                             [(path, dev, ino) for path, dev, ino, _bad in moved])
+        if any(bad for *_rest, bad in moved):
+            _verdicts_version += 1
+            _watch_inputs_changed.set()
+    if not todo:
+        return 0
+
+    def verify(path: str) -> tuple[str, str | None, bool]:
+        try:
+            return path, verify_archive(path), True
+        except OSError:  # moved or unreadable right now: no verdict
+            return path, None, False
+        except Exception as e:  # e.g. unsupported compression method, encrypted member
+            return path, str(e) or type(e).__name__, True
+
+    verified = 0
+    pool = ThreadPoolExecutor(max_workers=VERIFY_WORKERS, initializer=_lower_io_priority)
+    try:
+        for path, error, checked in pool.map(verify, todo):
+            if stop is not None and stop.is_set():
+                break
+            if not checked:
+                continue
+            st = todo[path]
+            with _catalog_lock, conn:
+                previous = conn.execute("SELECT error FROM verdicts WHERE dev = ? AND inode = ?",
+                                        (st.st_dev, st.st_ino)).fetchone()
+                conn.execute("INSERT OR REPLACE INTO verdicts (dev, inode, size, mtime_ns, path, error)"
+                             " VALUES (?, ?, ?, ?, ?, ?)",
+                             (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, path, error))
+            if error is not None or (previous is not None and previous[0] is not None):
+                _verdicts_version += 1
+                _watch_inputs_changed.set()
+            verified += 1
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return verified
+
+
+def _verify_sweep(stop: threading.Event) -> None:
+    """Verify new or changed archives in the sources and the library catalog."""
+    cfg = load_config()
+    extensions = get_extensions(cfg)
+    paths = []
+    for source_dir in get_sources(cfg):
+        paths.extend(os.path.join(source_dir, rel_name)
+                     for rel_name, _st in walk_files(Path(source_dir), extensions=extensions, workers=SCAN_WORKERS))
+    refresh_catalog(cfg["destinations"])
+    ext_sql, ext_params = _ext_filter(extensions)
+    rows = _catalog_db().execute(
+        f"SELECT s.destination, s.name, v.name FROM volumes v JOIN series s ON s.id = v.series_id WHERE {ext_sql}",
+        ext_params,
+    )
+    paths.extend(os.path.join(dest, series_name, name) for dest, series_name, name in rows)
+    verify_files(paths, stop)
+
+
+def _verify_loop(stop: threading.Event) -> None:
+    _lower_io_priority()
+    while not stop.is_set():
+        try:
+            _verify_sweep(stop)
+        except Exception:  # keep the service alive; retried on the next sweep
+            app.logger.exception("Archive verification sweep failed")
+        stop.wait(VERIFY_INTERVAL)
+
+
+def _start_service(name: str, loop) -> None:
+    with _services_lock:
+        service = _services.get(name)
+        if service is not None and service["thread"].is_alive():
+            return
+        stop = threading.Event()
+        thread = threading.Thread(target=loop, args=(stop,), name=f"tana-{name}", daemon=True)
+        _services[name] = {"thread": thread, "stop": stop}
+        thread.start()
+
+
+def _stop_service(name: str) -> None:
+    with _services_lock:
+        service = _services.pop(name, None)
+    if service is not None:
+        service["stop"].set()
+        service["thread"].join(timeout=5)
+
+
+def start_verifier() -> None:
+    """Start the background archive verifier (no-op if already running)."""
+    _start_service("verifier", _verify_loop)
+
+
+def stop_verifier() -> None:
+    """Stop the background archive verifier if it is running."""
+    _stop_service("verifier")
+
+
+# ─── ARCHIVE STATS ──────────────────────────────────────
+
+def _sample_sizes(names: list[str], read_head) -> list[tuple[int, int]]:
+    """Read the image header of up to STATS_SAMPLE_PAGES evenly spaced pages (cover excluded)."""
+    n = min(STATS_SAMPLE_PAGES, len(names))
+    sample = [names[len(names) * (k + 1) // (n + 1)] for k in range(n)] if len(names) > 1 else names
+    sizes = []
+    for name in sample:
+        try:
+            with Image.open(BytesIO(read_head(name))) as img:
+                sizes.append(img.size)
+        except Exception:  # header beyond STATS_HEADER_BYTES, unreadable member, unknown format
+            continue
+    return sizes
+
+
+def archive_stats(path: str) -> dict:
+    """Page count, image formats and median page size of a CBZ/CBR/PDF.
+
+    Only the archive index and the first STATS_HEADER_BYTES of a few pages are
+    read, pages are never decoded. PDFs report their page count only.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    names: list[str] = []
+    sizes: list[tuple[int, int]] = []
+    if ext == ".pdf":
+        with fitz.open(path) as doc:
+            return {"pages": doc.page_count, "formats": "pdf", "width": None, "height": None}
+    if ext in (".cbz", ".zip"):
+        with zipfile.ZipFile(path) as zf:
+            names = [n for n in zf.namelist() if _is_page(n)]
+            names.sort(key=_natural_sort_key)
+
+            def read_head(name: str) -> bytes:
+                with zf.open(name) as f:
+                    return f.read(STATS_HEADER_BYTES)
+
+            sizes = _sample_sizes(names, read_head)
+    elif ext in (".cbr", ".rar"):
+        with rarfile.RarFile(path) as rf:
+            names = [n for n in rf.namelist() if _is_page(n)]
+            names.sort(key=_natural_sort_key)
+
+            def read_head(name: str) -> bytes:
+                with rf.open(name) as f:
+                    return f.read(STATS_HEADER_BYTES)
+
+            sizes = _sample_sizes(names, read_head)
+    formats = sorted({"jpg" if n.lower().endswith(".jpeg") else Path(n).suffix.lower().lstrip(".") for n in names})
+    widths = sorted(w for w, _h in sizes)
+    heights = sorted(h for _w, h in sizes)
+    return {
+        "pages": len(names),
+        "formats": ",".join(formats),
+        "width": widths[len(widths) // 2] if widths else None,
+        "height": heights[len(heights) // 2] if heights else None,
+    }
+
+
+def _is_page(name: str) -> bool:
+    return (Path(name).suffix.lower() in _IMAGE_EXTS
+            and not name.startswith("__MACOSX") and not Path(name).name.startswith("."))
+
+
+def sample_archives(limit: int = STATS_BATCH, stop: threading.Event | None = None) -> int:
+    """Fill the page statistics of up to `limit` unsampled catalog volumes; return how many were handled.
+
+    Results are cached by (device, inode) and validated by size and mtime, so a
+    renamed or moved volume is not read again. Archives are read on
+    STATS_WORKERS idle-priority threads; unreadable ones are recorded with 0 pages.
+    Volumes that are missing or differ from the catalog are marked with -1 pages,
+    so they are skipped until a refresh records their new size or mtime.
+    """
+    conn = _catalog_db()
+    ext_sql, ext_params = _ext_filter(VERIFY_EXTENSIONS)
+    rows = conn.execute(
+        "SELECT v.series_id, v.name, v.size, v.mtime_ns, s.destination, s.name FROM volumes v"
+        f" JOIN series s ON s.id = v.series_id WHERE v.pages IS NULL AND {ext_sql} LIMIT ?",
+        [*ext_params, limit],
+    ).fetchall()
+    if not rows:
+        return 0
+
+    def sample(row: tuple) -> tuple[tuple, os.stat_result | None, dict | None]:
+        path = os.path.join(row[4], row[5], row[1])
+        try:
+            st = os.stat(path)
+        except OSError:
+            return row, None, None
+        cached = _catalog_db().execute(
+            "SELECT size, mtime_ns, pages, formats, width, height FROM archive_stats WHERE dev = ? AND inode = ?",
+            (st.st_dev, st.st_ino),
+        ).fetchone()
+        if cached is not None and (cached[0], cached[1]) == (st.st_size, st.st_mtime_ns):
+            return row, st, dict(zip(("pages", "formats", "width", "height"), cached[2:]))
         try:
-            if file_ext == ".pdf":
-                pdf_dpi = data.get("dpi", 200)
-                pdf_format = data.get("image_format", "jpeg")
-                pdf_quality = data.get("jpeg_quality", 90)
-                result = convert_pdf_to_cbz(cbr_path, delete_original, pdf_dpi, pdf_format, pdf_quality)
+            return row, st, archive_stats(path)
+        except Exception:
+            return row, st, {"pages": 0, "formats": "", "width": None, "height": None}
+
+    done = 0
+    pool = ThreadPoolExecutor(max_workers=STATS_WORKERS, initializer=_lower_io_priority)
+    try:
+        results = []
+        for result in pool.map(sample, rows):
+            if stop is not None and stop.is_set():
+                break
+            results.append(result)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    with _catalog_lock, conn:
+        for (series_id, name, size, mtime_ns, _dest, _series), st, stats in results:
+            if stats is None or (st.st_size, st.st_mtime_ns) != (size, mtime_ns):
+                # Gone or changed since the last refresh: sampled again once the catalog catches up
+                conn.execute("UPDATE volumes SET pages = -1 WHERE series_id = ? AND name = ? AND mtime_ns = ?",
+                             (series_id, name, mtime_ns))
+                done += 1
+                continue
+            conn.execute(
+                "UPDATE volumes SET pages = ?, formats = ?, width = ?, height = ?"
+                " WHERE series_id = ? AND name = ? AND mtime_ns = ?",
+                (stats["pages"], stats["formats"], stats["width"], stats["height"], series_id, name, mtime_ns),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO archive_stats (dev, inode, size, mtime_ns, pages, formats, width, height)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns,
+                 stats["pages"], stats["formats"], stats["width"], stats["height"]),
+            )
+            done += 1
+    return done
+
+
+def _sample_loop(stop: threading.Event) -> None:
+    _lower_io_priority()
+    while not stop.is_set():
+        try:
+            if sample_archives(stop=stop):
+                continue
+        except Exception:
+            app.logger.exception("Archive sampling failed")
+        stop.wait(VERIFY_INTERVAL)
+
+
+def start_sampler() -> None:
+    """Start the background page statistics sampler (no-op if already running)."""
+    _start_service("sampler", _sample_loop)
+
+
+def stop_sampler() -> None:
+    """Stop the background page statistics sampler if it is running."""
+    _stop_service("sampler")
+
+
+def series_page_stats(conn: sqlite3.Connection, series_id: int) -> dict:
+    """Aggregate page statistics of the sampled volumes of one series."""
+    sampled, pages, height, low_res = conn.execute(
+        "SELECT COUNT(*), SUM(pages), AVG(height), SUM(height < ?) FROM volumes WHERE series_id = ? AND pages > 0",
+        (STATS_LOW_RES_HEIGHT, series_id),
+    ).fetchone()
+    return {
+        "sampled": sampled,
+        "pages": pages or 0,
+        "avg_height": round(height) if height is not None else None,
+        "low_res": low_res or 0,
+    }
+
+
+# ─── WATCHER ────────────────────────────────────────────
+
+WATCH_POLL_INTERVAL = 5  # seconds between rescans when inotify is unavailable
+WATCH_MAX_EVENTS = 200   # larger diffs are sent as a single "resync" event
+WATCH_QUEUE_SIZE = 1000  # per-subscriber backlog before forcing a resync
+WATCH_CATALOG_INTERVAL = 60  # seconds between checks for series folders created outside tana (inotify mode)
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_INOTIFY_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len
+
+_watch_lock = threading.Lock()
+_watch_subscribers: list[queue.Queue] = []
+# State of the current watcher: thread, stop, sources, mode, primed, signature and
+# files ((source_dir, rel_name) -> {"file", "ino"}). Each watcher thread gets its own
+# dict and writes only to it, so one that outlives stop_watcher() cannot clobber its successor.
+_watcher: dict = {}
+_watcher_start_lock = threading.Lock()
+
+
+def _libc():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1, libc.inotify_add_watch, libc.inotify_rm_watch  # noqa: B018
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+def _inotify_add_tree(libc, fd: int, wds: dict[int, tuple[str, str]], source_dir: str, rel_dir: str) -> None:
+    """Add a watch on source_dir/rel_dir and all its non-hidden subdirectories."""
+    stack = [rel_dir]
+    while stack:
+        rel = stack.pop()
+        path = os.path.join(source_dir, rel) if rel else source_dir
+        wd = libc.inotify_add_watch(fd, os.fsencode(path), _WATCH_MASK | _IN_ONLYDIR)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                raise OSError(err, "inotify watch limit reached")
+            continue
+        wds[wd] = (source_dir, rel)
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if not entry.name.startswith(".") and entry.is_dir(follow_symlinks=False):
+                        stack.append(rel + entry.name + os.sep)
+        except OSError:
+            continue
+
+
+def _inotify_read(fd: int) -> list[tuple[int, int, int, str]]:
+    try:
+        buf = os.read(fd, 65536)
+    except BlockingIOError:
+        return []
+    events = []
+    offset = 0
+    while offset + _INOTIFY_EVENT.size <= len(buf):
+        wd, mask, cookie, length = _INOTIFY_EVENT.unpack_from(buf, offset)
+        offset += _INOTIFY_EVENT.size
+        name = os.fsdecode(buf[offset:offset + length].rstrip(b"\0"))
+        offset += length
+        events.append((wd, mask, cookie, name))
+    return events
+
+
+def _watch_publish(event: dict) -> None:
+    with _watch_lock:
+        subscribers = list(_watch_subscribers)
+    for q in subscribers:
+        try:
+            q.put_nowait(event)
+        except queue.Full:
+            # Slow client: drop its backlog and make it reload the list
+            with q.mutex:
+                q.queue.clear()
+            q.put_nowait({"type": "resync"})
+
+
+def _watch_key_payload(key: tuple[str, str]) -> dict:
+    return {"source_dir": key[0], "name": key[1]}
+
+
+def _watch_analyze(source_dir: str, rel_name: str) -> dict | None:
+    """Analyze a single source file; returns {"file", "ino"} or None if it is not listed."""
+    cfg = load_config()
+    if os.path.splitext(rel_name)[1].lower() not in get_extensions(cfg):
+        return None
+    try:
+        st = os.stat(os.path.join(source_dir, rel_name))
+    except OSError:
+        return None
+    existing = get_existing_series()
+    record = _analyze_file(os.path.basename(rel_name), st)
+    _match_record(record, existing)
+    return {"file": _file_payload(cfg, record, source_dir, rel_name, st, {}), "ino": st.st_ino}
+
+
+def _watch_signature(cfg: dict) -> tuple[str, int]:
+    """What the watcher's payloads depend on: the scan signature and the corrupt-file verdicts."""
+    return _scan_signature(cfg), _verdicts_version
+
+
+def _watch_resync(state: dict, emit: bool = True) -> None:
+    """Rescan all sources (through the scan index) and publish the differences."""
+    cfg = load_config()
+    signature = _watch_signature(cfg)  # taken first: a change during the rescan triggers another one
+    files = list_files(state["sources"])
+    with _scan_index_lock:
+        records = _load_scan_index()["files"]
+    fresh = {}
+    for f in files:
+        record = records.get(os.path.join(str(Path(f["source_dir"])), f["name"]), {})
+        fresh[(f["source_dir"], f["name"])] = {"file": f, "ino": record.get("ino")}
+
+    if state["stop"].is_set():
+        return  # superseded while rescanning: the next watcher takes its own snapshot
+    with _watch_lock:
+        old = state["files"]
+        state["files"] = fresh
+    state["signature"] = signature
+    state["primed"] = True
+    if not emit:
+        return
+
+    removed = {k: v for k, v in old.items() if k not in fresh}
+    added = {k: v for k, v in fresh.items() if k not in old}
+    changed = [v for k, v in fresh.items() if k in old and old[k]["file"] != v["file"]]
+    if len(removed) + len(added) + len(changed) > WATCH_MAX_EVENTS:
+        _watch_publish({"type": "resync"})
+        return
+
+    # Pair removals and additions of the same inode as renames
+    added_by_ino = {v["ino"]: k for k, v in added.items() if v["ino"] is not None}
+    for key, entry in removed.items():
+        new_key = added_by_ino.pop(entry["ino"], None) if entry["ino"] is not None else None
+        if new_key is not None:
+            _watch_publish({"type": "rename", "old": _watch_key_payload(key), "file": added.pop(new_key)["file"]})
+        else:
+            _watch_publish({"type": "remove", **_watch_key_payload(key)})
+    for entry in added.values():
+        _watch_publish({"type": "add", "file": entry["file"]})
+    for entry in changed:
+        _watch_publish({"type": "update", "file": entry["file"]})
+
+
+def _watch_set(state: dict, key: tuple[str, str], renamed_from: dict | None = None) -> None:
+    entry = _watch_analyze(*key)
+    if state["stop"].is_set():
+        return
+    if entry is None:
+        if renamed_from is not None:
+            _watch_publish({"type": "remove", **_watch_key_payload(renamed_from)})
+        return
+    with _watch_lock:
+        known = key in state["files"]
+        state["files"][key] = entry
+    if renamed_from is not None:
+        _watch_publish({"type": "rename", "old": _watch_key_payload(renamed_from), "file": entry["file"]})
+    else:
+        _watch_publish({"type": "update" if known else "add", "file": entry["file"]})
+
+
+def _watch_discard(state: dict, key: tuple[str, str], prefix: bool = False) -> list[tuple[str, str]]:
+    """Forget a file (or every file under a directory when prefix is set)."""
+    files = state["files"]
+    with _watch_lock:
+        if prefix:
+            keys = [k for k in files if k[0] == key[0] and k[1].startswith(key[1] + os.sep)]
+        else:
+            keys = [key] if key in files else []
+        for k in keys:
+            del files[k]
+    return keys
+
+
+def _watch_handle_events(state: dict, libc, fd: int, wds: dict[int, tuple[str, str]],
+                         events: list[tuple[int, int, int, str]]) -> None:
+    pending_moves: dict[int, tuple[str, str]] = {}  # cookie -> key moved away
+    for wd, mask, cookie, name in events:
+        if state["stop"].is_set():
+            return
+        if mask & _IN_Q_OVERFLOW:
+            _watch_resync(state)
+            continue
+        if mask & _IN_IGNORED:
+            wds.pop(wd, None)
+            continue
+        if wd not in wds or not name or name.startswith("."):
+            continue
+        source_dir, rel_dir = wds[wd]
+        key = (source_dir, rel_dir + name)
+
+        if mask & _IN_ISDIR:
+            if mask & (_IN_CREATE | _IN_MOVED_TO):
+                _inotify_add_tree(libc, fd, wds, source_dir, key[1] + os.sep)
+                for rel, _st in walk_files(os.path.join(source_dir, key[1])):
+                    _watch_set(state, (source_dir, key[1] + os.sep + rel))
+            elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+                for k in _watch_discard(state, key, prefix=True):
+                    _watch_publish({"type": "remove", **_watch_key_payload(k)})
+                if mask & _IN_MOVED_FROM:
+                    prefix = key[1] + os.sep
+                    for stale in [w for w, (src, rel) in wds.items() if src == source_dir and rel.startswith(prefix)]:
+                        libc.inotify_rm_watch(fd, stale)
+                        wds.pop(stale, None)
+            continue
+
+        if mask & _IN_MOVED_FROM:
+            if _watch_discard(state, key):
+                pending_moves[cookie] = key
+        elif mask & _IN_MOVED_TO:
+            _watch_set(state, key, renamed_from=pending_moves.pop(cookie, None))
+        elif mask & _IN_CLOSE_WRITE:
+            _watch_set(state, key)
+        elif mask & _IN_DELETE:
+            if _watch_discard(state, key):
+                _watch_publish({"type": "remove", **_watch_key_payload(key)})
+
+    # Moved out of the watched tree (e.g. into .trash/)
+    for key in pending_moves.values():
+        _watch_publish({"type": "remove", **_watch_key_payload(key)})
+
+
+def _watch_loop(state: dict) -> None:
+    sources, stop = state["sources"], state["stop"]
+    libc = _libc() if sys.platform.startswith("linux") else None
+    fd = -1
+    wds: dict[int, tuple[str, str]] = {}
+    if libc is not None:
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        try:
+            if fd < 0:
+                raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+            for source_dir in sources:
+                if Path(source_dir).is_dir():
+                    _inotify_add_tree(libc, fd, wds, source_dir, "")
+        except OSError:
+            if fd >= 0:
+                os.close(fd)
+            fd = -1
+    state["mode"] = "inotify" if fd >= 0 else "polling"
+
+    try:
+        # Watches are in place before the snapshot, so nothing falls in between
+        _watch_resync(state, emit=False)
+        catalog_checked = time.monotonic()
+        while not stop.is_set():
+            if fd >= 0:
+                ready, _, _ = select.select([fd], [], [], 1.0)
+                if ready:
+                    _watch_handle_events(state, libc, fd, wds, _inotify_read(fd))
+                # Series folders created outside tana only show up once the catalog is refreshed
+                if time.monotonic() - catalog_checked >= WATCH_CATALOG_INTERVAL:
+                    catalog_checked = time.monotonic()
+                    get_existing_series()
+                    _watch_inputs_changed.set()  # also catches a config.json edited by hand
+                # Catalog, config, aliases or verdicts changed: re-match everything
+                if _watch_inputs_changed.is_set() and not stop.is_set():
+                    _watch_inputs_changed.clear()
+                    if _watch_signature(load_config()) != state.get("signature"):
+                        _watch_resync(state)
             else:
-                result = convert_cbr_to_cbz(cbr_path, delete_original)
-            cbz_path = result["cbz_path"]
-            results.append({
-                "source": cbr_path.name,
-                "destination": cbz_path.name,
-                "success": True,
-                "verified": result["verified"],
-                "files_count": result["files_count"],
-            })
-            log_action("convert", {
-                "source": str(cbr_path),
-                "destination": str(cbz_path),
-                "deleted_original": delete_original,
-                "verified": result["verified"],
-                "files_count": result["files_count"],
-                "format": file_ext.lstrip("."),
-            })
-        except Exception as e:
-            results.append({"source": cbr_path.name, "error": str(e)})
+                if stop.wait(WATCH_POLL_INTERVAL):
+                    break
+                _watch_resync(state)
+    except Exception:
+        app.logger.exception("File watcher stopped")
+    finally:
+        if fd >= 0:
+            os.close(fd)
+        state["primed"] = False
+
+
+def start_watcher() -> None:
+    """Start the source watcher for the configured sources (no-op if already running)."""
+    global _watcher
+    sources = get_sources(load_config())
+    with _watcher_start_lock:
+        thread = _watcher.get("thread")
+        if thread is not None and thread.is_alive() and _watcher.get("sources") == sources:
+            return
+        _stop_watcher_locked()
+        state = {"stop": threading.Event(), "sources": sources, "primed": False, "files": {}}
+        state["thread"] = threading.Thread(target=_watch_loop, args=(state,), name="tana-watcher", daemon=True)
+        _watcher = state
+        state["thread"].start()
+
+
+def _stop_watcher_locked() -> None:
+    global _watcher
+    thread = _watcher.get("thread")
+    if thread is None:
+        return
+    _watcher["stop"].set()
+    thread.join(timeout=5)
+    # A thread still busy in a rescan keeps its own state and exits without publishing
+    _watcher = {}
+
+
+def stop_watcher() -> None:
+    """Stop the source watcher if it is running."""
+    with _watcher_start_lock:
+        _stop_watcher_locked()
+
+
+def watcher_snapshot(sources: list[str]) -> list[dict] | None:
+    """Return the watcher's in-memory file list, or None if it cannot serve `sources`."""
+    state = _watcher
+    thread = state.get("thread")
+    if thread is None or not thread.is_alive() or not state.get("primed") or state.get("sources") != sources:
+        return None
+    with _watch_lock:
+        entries = list(state["files"].items())
+    order = {src: i for i, src in enumerate(sources)}
+    entries.sort(key=lambda item: (order.get(item[0][0], len(order)), item[0][1].split(os.sep)))
+    return [entry["file"] for _key, entry in entries]
 
-    return jsonify({"results": results})
+
+@app.route("/api/files/events")
+def api_files_events():
+    """Server-Sent Events stream of incoming-file changes (add/remove/rename/update)."""
+    cfg = load_config()
+    if not cfg.get("watch_enabled", False):
+        return jsonify({"error": "Surveillance désactivée"}), 400
+    start_watcher()
+
+    q: queue.Queue = queue.Queue(maxsize=WATCH_QUEUE_SIZE)
+    with _watch_lock:
+        _watch_subscribers.append(q)
+
+    def stream():
+        try:
+            yield 'retry: 3000\ndata: {"type": "hello"}\n\n'
+            while True:
+                try:
+                    event = q.get(timeout=15)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+        finally:
+            with _watch_lock:
+                if q in _watch_subscribers:
+                    _watch_subscribers.remove(q)
+
+    return Response(stream(), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 
 # ─── THUMBNAIL ──────────────────────────────────────────
 
 THUMB_MAX_SIZE = (200, 280)
 THUMB_QUALITY = 85
-_IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp"}
+_IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".avif", ".bmp"}
 
 
 def _natural_sort_key(s: str) -> list:
@@ -1708,4 +4906,6 @@ if __name__ == "__main__":
     debug = os.environ.get("FLASK_DEBUG", "0").lower() in ("1", "true", "yes")
     host = os.environ.get("TANA_HOST", "0.0.0.0")
     port = int(os.environ.get("TANA_PORT", "9045"))
+    if not debug or os.environ.get("WERKZEUG_RUN_MAIN"):  # not in the reloader's parent process
+        start_converter()  # resume the conversions queued before the restart
     app.run(host=host, port=port, debug=debug)
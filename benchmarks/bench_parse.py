@@ -0,0 +1,50 @@
+"""Micro-benchmark for filename parsing (series guess, tome, title, normalized series).
+
+Times parse_filename() on a set of realistic release names, cold (memo cleared
+before every call) and warm (memoized, as on a rescan).
+
+    python benchmarks/bench_parse.py [rounds]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import app as tana  # noqa: E402
+
+NAMES = [
+    "BD.FR.-.Blacksad.T01.Quelque.part.entre.les.ombres.cbz",
+    "Naruto - Tome 12 - Le grand envol [Digital-1920] (Kana).cbz",
+    "One Piece T42 (2024) [NEO RIP-Club].cbr",
+    "Dragon Ball Vol.15.cbz",
+    "Spider-Man #123.cbz",
+    "Les Légendaires - 05 - Coeur du passé.pdf",
+    "Thorgal_-_T03_-_Les_trois_vieillards.cbz",
+    "Lucky Luke OS - Kid Lucky.cbz",
+    "L'Attaque des Titans 34 (Pika) [Digital-2000] (Prof.X).cbz",
+    "Astérix - T38 - La fille de Vercingétorix (2019).cbz",
+]
+
+
+def bench(label: str, rounds: int, cold: bool) -> None:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for name in NAMES:
+            if cold:
+                tana.parse_filename.cache_clear()
+                tana.normalize.cache_clear()
+            tana.parse_filename(name)
+    per_file = (time.perf_counter() - start) / (rounds * len(NAMES))
+    print(f"{label:<6} {per_file * 1e6:8.2f} µs/file")
+
+
+def main() -> None:
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    bench("cold", rounds, cold=True)
+    bench("warm", rounds, cold=False)
+
+
+if __name__ == "__main__":
+    main()
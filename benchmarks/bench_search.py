@@ -0,0 +1,58 @@
+"""Micro-benchmark for /api/search-series autocomplete.
+
+Builds a synthetic catalog and times search_series against the prebuilt
+prefix/trigram index and against the plain linear scan.
+
+    python benchmarks/bench_search.py [series_count]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import app as tana  # noqa: E402
+
+WORDS = ["dragon", "ball", "naruto", "piece", "one", "attaque", "titans", "black", "clover", "spider",
+         "man", "chroniques", "légendaires", "hunter", "blacksad", "thorgal", "lucky", "luke", "astérix",
+         "tintin", "spirou", "fantasio", "gaston", "largo", "winch", "blake", "mortimer", "xiii", "yoko",
+         "tsuno", "berserk", "monster", "pluto", "akira", "gunnm", "death", "note", "bleach", "jojo"]
+QUERIES = ["dr", "drag", "dragon ba", "narutp", "blaksad", "légend", "spider-man", "xiii", "tintn",
+           "luke", "chroniques des", "zzz"]
+
+
+def build_catalog(count: int) -> list[str]:
+    rng = random.Random(42)
+    names: dict[str, str] = {}
+    while len(names) < count:
+        name = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))).title()
+        names.setdefault(name.lower(), name)
+    return list(names.values())
+
+
+def bench(label: str, existing: dict, rounds: int) -> None:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for q in QUERIES:
+            tana.search_series(q, existing)
+    per_query = (time.perf_counter() - start) / (rounds * len(QUERIES))
+    print(f"{label:<8} {per_query * 1e6:9.1f} µs/query")
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    names = build_catalog(count)
+
+    start = time.perf_counter()
+    tana._apply_catalog_changes(["/bd"], [("/bd", name) for name in names], [])
+    series = tana._series_index.series
+    print(f"{count} series, index built in {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+    bench("indexed", series, 200)
+    bench("linear", dict(series), 2)
+
+
+if __name__ == "__main__":
+    main()
@@ -48,6 +48,10 @@ const configLang = document.getElementById("config-lang");
 const configAuditCase = document.getElementById("config-audit-case");
 const configDashboardEnabled = document.getElementById("config-dashboard-enabled");
 const configThumbnailsEnabled = document.getElementById("config-thumbnails-enabled");
+const configWatchEnabled = document.getElementById("config-watch-enabled");
+const configVerifyEnabled = document.getElementById("config-verify-enabled");
+const configStatsEnabled = document.getElementById("config-stats-enabled");
+const configConvertWorkers = document.getElementById("config-convert-workers");
 const configExtList = document.getElementById("config-ext-list");
 const configNewExt = document.getElementById("config-new-ext");
 const btnAddExt = document.getElementById("btn-add-ext");
@@ -68,6 +72,7 @@ const auditFilterSelect = document.getElementById("audit-filter");
 const auditSearchInput = document.getElementById("audit-search");
 const btnRunAudit = document.getElementById("btn-run-audit");
 const auditLoader = document.getElementById("audit-loader");
+const auditLoaderText = auditLoader.querySelector(".audit-loader-text");
 
 // ─── DOM REFS (convert view) ─────────────────────────
 const convertPathInput = document.getElementById("convert-path");
@@ -80,6 +85,7 @@ const convertSelectAll = document.getElementById("convert-select-all");
 const convertProgress = document.getElementById("convert-progress");
 const convertProgressText = document.getElementById("convert-progress-text");
 const convertDpi = document.getElementById("convert-dpi");
+const convertRenderWorkers = document.getElementById("convert-render-workers");
 const convertJpegQuality = document.getElementById("convert-jpeg-quality");
 const convertQualityValue = document.getElementById("convert-quality-value");
 const convertPdfOptions = document.getElementById("convert-pdf-options");
@@ -90,14 +96,27 @@ let sortDir = "asc";   // "asc" or "desc"
 let filterMatch = "all"; // "all", "matched", "suggested", "unmatched", "duplicates"
 
 let convertData = [];
-let convertCancelled = false;
+let convertJobId = null;  // background conversion job being followed
 const btnCancelConvert = document.getElementById("btn-cancel-convert");
+const recompressFormat = document.getElementById("recompress-format");
+const recompressQuality = document.getElementById("recompress-quality");
+const recompressQualityValue = document.getElementById("recompress-quality-value");
+const recompressWorkers = document.getElementById("recompress-workers");
+const recompressProgress = document.getElementById("recompress-progress");
+const recompressProgressText = document.getElementById("recompress-progress-text");
+const recompressTbody = document.getElementById("recompress-tbody");
+const btnRecompress = document.getElementById("btn-recompress");
 
 let auditData = null;
 let auditFilter = "all";
 let auditSearch = "";
+let auditRunning = false;
+let auditId = null;
+const auditDetails = new Map();
 let historyData = [];
 let historyFilterAction = "";
+let historyNextCursor = null;  // cursor of the next /api/history page, null when all loaded
+let historyTotal = 0;
 
 // ─── TRIAGE STATE ────────────────────────────────────
 let triageFiles = [];
@@ -174,6 +193,7 @@ navTabs.forEach((tab) => {
         if (view === "config") loadConfigUI();
         if (view === "history") loadHistory();
         if (view === "trash") loadTrash();
+        if (view === "convert") loadRecompressReport();
     });
 });
 
@@ -215,6 +235,10 @@ function loadConfigUI() {
     configAuditCase.value = appConfig.audit_case || "first";
     configDashboardEnabled.checked = !!appConfig.dashboard_enabled;
     configThumbnailsEnabled.checked = appConfig.thumbnails_enabled !== false;
+    configWatchEnabled.checked = !!appConfig.watch_enabled;
+    configVerifyEnabled.checked = !!appConfig.verify_enabled;
+    configStatsEnabled.checked = !!appConfig.stats_enabled;
+    configConvertWorkers.value = String(appConfig.convert_workers || 0);
     if (!appConfig.template_rules) appConfig.template_rules = [];
     if (!appConfig.extensions) appConfig.extensions = [".cbr", ".cbz", ".pdf"];
     renderSourcesList();
@@ -416,6 +440,10 @@ btnSaveConfig.addEventListener("click", async () => {
                 audit_case: configAuditCase.value,
                 dashboard_enabled: configDashboardEnabled.checked,
                 thumbnails_enabled: configThumbnailsEnabled.checked,
+                watch_enabled: configWatchEnabled.checked,
+                verify_enabled: configVerifyEnabled.checked,
+                stats_enabled: configStatsEnabled.checked,
+                convert_workers: parseInt(configConvertWorkers.value),
                 lang: configLang.value,
             }),
         });
@@ -428,6 +456,8 @@ btnSaveConfig.addEventListener("click", async () => {
         appConfig = data.config;
         populateDestinations();
         applyDashboardToggle();
+        disconnectFileEvents();  // reconnect on the new sources (or stay closed)
+        connectFileEvents();
         dashboardLoaded = false;
         if (data.warnings && data.warnings.length > 0) {
             data.warnings.forEach((w) => showToast(t(w.message_key, { path: w.path }), "warning"));
@@ -444,18 +474,149 @@ btnSaveConfig.addEventListener("click", async () => {
 });
 
 // ─── SCAN FILES ────────────────────────────────────────
+const FILES_RENDER_STEP = 500;  // rows drawn at once; "show more" adds another step
+let filesRenderLimit = FILES_RENDER_STEP;
+let scanGeneration = 0;
+
 async function scanFiles() {
     if (!appConfig.sources || appConfig.sources.length === 0) return;
 
+    const generation = ++scanGeneration;
+    filesRenderLimit = FILES_RENDER_STEP;
     try {
-        const res = await fetch("/api/files");
-        if (!res.ok) throw new Error(res.status);
-        const data = await res.json();
-        filesData = data.files;
+        // NDJSON stream: draw the first screen as soon as it is available
+        const res = await fetch("/api/files?stream=1");
+        if (!res.ok || !res.body) throw new Error(res.status);
+        const reader = res.body.getReader();
+        const decoder = new TextDecoder();
+        const incoming = [];
+        const started = performance.now();
+        let buffer = "";
+        let lastRender = 0;
+        for (;;) {
+            const { value, done } = await reader.read();
+            if (generation !== scanGeneration) {
+                reader.cancel();
+                return;
+            }
+            if (value) buffer += decoder.decode(value, { stream: !done });
+            const lines = buffer.split("\n");
+            buffer = lines.pop();
+            lines.forEach((line) => {
+                if (!line) return;
+                const msg = JSON.parse(line);
+                if (msg.file) incoming.push(msg.file);
+            });
+            if (done) break;
+            const now = performance.now();
+            const firstScreen = lastRender === 0 && incoming.length > 0
+                && (incoming.length >= FILES_RENDER_STEP || now - started > 300);
+            if (firstScreen || (lastRender > 0 && now - lastRender > 1000)) {
+                filesData = incoming;
+                renderFiles();
+                lastRender = now;
+            }
+        }
+        filesData = incoming;
         renderFiles();
+        connectFileEvents();
     } catch {
-        showToast(t("scan.error"), "error");
+        if (generation === scanGeneration) showToast(t("scan.error"), "error");
+    }
+}
+
+// ─── LIVE FILE EVENTS (watch mode) ─────────────────────
+let fileEvents = null;
+let fileEventsRenderTimer = null;
+let pendingFileEvents = [];
+
+function fileKey(f) {
+    return `${f.source_dir || ""}|${f.name}`;
+}
+
+function connectFileEvents() {
+    if (!appConfig.watch_enabled) {
+        disconnectFileEvents();
+        return;
+    }
+    if (fileEvents) return;
+    fileEvents = new EventSource("/api/files/events");
+    fileEvents.onmessage = (e) => {
+        let event;
+        try { event = JSON.parse(e.data); } catch { return; }
+        if (event.type === "hello") return;
+        // Triage works on indices into filesData: hold changes until it closes
+        if (triageOpen) {
+            pendingFileEvents.push(event);
+            return;
+        }
+        applyFileEvent(event);
+    };
+}
+
+function disconnectFileEvents() {
+    if (!fileEvents) return;
+    fileEvents.close();
+    fileEvents = null;
+}
+
+function flushFileEvents() {
+    const events = pendingFileEvents;
+    pendingFileEvents = [];
+    events.forEach(applyFileEvent);
+}
+
+function applyFileEvent(event) {
+    if (event.type === "resync") {
+        scanFiles();
+        return;
+    }
+    const goneKey = event.type === "remove" ? fileKey(event) : (event.type === "rename" ? fileKey(event.old) : null);
+    if (goneKey) filesData = filesData.filter((f) => fileKey(f) !== goneKey);
+    if (event.file) {
+        const key = fileKey(event.file);
+        const idx = filesData.findIndex((f) => fileKey(f) === key);
+        if (idx >= 0) filesData[idx] = event.file;
+        else filesData.push(event.file);
     }
+    scheduleLiveRender();
+}
+
+function scheduleLiveRender() {
+    if (fileEventsRenderTimer) return;
+    fileEventsRenderTimer = setTimeout(() => {
+        fileEventsRenderTimer = null;
+        // Don't redraw under the user's cursor
+        const active = document.activeElement;
+        if (active && fileTbody.contains(active) && active.type !== "checkbox") {
+            scheduleLiveRender();
+            return;
+        }
+        // Keep selection and typed tome/title across the redraw (indices may shift)
+        const state = new Map();
+        fileTbody.querySelectorAll(".file-check").forEach((cb) => {
+            const f = filesData[parseInt(cb.dataset.index)];
+            if (!f) return;
+            const idx = cb.dataset.index;
+            state.set(fileKey(f), {
+                checked: cb.checked,
+                tome: fileTbody.querySelector(`.tome-input[data-index="${idx}"]`)?.value,
+                title: fileTbody.querySelector(`.title-input[data-index="${idx}"]`)?.value,
+            });
+        });
+        renderFiles();
+        fileTbody.querySelectorAll(".file-check").forEach((cb) => {
+            const idx = cb.dataset.index;
+            const saved = state.get(fileKey(filesData[parseInt(idx)]));
+            if (!saved) return;
+            cb.checked = saved.checked;
+            const tomeInput = fileTbody.querySelector(`.tome-input[data-index="${idx}"]`);
+            const titleInput = fileTbody.querySelector(`.title-input[data-index="${idx}"]`);
+            if (tomeInput && saved.tome !== undefined) tomeInput.value = saved.tome;
+            if (titleInput && saved.title !== undefined) titleInput.value = saved.title;
+        });
+        updatePreview();
+    }, 150);
 }
 
 function escHtml(str) {
@@ -513,13 +674,14 @@ function buildFileRow(f, i, extraClass = "") {
 
     const dupClass = f.duplicate ? " duplicate-row" : "";
     const dupBadge = f.duplicate ? `<span class="duplicate-badge" title="${t("files.duplicate_title")}">${t("files.duplicate_badge")}</span>` : "";
+    const corruptBadge = f.corrupt ? `<span class="corrupt-badge" title="${escHtml(f.corrupt)}">${t("files.corrupt_badge")}</span>` : "";
     const thumbsOn = appConfig.thumbnails_enabled !== false;
     const thumbUrl = thumbsOn ? `/api/thumbnail/${encodeURIComponent(f.name)}${f.source_dir ? "?source=" + encodeURIComponent(f.source_dir) : ""}` : "";
     const sourceLabel = (appConfig.sources && appConfig.sources.length > 1 && f.source_label) ? `<span class="source-label">${escHtml(f.source_label)}</span>` : "";
     return `<tr data-index="${i}" class="${confClass}${dupClass}${extraClass ? " " + extraClass : ""}">
         <td class="col-check"><input type="checkbox" class="file-check" data-index="${i}"></td>
         <td class="col-thumb">${thumbsOn ? `<img class="file-thumb" data-src="${thumbUrl}" alt="" loading="lazy">` : ""}</td>
-        <td class="col-name"><span class="file-name">${escHtml(baseName)}<span class="file-ext">.${escHtml(ext)}</span></span>${dupBadge}${sourceLabel}</td>
+        <td class="col-name"><span class="file-name">${escHtml(baseName)}<span class="file-ext">.${escHtml(ext)}</span></span>${dupBadge}${corruptBadge}${sourceLabel}</td>
         <td class="col-series"><span class="series-guess">${escHtml(guess)}</span> ${confBadge}</td>
         <td class="col-search-ext">${guess ? `<a class="btn-ext-search" href="https://www.nautiljon.com/search.php?q=${encodeURIComponent(guess)}" target="_blank" rel="noopener" title="Nautiljon"><span class="ext-label">N</span></a><a class="btn-ext-search" href="https://www.manga-news.com/index.php/recherche/?q=${encodeURIComponent(guess)}" target="_blank" rel="noopener" title="Manga-News"><span class="ext-label">M</span></a>` : ""}</td>
         <td class="col-match">
@@ -547,6 +709,8 @@ function getDisplayFiles() {
         items = items.filter(({ file: f }) => !f.series_match);
     } else if (filterMatch === "duplicates") {
         items = items.filter(({ file: f }) => f.duplicate);
+    } else if (filterMatch === "corrupt") {
+        items = items.filter(({ file: f }) => f.corrupt);
     }
 
     if (sortField) {
@@ -643,10 +807,13 @@ function renderFiles() {
         });
     }
 
+    // Only the first filesRenderLimit rows go into the DOM
     let html = "";
+    let rendered = 0;
     if (useGrouping) {
         let groupIdx = 0;
         for (const [key, group] of sortedGroups) {
+            if (rendered >= filesRenderLimit) break;
             const indices = group.files.map((f) => f.index);
             if (groupIdx > 0) {
                 html += `<tr class="group-spacer"><td colspan="10"></td></tr>`;
@@ -662,12 +829,18 @@ function renderFiles() {
                 const isLast = gi === group.files.length - 1;
                 html += buildFileRow(file, index, isLast ? "group-last" : "");
             }
+            rendered += group.files.length;
             groupIdx++;
         }
     } else {
-        displayItems.forEach(({ file, index }) => {
+        for (const { file, index } of displayItems) {
+            if (rendered >= filesRenderLimit) break;
             html += buildFileRow(file, index);
-        });
+            rendered++;
+        }
+    }
+    if (rendered < displayItems.length) {
+        html += `<tr class="show-more-row"><td colspan="10"><button class="btn-show-more" type="button">${t("files.show_more", { count: displayItems.length - rendered })}</button></td></tr>`;
     }
 
     fileTbody.innerHTML = html;
@@ -876,20 +1049,13 @@ fileTbody.addEventListener("click", async (e) => {
     btn.textContent = "...";
 
     try {
-        const res = await fetch("/api/organize", {
-            method: "POST",
-            headers: { "Content-Type": "application/json" },
-            body: JSON.stringify({
-                series_name: serName,
-                destination: dest,
-                source_dir: file.source_dir,
-                force: true,
-                files: [{ source: file.name, tome, title }],
-            }),
-        });
-        if (!res.ok) throw new Error(res.status);
-
-        const data = await res.json();
+        const data = await postOrganize("/api/organize", {
+            series_name: serName,
+            destination: dest,
+            source_dir: file.source_dir,
+            force: true,
+            files: [{ source: file.name, tome, title }],
+        }, "files");
 
         if (data.error) {
             showToast(data.error, "error");
@@ -1187,6 +1353,33 @@ function updatePreview() {
     }).join("");
 }
 
+// Send an organize request; files the server flags as already in the library
+// (duplicate_of) are sent again with "force" once the user confirms
+async function postOrganize(url, payload, listKey) {
+    const post = async (body) => {
+        const res = await fetch(url, {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify(body),
+        });
+        if (!res.ok) throw new Error(res.status);
+        return res.json();
+    };
+    const data = await post(payload);
+    const duplicates = (data.results || []).filter((r) => r.duplicate_of);
+    if (duplicates.length === 0) return data;
+    const list = duplicates.slice(0, 10).map((r) => `- ${r.source} \u2192 ${r.duplicate_of}`).join("\n");
+    if (!confirm(`${t("organize.confirm_duplicates")}\n${list}\n\n${t("organize.confirm_continue")}`)) return data;
+
+    const sources = new Set(duplicates.map((r) => r.source));
+    const retry = await post({
+        ...payload,
+        [listKey]: payload[listKey].filter((f) => sources.has(f.source)).map((f) => ({ ...f, force: true })),
+    });
+    const retried = new Map(retry.results.map((r) => [r.source, r]));
+    return { ...data, results: data.results.map((r) => retried.get(r.source) || r) };
+}
+
 // Organize
 async function doOrganize(force = false) {
     const selected = getSelectedFiles();
@@ -1198,25 +1391,18 @@ async function doOrganize(force = false) {
     btnOrganize.textContent = t("action.in_progress");
 
     try {
-        const res = await fetch("/api/organize", {
-            method: "POST",
-            headers: { "Content-Type": "application/json" },
-            body: JSON.stringify({
-                series_name: name,
-                destination: dest,
-                source_dir: selected[0].source_dir || (appConfig.sources && appConfig.sources[0]) || "",
-                force: force,
-                files: selected.map((f) => ({
-                    source: f.source,
-                    tome: f.tome,
-                    title: f.title,
-                    source_dir: f.source_dir,
-                })),
-            }),
-        });
-        if (!res.ok) throw new Error(res.status);
-
-        const data = await res.json();
+        const data = await postOrganize("/api/organize", {
+            series_name: name,
+            destination: dest,
+            source_dir: selected[0].source_dir || (appConfig.sources && appConfig.sources[0]) || "",
+            force: force,
+            files: selected.map((f) => ({
+                source: f.source,
+                tome: f.tome,
+                title: f.title,
+                source_dir: f.source_dir,
+            })),
+        }, "files");
 
         if (data.error) {
             showToast(data.error, "error");
@@ -1313,17 +1499,10 @@ btnOrganizeMatched.addEventListener("click", async () => {
     }));
 
     try {
-        const res = await fetch("/api/organize-matched", {
-            method: "POST",
-            headers: { "Content-Type": "application/json" },
-            body: JSON.stringify({
-                source_dir: (appConfig.sources && appConfig.sources[0]) || "",
-                items,
-            }),
-        });
-        if (!res.ok) throw new Error(res.status);
-
-        const data = await res.json();
+        const data = await postOrganize("/api/organize-matched", {
+            source_dir: (appConfig.sources && appConfig.sources[0]) || "",
+            items,
+        }, "items");
 
         if (data.error) {
             showToast(data.error, "error");
@@ -1367,18 +1546,28 @@ document.querySelectorAll("th.sortable").forEach((th) => {
 // Filter by match status
 filterSelect.addEventListener("change", () => {
     filterMatch = filterSelect.value;
+    filesRenderLimit = FILES_RENDER_STEP;
+    renderFiles();
+});
+
+fileTbody.addEventListener("click", (e) => {
+    if (!e.target.closest(".btn-show-more")) return;
+    filesRenderLimit += FILES_RENDER_STEP;
     renderFiles();
 });
 
 // ─── HISTORY ────────────────────────────────────────────
-async function loadHistory() {
+async function loadHistory(more = false) {
     try {
-        let url = "/api/history";
-        if (historyFilterAction) url += `?action=${encodeURIComponent(historyFilterAction)}`;
-        const res = await fetch(url);
+        const params = new URLSearchParams();
+        if (historyFilterAction) params.set("action", historyFilterAction);
+        if (more && historyNextCursor) params.set("cursor", historyNextCursor);
+        const res = await fetch(`/api/history?${params}`);
         if (!res.ok) throw new Error(res.status);
         const data = await res.json();
-        historyData = data.history;
+        historyData = more ? historyData.concat(data.history) : data.history;
+        historyNextCursor = data.next_cursor;
+        historyTotal = data.total;
         renderHistory();
     } catch {
         showToast(t("history.error"), "error");
@@ -1405,6 +1594,7 @@ function renderHistory() {
         undelete: t("history.action.undelete"),
         fix_naming: t("history.action.fix_naming"),
         convert: t("history.action.convert"),
+        recompress: t("history.action.recompress"),
         upload: t("history.action.upload"),
         undo_organize: t("history.action.undo_organize"),
         undo_fix_naming: t("history.action.undo_fix_naming"),
@@ -1424,6 +1614,8 @@ function renderHistory() {
             detail = `${escHtml(h.current || "")} &rarr; ${escHtml(h.expected || "")}`;
         } else if (h.action === "convert") {
             detail = `${escHtml(h.source || "")} &rarr; ${escHtml(h.destination || "")}`;
+        } else if (h.action === "recompress") {
+            detail = `${escHtml(h.source || "")} (&minus;${escHtml(h.saved_human || "")})`;
         } else if (h.action === "upload") {
             detail = escHtml(h.filename || "");
         } else if (h.action === "purge_trash") {
@@ -1444,6 +1636,11 @@ function renderHistory() {
             <td class="col-history-undo">${undoBtn}</td>
         </tr>`;
     }).join("");
+
+    if (historyNextCursor) {
+        historyTbody.insertAdjacentHTML("beforeend",
+            `<tr class="show-more-row"><td colspan="5"><button class="btn-show-more" type="button">${t("history.show_more", { count: historyTotal - historyData.length })}</button></td></tr>`);
+    }
 }
 
 historyFilterSelect.addEventListener("change", () => {
@@ -1451,9 +1648,13 @@ historyFilterSelect.addEventListener("change", () => {
     loadHistory();
 });
 
-btnRefreshHistory.addEventListener("click", loadHistory);
+btnRefreshHistory.addEventListener("click", () => loadHistory());
 
 historyTbody.addEventListener("click", async (e) => {
+    if (e.target.closest(".btn-show-more")) {
+        loadHistory(true);
+        return;
+    }
     const btn = e.target.closest(".btn-history-undo");
     if (!btn || btn.disabled) return;
 
@@ -1492,28 +1693,77 @@ historyTbody.addEventListener("click", async (e) => {
 
 // ─── AUDIT ──────────────────────────────────────────────
 async function runAudit() {
-    btnRunAudit.disabled = true;
-    btnRunAudit.textContent = t("audit.in_progress");
+    if (auditRunning) return;
+    auditRunning = true;
+    auditId = null;
+    btnRunAudit.textContent = t("audit.btn.cancel");
     auditLoader.style.display = "";
+    auditLoaderText.textContent = t("audit.loading");
     auditSummary.innerHTML = "";
     auditTbody.innerHTML = "";
     auditControls.style.display = "none";
+    auditData = { series: [], summary: null };
+    auditDetails.clear();
     try {
-        const res = await fetch("/api/audit");
-        if (!res.ok) throw new Error(res.status);
-        auditData = await res.json();
+        // NDJSON stream: destinations are audited in parallel, show series as they come
+        const res = await fetch("/api/audit?stream=1");
+        if (!res.ok || !res.body) throw new Error(res.status);
+        const reader = res.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = "";
+        let lastRender = 0;
+        let result = null;
+        for (;;) {
+            const { value, done } = await reader.read();
+            if (value) buffer += decoder.decode(value, { stream: !done });
+            const lines = buffer.split("\n");
+            buffer = lines.pop();
+            lines.forEach((line) => {
+                if (!line) return;
+                const msg = JSON.parse(line);
+                if (msg.audit_id) auditId = msg.audit_id;
+                if (msg.series) auditData.series.push(msg.series);
+                if (msg.progress) auditLoaderText.textContent = t("audit.progress", msg.progress);
+                if (msg.done) result = msg;
+            });
+            if (done) break;
+            const now = performance.now();
+            if (auditData.series.length > 0 && now - lastRender > 500) {
+                auditControls.style.display = "flex";
+                renderAuditTable();
+                lastRender = now;
+            }
+        }
+        if (!result) throw new Error("incomplete audit");
+        const destOrder = appConfig.destinations || [];
+        auditData.series.sort((a, b) => destOrder.indexOf(a.destination) - destOrder.indexOf(b.destination)
+            || (a.series_name < b.series_name ? -1 : a.series_name > b.series_name ? 1 : 0));
+        auditData.summary = result.summary;
         auditControls.style.display = "flex";
         renderAuditSummary();
         renderAuditTable();
+        if (result.cancelled) showToast(t("audit.cancelled"), "error");
     } catch {
         showToast(t("audit.error"), "error");
     } finally {
+        auditRunning = false;
+        auditId = null;
         auditLoader.style.display = "none";
         btnRunAudit.disabled = false;
         btnRunAudit.textContent = t("audit.btn.rerun");
     }
 }
 
+async function cancelAudit() {
+    if (!auditId) return;
+    btnRunAudit.disabled = true;
+    try {
+        await fetch(`/api/audit/${auditId}/cancel`, { method: "POST" });
+    } catch {
+        btnRunAudit.disabled = false;
+    }
+}
+
 function renderAuditSummary() {
     const s = auditData.summary;
     auditSummary.innerHTML = `
@@ -1523,6 +1773,7 @@ function renderAuditSummary() {
         <div class="audit-stat"><span class="audit-stat-value">${s.empty_folders}</span><span class="audit-stat-label">${t("audit.stat.empty")}</span></div>
         <div class="audit-stat"><span class="audit-stat-value">${s.single_file_series}</span><span class="audit-stat-label">${t("audit.stat.single")}</span></div>
         <div class="audit-stat${s.duplicate_tomes > 0 ? " audit-stat-warning" : ""}"><span class="audit-stat-value">${s.duplicate_tomes}</span><span class="audit-stat-label">${t("audit.stat.duplicates")}</span></div>
+        <div class="audit-stat${s.corrupt_files > 0 ? " audit-stat-warning" : ""}"><span class="audit-stat-value">${s.corrupt_files}</span><span class="audit-stat-label">${t("audit.stat.corrupt")}</span></div>
     `;
 }
 
@@ -1535,10 +1786,11 @@ function getFilteredAuditSeries() {
     }
 
     if (auditFilter === "gaps") series = series.filter((s) => s.missing_tomes.length > 0);
-    else if (auditFilter === "naming") series = series.filter((s) => s.naming_issues.length > 0);
+    else if (auditFilter === "naming") series = series.filter((s) => s.naming_issue_count > 0);
     else if (auditFilter === "empty") series = series.filter((s) => s.is_empty);
     else if (auditFilter === "single") series = series.filter((s) => s.file_count === 1);
-    else if (auditFilter === "duplicates") series = series.filter((s) => s.duplicate_tomes.length > 0);
+    else if (auditFilter === "duplicates") series = series.filter((s) => s.duplicate_tome_count > 0);
+    else if (auditFilter === "corrupt") series = series.filter((s) => s.corrupt_count > 0);
     else if (auditFilter === "issues") series = series.filter((s) => s.has_issues);
 
     return series;
@@ -1556,8 +1808,10 @@ function renderAuditTable() {
     series.forEach((s, i) => {
         const issues = [];
         if (s.missing_tomes.length) issues.push(`<span class="audit-badge audit-badge-gap">${t("audit.badge.missing", { count: s.missing_tomes.length })}</span>`);
-        if (s.naming_issues.length) issues.push(`<span class="audit-badge audit-badge-naming">${t("audit.badge.naming", { count: s.naming_issues.length })}</span>`);
-        if (s.duplicate_tomes.length) issues.push(`<span class="audit-badge audit-badge-dup">${t("audit.badge.duplicate", { count: s.duplicate_tomes.length })}</span>`);
+        if (s.naming_issue_count) issues.push(`<span class="audit-badge audit-badge-naming">${t("audit.badge.naming", { count: s.naming_issue_count })}</span>`);
+        if (s.duplicate_tome_count) issues.push(`<span class="audit-badge audit-badge-dup">${t("audit.badge.duplicate", { count: s.duplicate_tome_count })}</span>`);
+        if (s.page_stats.low_res) issues.push(`<span class="audit-badge audit-badge-ext">${t("audit.badge.low_res", { count: s.page_stats.low_res })}</span>`);
+        if (s.corrupt_count) issues.push(`<span class="audit-badge audit-badge-corrupt">${t("audit.badge.corrupt", { count: s.corrupt_count })}</span>`);
         if (s.mixed_extensions) issues.push(`<span class="audit-badge audit-badge-ext">${s.extensions.join(", ")}</span>`);
         if (s.is_empty) issues.push(`<span class="audit-badge audit-badge-empty">${t("audit.badge.empty")}</span>`);
         if (!s.is_empty && s.file_count === 1) issues.push(`<span class="audit-badge audit-badge-single">${t("audit.badge.single")}</span>`);
@@ -1584,9 +1838,28 @@ function renderAuditTable() {
     auditTbody.innerHTML = html;
 }
 
-function renderAuditDetail(index) {
-    const s = getFilteredAuditSeries()[index];
+// Per-series details (file list, naming issues) are fetched on demand
+async function fetchAuditDetail(dest, seriesNameVal) {
+    const key = `${dest}|${seriesNameVal}`;
+    if (!auditDetails.has(key)) {
+        const params = new URLSearchParams({ destination: dest, series: seriesNameVal });
+        const res = await fetch(`/api/audit/series?${params}`);
+        if (!res.ok) throw new Error(res.status);
+        auditDetails.set(key, await res.json());
+    }
+    return auditDetails.get(key);
+}
+
+async function renderAuditDetail(index) {
+    const row = getFilteredAuditSeries()[index];
     const container = document.getElementById(`audit-detail-content-${index}`);
+    let s;
+    try {
+        s = await fetchAuditDetail(row.destination, row.series_name);
+    } catch {
+        showToast(t("audit.error"), "error");
+        return;
+    }
 
     let html = "";
 
@@ -1617,9 +1890,24 @@ function renderAuditDetail(index) {
         html += `</p></div>`;
     }
 
+    if (s.page_stats.sampled > 0) {
+        html += `<div class="audit-detail-section"><h4>${t("audit.detail.pages")}</h4><p>`;
+        html += t("audit.detail.pages_summary", { pages: s.page_stats.pages, height: s.page_stats.avg_height || "-" });
+        html += `</p></div>`;
+    }
+
+    if (s.corrupt_files.length > 0) {
+        html += `<div class="audit-detail-section"><h4>${t("audit.detail.corrupt")}</h4><ul class="audit-file-list">`;
+        s.corrupt_files.forEach((c) => {
+            html += `<li><span class="file-name">${escHtml(c.name)}</span> <span class="audit-file-size">${escHtml(c.error)}</span></li>`;
+        });
+        html += `</ul></div>`;
+    }
+
     html += `<div class="audit-detail-section"><h4>${t("audit.detail.files", { count: s.files.length })}</h4><ul class="audit-file-list">`;
     s.files.forEach((f) => {
-        html += `<li><span class="file-name">${escHtml(f.name)}</span> <span class="audit-file-size">${f.size_human}</span></li>`;
+        const pages = f.page_stats ? ` &middot; ${t("audit.file_pages", { pages: f.page_stats.pages, width: f.page_stats.width || "?", height: f.page_stats.height || "?" })}` : "";
+        html += `<li><span class="file-name">${escHtml(f.name)}</span> <span class="audit-file-size">${f.size_human}${pages}</span></li>`;
     });
     html += `</ul></div>`;
 
@@ -1647,7 +1935,7 @@ auditTbody.addEventListener("click", (e) => {
 });
 
 async function fixNaming(dest, seriesNameVal) {
-    const s = auditData.series.find((x) => x.destination === dest && x.series_name === seriesNameVal);
+    const s = auditDetails.get(`${dest}|${seriesNameVal}`);
     if (!s || !s.naming_issues.length) return;
 
     const fixes = s.naming_issues.map((issue) => ({
@@ -1685,7 +1973,7 @@ auditSearchInput.addEventListener("input", () => {
     renderAuditTable();
 });
 
-btnRunAudit.addEventListener("click", runAudit);
+btnRunAudit.addEventListener("click", () => (auditRunning ? cancelAudit() : runAudit()));
 
 // ─── CONVERT CBR → CBZ ─────────────────────────────────
 
@@ -1878,72 +2166,92 @@ function setConvertRowStatus(path, html, cls) {
     if (cls) row.className = cls;
 }
 
+function showConvertItem(item) {
+    if (item.status === "running") {
+        setConvertRowStatus(item.path, `<span class="convert-status-progress">${t("convert.progress")}</span>`, "convert-row");
+    } else if (item.status === "queued") {
+        setConvertRowStatus(item.path, `<span class="convert-status-progress">${t("convert.queued")}</span>`, "convert-row");
+    } else if (item.status === "done") {
+        const statusText = item.verified
+            ? t("convert.status.verified", { count: item.files_count })
+            : t("convert.status.ok");
+        const title = item.pages_copied !== null
+            ? ` title="${t("convert.status.pages", { copied: item.pages_copied, rendered: item.pages_rendered })}"`
+            : "";
+        setConvertRowStatus(item.path, `<span class="convert-status-ok"${title}>${statusText}</span>`, "convert-row convert-row-exists");
+    } else if (item.status === "error") {
+        setConvertRowStatus(item.path, `<span class="convert-status-error" title="${escHtml(item.error)}">${escHtml(item.error)}</span>`, "convert-row convert-row-error");
+    } else {
+        setConvertRowStatus(item.path, "", "convert-row");
+    }
+}
+
 async function convertSelected() {
     const checked = getConvertChecked();
     if (checked.length === 0) return;
 
     const items = checked.map((c) => ({ path: c.dataset.path }));
-    const deleteOriginal = convertDeleteOriginal.checked;
     const total = items.length;
 
-    convertCancelled = false;
+    convertJobId = null;
     btnConvert.disabled = true;
     btnConvert.style.display = "none";
     btnCancelConvert.style.display = "inline-block";
     btnCancelConvert.disabled = false;
     btnCancelConvert.textContent = t("convert.btn.cancel");
     convertProgress.style.display = "block";
+    convertProgressText.textContent = t("convert.progress_detail", { count: total });
     convertTbody.querySelectorAll(".convert-check").forEach((c) => c.disabled = true);
     convertSelectAll.disabled = true;
 
     let successCount = 0;
     let errorCount = 0;
+    let cancelled = false;
 
-    for (let i = 0; i < total; i++) {
-        if (convertCancelled) break;
-
-        const item = items[i];
-        const filename = item.path.split("/").pop();
-        convertProgressText.textContent = t("convert.progress_n", { current: i + 1, total, name: filename });
-
-        setConvertRowStatus(item.path, `<span class="convert-status-progress">${t("convert.progress")}</span>`, "convert-row");
-
-        try {
-            const res = await fetch("/api/convert", {
-                method: "POST",
-                headers: { "Content-Type": "application/json" },
-                body: JSON.stringify({
-                    items: [item],
-                    delete_original: deleteOriginal,
-                    dpi: parseInt(convertDpi.value),
-                    image_format: "jpeg",
-                    jpeg_quality: parseInt(convertJpegQuality.value),
-                }),
-            });
-            if (!res.ok) throw new Error(res.status);
-            const data = await res.json();
-
-            if (data.error) {
-                setConvertRowStatus(item.path, `<span class="convert-status-error">${escHtml(data.error)}</span>`, "convert-row convert-row-error");
-                errorCount++;
-            } else {
-                const r = data.results[0];
-                if (r && r.success) {
-                    const statusText = r.verified
-                        ? t("convert.status.verified", { count: r.files_count })
-                        : t("convert.status.ok");
-                    setConvertRowStatus(item.path, `<span class="convert-status-ok">${statusText}</span>`, "convert-row convert-row-exists");
-                    successCount++;
-                } else if (r && r.error) {
-                    setConvertRowStatus(item.path, `<span class="convert-status-error" title="${escHtml(r.error)}">${escHtml(r.error)}</span>`, "convert-row convert-row-error");
-                    errorCount++;
-                }
-            }
-        } catch {
-            setConvertRowStatus(item.path, `<span class="convert-status-error">${t("convert.error")}</span>`, "convert-row convert-row-error");
+    try {
+        // Files are queued as one background job, converted in parallel by the server
+        const res = await fetch("/api/convert", {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({
+                items,
+                delete_original: convertDeleteOriginal.checked,
+                dpi: parseInt(convertDpi.value),
+                image_format: "jpeg",
+                jpeg_quality: parseInt(convertJpegQuality.value),
+                render_workers: parseInt(convertRenderWorkers.value),
+            }),
+        });
+        if (!res.ok) throw new Error(res.status);
+        const data = await res.json();
+        for (const r of data.results) {
+            const path = items.find((i) => i.path.endsWith(r.source))?.path || r.source;
+            setConvertRowStatus(path, `<span class="convert-status-error">${escHtml(r.error)}</span>`, "convert-row convert-row-error");
             errorCount++;
         }
+        convertJobId = data.job_id;
+
+        while (convertJobId !== null) {
+            const jobRes = await fetch(`/api/convert/jobs/${convertJobId}`);
+            if (!jobRes.ok) throw new Error(jobRes.status);
+            const job = await jobRes.json();
+            job.items.forEach(showConvertItem);
+            const current = job.items.find((i) => i.status === "running");
+            if (current) {
+                convertProgressText.textContent = t("convert.progress_n", { current: job.done + 1, total: job.total, name: current.source });
+            }
+            if (job.status !== "running") {
+                successCount = job.items.filter((i) => i.status === "done").length;
+                errorCount += job.errors;
+                cancelled = job.status === "cancelled";
+                break;
+            }
+            await new Promise((resolve) => setTimeout(resolve, 1000));
+        }
+    } catch {
+        showToast(t("convert.error"), "error");
     }
+    convertJobId = null;
 
     convertProgress.style.display = "none";
     btnCancelConvert.style.display = "none";
@@ -1951,7 +2259,7 @@ async function convertSelected() {
     btnConvert.disabled = false;
     convertSelectAll.disabled = false;
 
-    if (convertCancelled) {
+    if (cancelled) {
         showToast(t("convert.cancelled", { done: successCount + errorCount, total }), "success");
     } else if (successCount > 0) {
         showToast(t("convert.success", { count: successCount }), "success");
@@ -1963,10 +2271,77 @@ async function convertSelected() {
     updateConvertButton();
 }
 
+// ─── RECOMPRESSION ─────────────────────────────────────
+
+async function loadRecompressReport() {
+    try {
+        const res = await fetch("/api/recompress/report");
+        if (!res.ok) throw new Error(res.status);
+        const data = await res.json();
+        recompressFormat.querySelectorAll("option").forEach((o) => o.disabled = !data.formats.includes(o.value));
+        if (data.series.length === 0) {
+            recompressTbody.innerHTML = `<tr class="empty-row"><td colspan="3">${t("recompress.empty")}</td></tr>`;
+            return;
+        }
+        recompressTbody.innerHTML = data.series.map((s) => `<tr class="convert-row">
+            <td title="${escHtml(s.path)}">${escHtml(s.series)}</td>
+            <td>${s.volumes}</td>
+            <td>${escHtml(s.saved_human)}</td>
+        </tr>`).join("");
+    } catch {
+        recompressTbody.innerHTML = `<tr class="empty-row"><td colspan="3">${t("recompress.error")}</td></tr>`;
+    }
+}
+
+async function recompressLibrary() {
+    btnRecompress.disabled = true;
+    recompressProgress.style.display = "block";
+    recompressProgressText.textContent = t("recompress.progress", { done: 0, total: "?" });
+    try {
+        const res = await fetch("/api/recompress", {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({
+                path: convertPathInput.value.trim(),
+                image_format: recompressFormat.value,
+                quality: parseInt(recompressQuality.value),
+                workers: parseInt(recompressWorkers.value),
+            }),
+        });
+        const data = await res.json();
+        if (!res.ok || data.error) {
+            showToast(data.error || t("recompress.error"), "error");
+        } else if (data.job_id === null) {
+            showToast(t("recompress.none"), "success");
+        } else {
+            let job;
+            do {
+                await new Promise((resolve) => setTimeout(resolve, 1000));
+                const jobRes = await fetch(`/api/convert/jobs/${data.job_id}`);
+                if (!jobRes.ok) throw new Error(jobRes.status);
+                job = await jobRes.json();
+                recompressProgressText.textContent = t("recompress.progress", { done: job.done, total: job.total });
+            } while (job.status === "running");
+            showToast(t("recompress.done", { saved: job.saved_human || "0 B" }), "success");
+            if (job.errors > 0) showToast(t("recompress.errors_count", { count: job.errors }), "error");
+        }
+    } catch {
+        showToast(t("recompress.error"), "error");
+    }
+    recompressProgress.style.display = "none";
+    btnRecompress.disabled = false;
+    loadRecompressReport();
+}
+
+recompressQuality.addEventListener("input", () => {
+    recompressQualityValue.textContent = recompressQuality.value;
+});
+btnRecompress.addEventListener("click", recompressLibrary);
+
 btnScanCbr.addEventListener("click", scanCbr);
 btnConvert.addEventListener("click", convertSelected);
 btnCancelConvert.addEventListener("click", () => {
-    convertCancelled = true;
+    if (convertJobId !== null) fetch(`/api/convert/jobs/${convertJobId}/cancel`, { method: "POST" });
     btnCancelConvert.disabled = true;
     btnCancelConvert.textContent = t("convert.cancelling");
 });
@@ -2039,6 +2414,16 @@ async function loadDashboard() {
             }).join("");
         }
 
+        // Page statistics (background sampler)
+        const ps = data.page_stats;
+        document.getElementById("dash-pages").innerHTML = ps.sampled === 0
+            ? `<p class="dashboard-empty">${t("dashboard.pages_empty")}</p>`
+            : `<div class="dashboard-bar-row"><span class="dashboard-bar-label">${t("dashboard.pages_avg")}</span><span class="dashboard-bar-value">${fmt(ps.avg_pages)}</span></div>
+               <div class="dashboard-bar-row"><span class="dashboard-bar-label">${t("dashboard.pages_height")}</span><span class="dashboard-bar-value">${ps.avg_height ? ps.avg_height + " px" : "-"}</span></div>
+               <div class="dashboard-bar-row"><span class="dashboard-bar-label">${t("dashboard.pages_low_res")}</span><span class="dashboard-bar-value">${fmt(ps.low_res)}</span></div>
+               ${ps.by_image_format.map((f) => `<div class="dashboard-bar-row"><span class="dashboard-bar-label">${escHtml(f.formats || "-")}</span><span class="dashboard-bar-value">${fmt(f.count)}</span></div>`).join("")}
+               <p class="dashboard-bar-sub">${t("dashboard.pages_sampled", { count: fmt(ps.sampled) })}</p>`;
+
         dashboardLoaded = true;
     } catch {
         // Silent fail, stats stay at "-"
@@ -2075,6 +2460,7 @@ function closeTriage() {
     triageOverlay.style.display = "none";
     triageDropdown.innerHTML = "";
     triageDropdown.classList.remove("open");
+    flushFileEvents();
 }
 
 function renderTriageFile() {
@@ -2180,19 +2566,13 @@ async function triageOrganize() {
     btnTriageOrganize.disabled = true;
 
     try {
-        const res = await fetch("/api/organize", {
-            method: "POST",
-            headers: { "Content-Type": "application/json" },
-            body: JSON.stringify({
-                series_name: series,
-                destination: dest,
-                source_dir: f.source_dir || (appConfig.sources && appConfig.sources[0]) || "",
-                force: true,
-                files: [{ source: f.name, tome, title, source_dir: f.source_dir || "" }],
-            }),
-        });
-        if (!res.ok) throw new Error(res.status);
-        const data = await res.json();
+        const data = await postOrganize("/api/organize", {
+            series_name: series,
+            destination: dest,
+            source_dir: f.source_dir || (appConfig.sources && appConfig.sources[0]) || "",
+            force: true,
+            files: [{ source: f.name, tome, title, source_dir: f.source_dir || "" }],
+        }, "files");
 
         if (data.error) {
             showToast(data.error, "error");
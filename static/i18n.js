@@ -22,6 +22,12 @@ const TRANSLATIONS = {
     "dashboard.by_format": "Par format",
     "dashboard.empty": "Aucune collection configur\u00e9e",
     "dashboard.loading": "Chargement...",
+    "dashboard.pages": "Pages",
+    "dashboard.pages_empty": "Aucun volume analys\u00e9 (activer les statistiques des pages)",
+    "dashboard.pages_avg": "Pages par volume",
+    "dashboard.pages_height": "Hauteur moyenne",
+    "dashboard.pages_low_res": "Volumes basse d\u00e9finition",
+    "dashboard.pages_sampled": "{count} volume(s) analys\u00e9(s)",
 
     // Files view
     "files.select_all": "Tout s\u00e9lectionner",
@@ -51,6 +57,7 @@ const TRANSLATIONS = {
     "files.match_pct": "Match {pct}%",
     "files.suggestion_pct": "Suggestion {pct}%",
     "files.organize_n_matched": "Organiser les {count} match\u00e9s",
+    "files.show_more": "Afficher plus ({count} restants)",
 
     // Action panel
     "action.organize": "Organiser",
@@ -78,6 +85,15 @@ const TRANSLATIONS = {
     "config.dashboard_enabled_hint": "Afficher le dashboard avec les statistiques de la collection",
     "config.thumbnails_enabled": "Miniatures",
     "config.thumbnails_enabled_hint": "Afficher les couvertures dans la liste des fichiers",
+    "config.watch_enabled": "Surveillance",
+    "config.watch_enabled_hint": "Mettre \u00e0 jour la liste des fichiers en direct quand les dossiers sources changent",
+    "config.verify_enabled": "V\u00e9rification des archives",
+    "config.verify_enabled_hint": "V\u00e9rifier en arri\u00e8re-plan l'int\u00e9grit\u00e9 des CBZ, CBR et PDF (sources et destinations)",
+    "config.stats_enabled": "Statistiques des pages",
+    "config.stats_enabled_hint": "Relever en arri\u00e8re-plan le nombre de pages, les formats d'image et la r\u00e9solution des volumes",
+    "config.convert_workers": "Conversions simultan\u00e9es",
+    "config.convert_workers_hint": "Nombre de fichiers CBR/PDF convertis en parall\u00e8le en arri\u00e8re-plan.",
+    "config.convert_workers.auto": "Automatique (la moiti\u00e9 des processeurs)",
     "config.audit_case": "Casse du nommage (audit)",
     "config.audit_case_hint": "V\u00e9rification de la casse lors de l'audit de nommage.",
     "config.audit_case.ignore": "Insensible \u00e0 la casse",
@@ -126,6 +142,7 @@ const TRANSLATIONS = {
     "organize.confirm_existing": "Fichiers existants :",
     "organize.confirm_more": "... et {count} autres",
     "organize.confirm_continue": "Voulez-vous continuer ?",
+    "organize.confirm_duplicates": "Ces fichiers semblent d\u00e9j\u00e0 pr\u00e9sents dans la biblioth\u00e8que :",
     "organize.success": "{count} fichier(s) organis\u00e9(s) dans {name}/",
     "organize.error": "Erreur lors de l'organisation",
     "organize.batch_confirm": "Organiser {count} fichier(s) automatiquement match\u00e9s ?",
@@ -148,12 +165,14 @@ const TRANSLATIONS = {
     "history.filter.undelete": "Restaurer",
     "history.filter.fix_naming": "Correction nommage",
     "history.filter.convert": "Convertir CBR",
+    "history.filter.recompress": "Recompresser",
     "history.btn.refresh": "Rafra\u00eechir",
     "history.col.date": "Date",
     "history.col.action": "Action",
     "history.col.detail": "D\u00e9tail",
     "history.col.series": "S\u00e9rie",
     "history.empty": "Aucune action enregistr\u00e9e",
+    "history.show_more": "Afficher plus ({count} restantes)",
     "history.error": "Erreur lors du chargement de l'historique",
     "history.action.organize": "Organiser",
     "history.action.organize_batch": "Organiser (batch)",
@@ -161,6 +180,7 @@ const TRANSLATIONS = {
     "history.action.undelete": "Restaurer",
     "history.action.fix_naming": "Correction nommage",
     "history.action.convert": "Convertir CBR",
+    "history.action.recompress": "Recompresser",
 
     // Audit
     "audit.title": "Audit de la collection",
@@ -168,6 +188,9 @@ const TRANSLATIONS = {
     "audit.btn.rerun": "Relancer l'audit",
     "audit.loading": "Analyse de la collection en cours...",
     "audit.in_progress": "Analyse en cours...",
+    "audit.progress": "Analyse en cours... {done} / {total} s\u00e9ries",
+    "audit.btn.cancel": "Annuler l'audit",
+    "audit.cancelled": "Audit annul\u00e9, r\u00e9sultats partiels",
     "audit.error": "Erreur lors de l'audit",
     "audit.search_placeholder": "Rechercher une s\u00e9rie...",
     "audit.filter.all": "Toutes les s\u00e9ries",
@@ -175,6 +198,7 @@ const TRANSLATIONS = {
     "audit.filter.gaps": "Tomes manquants",
     "audit.filter.naming": "Nommage incorrect",
     "audit.filter.duplicates": "Tomes dupliqu\u00e9s",
+    "audit.filter.corrupt": "Archives corrompues",
     "audit.filter.empty": "Dossiers vides",
     "audit.filter.single": "Fichier unique",
     "audit.col.series": "S\u00e9rie",
@@ -188,17 +212,24 @@ const TRANSLATIONS = {
     "audit.stat.empty": "Dossiers vides",
     "audit.stat.single": "Fichier unique",
     "audit.stat.duplicates": "Tomes dupliqu\u00e9s",
+    "audit.stat.corrupt": "Archives corrompues",
     "audit.empty": "Aucune s\u00e9rie trouv\u00e9e",
     "audit.empty_initial": "Lancez un audit pour analyser votre collection",
     "audit.badge.missing": "{count} manquant(s)",
     "audit.badge.naming": "{count} nommage",
     "audit.badge.duplicate": "{count} doublon(s)",
+    "audit.badge.corrupt": "{count} corrompu(s)",
+    "audit.badge.low_res": "{count} basse d\u00e9f.",
     "audit.badge.empty": "Vide",
     "audit.badge.single": "1 fichier",
     "audit.detail.naming": "Nommage incorrect",
     "audit.detail.fix_all": "Corriger tout",
     "audit.detail.missing": "Tomes manquants",
     "audit.detail.duplicates": "Tomes en double",
+    "audit.detail.corrupt": "Archives corrompues",
+    "audit.detail.pages": "Pages",
+    "audit.detail.pages_summary": "{pages} pages, hauteur moyenne {height} px",
+    "audit.file_pages": "{pages} p. {width}\u00d7{height}",
     "audit.detail.files": "Fichiers ({count})",
     "audit.fix.success": "{count} fichier(s) renomm\u00e9(s)",
     "audit.fix.error": "Erreur lors de la correction",
@@ -211,6 +242,7 @@ const TRANSLATIONS = {
     "convert.btn.scanning": "Scan...",
     "convert.delete_original": "Supprimer les originaux apr\u00e8s conversion",
     "convert.progress": "Conversion en cours...",
+    "convert.queued": "En attente",
     "convert.progress_detail": "Conversion de {count} fichier(s) en cours...",
     "convert.col.file": "Fichier",
     "convert.col.tome": "Tome",
@@ -220,6 +252,7 @@ const TRANSLATIONS = {
     "convert.no_cbr": "Aucun fichier CBR/PDF trouv\u00e9",
     "convert.dpi_label": "R\u00e9solution (DPI)",
     "convert.quality_label": "Qualit\u00e9 JPEG",
+    "convert.workers_label": "Processus de rendu",
     "convert.cbz_exists": "CBZ existe",
     "convert.btn.convert": "Convertir la s\u00e9lection",
     "convert.btn.convert_n": "Convertir la s\u00e9lection ({count})",
@@ -230,14 +263,31 @@ const TRANSLATIONS = {
     "convert.files_label": "{count} fichiers",
     "convert.status.ok": "Converti",
     "convert.status.verified": "Converti \u2713 ({count} fichiers)",
+    "convert.status.pages": "{copied} page(s) copi\u00e9e(s) sans perte, {rendered} page(s) rendue(s)",
     "convert.progress_n": "Conversion {current}/{total} \u2014 {name}...",
     "convert.btn.cancel": "Annuler",
     "convert.cancelling": "Annulation...",
     "convert.cancelled": "Conversion annul\u00e9e ({done}/{total} trait\u00e9s)",
     "convert.errors_count": "{count} erreur(s) de conversion",
+    "recompress.title": "Recompresser les CBZ",
+    "recompress.hint": "R\u00e9-encode les pages des CBZ du dossier ci-dessus (ou de toute la biblioth\u00e8que s'il est vide). Un CBZ n'est remplac\u00e9 que s'il devient plus petit.",
+    "recompress.format_label": "Format",
+    "recompress.quality_label": "Qualit\u00e9",
+    "recompress.col.series": "S\u00e9rie",
+    "recompress.col.volumes": "Volumes",
+    "recompress.col.saved": "Gain",
+    "recompress.empty": "Aucune recompression effectu\u00e9e",
+    "recompress.btn": "Recompresser",
+    "recompress.progress": "Recompression {done}/{total}...",
+    "recompress.done": "Recompression termin\u00e9e : {saved} \u00e9conomis\u00e9s",
+    "recompress.none": "Aucun CBZ \u00e0 recompresser",
+    "recompress.error": "Erreur lors de la recompression",
+    "recompress.errors_count": "{count} erreur(s) de recompression",
 
     // Duplicates
     "files.filter.duplicates": "Doublons",
+    "files.filter.corrupt": "Corrompus",
+    "files.corrupt_badge": "corrompu",
     "files.duplicate_badge": "doublon",
     "files.duplicate_title": "Ce fichier existe d\u00e9j\u00e0 dans la destination",
 
@@ -324,6 +374,12 @@ const TRANSLATIONS = {
     "dashboard.by_format": "By format",
     "dashboard.empty": "No collections configured",
     "dashboard.loading": "Loading...",
+    "dashboard.pages": "Pages",
+    "dashboard.pages_empty": "No volume sampled yet (enable page statistics)",
+    "dashboard.pages_avg": "Pages per volume",
+    "dashboard.pages_height": "Average height",
+    "dashboard.pages_low_res": "Low resolution volumes",
+    "dashboard.pages_sampled": "{count} volume(s) sampled",
 
     // Files view
     "files.select_all": "Select all",
@@ -353,6 +409,7 @@ const TRANSLATIONS = {
     "files.match_pct": "Match {pct}%",
     "files.suggestion_pct": "Suggestion {pct}%",
     "files.organize_n_matched": "Organize {count} matched",
+    "files.show_more": "Show more ({count} remaining)",
 
     // Action panel
     "action.organize": "Organize",
@@ -380,6 +437,15 @@ const TRANSLATIONS = {
     "config.dashboard_enabled_hint": "Show dashboard with collection statistics",
     "config.thumbnails_enabled": "Thumbnails",
     "config.thumbnails_enabled_hint": "Show cover thumbnails in the file list",
+    "config.watch_enabled": "Watch mode",
+    "config.watch_enabled_hint": "Update the file list live when source folders change",
+    "config.verify_enabled": "Archive verification",
+    "config.verify_enabled_hint": "Check CBZ, CBR and PDF integrity in the background (sources and destinations)",
+    "config.stats_enabled": "Page statistics",
+    "config.stats_enabled_hint": "Collect page counts, image formats and resolution of volumes in the background",
+    "config.convert_workers": "Simultaneous conversions",
+    "config.convert_workers_hint": "Number of CBR/PDF files converted in parallel in the background.",
+    "config.convert_workers.auto": "Automatic (half the processors)",
     "config.audit_case": "Naming case (audit)",
     "config.audit_case_hint": "Case checking during naming audit.",
     "config.audit_case.ignore": "Case insensitive",
@@ -428,6 +494,7 @@ const TRANSLATIONS = {
     "organize.confirm_existing": "Existing files:",
     "organize.confirm_more": "... and {count} more",
     "organize.confirm_continue": "Do you want to continue?",
+    "organize.confirm_duplicates": "These files seem to be in the library already:",
     "organize.success": "{count} file(s) organized in {name}/",
     "organize.error": "Error during organization",
     "organize.batch_confirm": "Organize {count} automatically matched file(s)?",
@@ -450,12 +517,14 @@ const TRANSLATIONS = {
     "history.filter.undelete": "Restore",
     "history.filter.fix_naming": "Fix naming",
     "history.filter.convert": "Convert CBR",
+    "history.filter.recompress": "Recompress",
     "history.btn.refresh": "Refresh",
     "history.col.date": "Date",
     "history.col.action": "Action",
     "history.col.detail": "Detail",
     "history.col.series": "Series",
     "history.empty": "No actions recorded",
+    "history.show_more": "Show more ({count} remaining)",
     "history.error": "Error loading history",
     "history.action.organize": "Organize",
     "history.action.organize_batch": "Organize (batch)",
@@ -463,6 +532,7 @@ const TRANSLATIONS = {
     "history.action.undelete": "Restore",
     "history.action.fix_naming": "Fix naming",
     "history.action.convert": "Convert CBR",
+    "history.action.recompress": "Recompress",
 
     // Audit
     "audit.title": "Collection audit",
@@ -470,6 +540,9 @@ const TRANSLATIONS = {
     "audit.btn.rerun": "Re-run audit",
     "audit.loading": "Analyzing collection...",
     "audit.in_progress": "Analyzing...",
+    "audit.progress": "Analyzing... {done} / {total} series",
+    "audit.btn.cancel": "Cancel audit",
+    "audit.cancelled": "Audit cancelled, partial results",
     "audit.error": "Error during audit",
     "audit.search_placeholder": "Search a series...",
     "audit.filter.all": "All series",
@@ -477,6 +550,7 @@ const TRANSLATIONS = {
     "audit.filter.gaps": "Missing volumes",
     "audit.filter.naming": "Incorrect naming",
     "audit.filter.duplicates": "Duplicate volumes",
+    "audit.filter.corrupt": "Corrupt archives",
     "audit.filter.empty": "Empty folders",
     "audit.filter.single": "Single file",
     "audit.col.series": "Series",
@@ -490,17 +564,24 @@ const TRANSLATIONS = {
     "audit.stat.empty": "Empty folders",
     "audit.stat.single": "Single file",
     "audit.stat.duplicates": "Duplicate volumes",
+    "audit.stat.corrupt": "Corrupt archives",
     "audit.empty": "No series found",
     "audit.empty_initial": "Run an audit to analyze your collection",
     "audit.badge.missing": "{count} missing",
     "audit.badge.naming": "{count} naming",
     "audit.badge.duplicate": "{count} duplicate(s)",
+    "audit.badge.corrupt": "{count} corrupt",
+    "audit.badge.low_res": "{count} low res",
     "audit.badge.empty": "Empty",
     "audit.badge.single": "1 file",
     "audit.detail.naming": "Incorrect naming",
     "audit.detail.fix_all": "Fix all",
     "audit.detail.missing": "Missing volumes",
     "audit.detail.duplicates": "Duplicate volumes",
+    "audit.detail.corrupt": "Corrupt archives",
+    "audit.detail.pages": "Pages",
+    "audit.detail.pages_summary": "{pages} pages, average height {height} px",
+    "audit.file_pages": "{pages} p. {width}\u00d7{height}",
     "audit.detail.files": "Files ({count})",
     "audit.fix.success": "{count} file(s) renamed",
     "audit.fix.error": "Error during fix",
@@ -513,6 +594,7 @@ const TRANSLATIONS = {
     "convert.btn.scanning": "Scanning...",
     "convert.delete_original": "Delete originals after conversion",
     "convert.progress": "Converting...",
+    "convert.queued": "Queued",
     "convert.progress_detail": "Converting {count} file(s)...",
     "convert.col.file": "File",
     "convert.col.tome": "Volume",
@@ -522,6 +604,7 @@ const TRANSLATIONS = {
     "convert.no_cbr": "No CBR/PDF files found",
     "convert.dpi_label": "Resolution (DPI)",
     "convert.quality_label": "JPEG quality",
+    "convert.workers_label": "Render processes",
     "convert.cbz_exists": "CBZ exists",
     "convert.btn.convert": "Convert selection",
     "convert.btn.convert_n": "Convert selection ({count})",
@@ -532,14 +615,31 @@ const TRANSLATIONS = {
     "convert.files_label": "{count} files",
     "convert.status.ok": "Converted",
     "convert.status.verified": "Converted \u2713 ({count} files)",
+    "convert.status.pages": "{copied} page(s) copied losslessly, {rendered} page(s) rendered",
     "convert.progress_n": "Converting {current}/{total} \u2014 {name}...",
     "convert.btn.cancel": "Cancel",
     "convert.cancelling": "Cancelling...",
     "convert.cancelled": "Conversion cancelled ({done}/{total} processed)",
     "convert.errors_count": "{count} conversion error(s)",
+    "recompress.title": "Recompress CBZ files",
+    "recompress.hint": "Re-encodes the pages of the CBZ files in the folder above (or the whole library if empty). A CBZ is only replaced when it gets smaller.",
+    "recompress.format_label": "Format",
+    "recompress.quality_label": "Quality",
+    "recompress.col.series": "Series",
+    "recompress.col.volumes": "Volumes",
+    "recompress.col.saved": "Saved",
+    "recompress.empty": "No recompression yet",
+    "recompress.btn": "Recompress",
+    "recompress.progress": "Recompressing {done}/{total}...",
+    "recompress.done": "Recompression done: {saved} saved",
+    "recompress.none": "No CBZ to recompress",
+    "recompress.error": "Recompression failed",
+    "recompress.errors_count": "{count} recompression error(s)",
 
     // Duplicates
     "files.filter.duplicates": "Duplicates",
+    "files.filter.corrupt": "Corrupt",
+    "files.corrupt_badge": "corrupt",
     "files.duplicate_badge": "duplicate",
     "files.duplicate_title": "This file already exists at destination",
 
@@ -1,11 +1,18 @@
 """Unit tests for Tana core functions."""
 
+import json
+import os
 import sys
+import tempfile
+import zipfile
 from pathlib import Path
 
+import pytest
+
 # Add project root to path so we can import app module
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
+import app as tana
 from app import (
     apply_template,
     detect_series,
@@ -175,6 +182,30 @@ class TestNormalize:
         assert result.strip() == ""
 
 
+# ---------------------------------------------------------------------------
+# parse_filename
+# ---------------------------------------------------------------------------
+
+class TestParseFilename:
+    def test_all_fields(self):
+        parsed = tana.parse_filename("L'Attaque des Titans - Tome 3 - Le Mur [Digital-1920].cbz")
+        assert parsed == ("L'Attaque des Titans", 3, "Le Mur [Digital-1920]", "attaque titans")
+
+    def test_matches_detect_functions(self):
+        name = "BD.FR.-.Blacksad.T01.Quelque.part.entre.les.ombres.cbz"
+        parsed = tana.parse_filename(name)
+        assert parsed.series == detect_series(name)
+        assert parsed.tome == detect_tome(name)
+        assert parsed.title == tana.detect_title(name)
+        assert parsed.series_norm == normalize(detect_series(name))
+
+    def test_memoized(self):
+        tana.parse_filename.cache_clear()
+        tana.parse_filename("Naruto T01.cbz")
+        tana.parse_filename("Naruto T01.cbz")
+        assert tana.parse_filename.cache_info().hits == 1
+
+
 # ---------------------------------------------------------------------------
 # apply_template
 # ---------------------------------------------------------------------------
@@ -370,3 +401,1233 @@ class TestIsSafeFilename:
 
     def test_empty_filename(self):
         assert is_safe_filename("", "/data/incoming") is False
+
+
+# ---------------------------------------------------------------------------
+# list_files scan index
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def library(tmp_path, monkeypatch):
+    """Isolated config with one source and one destination containing 'Naruto'."""
+    source = tmp_path / "incoming"
+    dest = tmp_path / "manga"
+    source.mkdir()
+    (dest / "Naruto").mkdir(parents=True)
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({
+        "sources": [str(source)],
+        "destinations": [str(dest)],
+        "extensions": [".cbz"],
+        "template": "{series} - T{tome:02d}{ext}",
+        "template_no_tome": "{series}{ext}",
+        "template_rules": [],
+    }))
+    monkeypatch.setattr(tana, "CONFIG_PATH", config_path)
+    monkeypatch.setattr(tana, "HISTORY_PATH", tmp_path / "history.json")
+    monkeypatch.setattr(tana, "HISTORY_JOURNAL_PATH", tmp_path / "history.jsonl")
+    monkeypatch.setattr(tana, "HISTORY_ARCHIVE_PATH", tmp_path / "history.archive.jsonl.gz")
+    monkeypatch.setattr(tana, "HISTORY_DB_PATH", tmp_path / "history.db")
+    monkeypatch.setattr(tana, "_history_pending", [])
+    monkeypatch.setattr(tana, "SCAN_INDEX_PATH", tmp_path / "scan_index.json")
+    monkeypatch.setattr(tana, "_scan_index", None)
+    monkeypatch.setattr(tana, "ALIASES_PATH", tmp_path / "aliases.json")
+    monkeypatch.setattr(tana, "_aliases", None)
+    monkeypatch.setattr(tana, "LIBRARY_DB_PATH", tmp_path / "library.db")
+    monkeypatch.setattr(tana, "CONVERT_JOBS_DB_PATH", tmp_path / "jobs.db")
+    monkeypatch.setattr(tana, "_catalog_reconciled", float("-inf"))
+    monkeypatch.setattr(tana, "_corrupt_cache", None)
+    tana.invalidate_series_cache()
+    yield {"source": source, "dest": dest}
+    tana.stop_converter()
+    tana.invalidate_series_cache()
+
+
+class TestScanIndex:
+    def test_results_are_cached(self, library, monkeypatch):
+        (library["source"] / "Naruto T01.cbz").write_bytes(b"x")
+        first = tana.list_files([str(library["source"])])
+        assert first[0]["series_match"]["name"] == "Naruto"
+        assert tana.SCAN_INDEX_PATH.is_file()
+
+        def fail(_name):
+            raise AssertionError("file should not be re-analyzed")
+        monkeypatch.setattr(tana, "parse_filename", fail)
+        monkeypatch.setattr(tana, "_scan_index", None)  # force a reload from disk
+        assert tana.list_files([str(library["source"])]) == first
+
+    def test_changed_file_is_reanalyzed(self, library):
+        f = library["source"] / "Naruto T01.cbz"
+        f.write_bytes(b"x")
+        tana.list_files([str(library["source"])])
+        f.write_bytes(b"longer content")
+        files = tana.list_files([str(library["source"])])
+        assert files[0]["size"] == len(b"longer content")
+
+    def test_catalog_change_rematches(self, library):
+        (library["source"] / "Bleach T01.cbz").write_bytes(b"x")
+        assert tana.list_files([str(library["source"])])[0]["series_match"] is None
+        (library["dest"] / "Bleach").mkdir()
+        tana.invalidate_series_cache()
+        files = tana.list_files([str(library["source"])])
+        assert files[0]["series_match"]["name"] == "Bleach"
+
+    def test_duplicate_not_cached(self, library):
+        (library["source"] / "Naruto T01.cbz").write_bytes(b"x")
+        assert tana.list_files([str(library["source"])])[0]["duplicate"] is False
+        (library["dest"] / "Naruto" / "Naruto - T01.cbz").write_bytes(b"x")
+        assert tana.list_files([str(library["source"])])[0]["duplicate"] is True
+
+    def test_removed_files_are_pruned(self, library):
+        f = library["source"] / "Naruto T01.cbz"
+        f.write_bytes(b"x")
+        tana.list_files([str(library["source"])])
+        f.unlink()
+        assert tana.list_files([str(library["source"])]) == []
+        assert json.loads(tana.SCAN_INDEX_PATH.read_text())["files"] == {}
+
+    def test_paused_stream_does_not_block_scans(self, library):
+        (library["source"] / "Naruto T01.cbz").write_bytes(b"x")
+        (library["source"] / "Naruto T02.cbz").write_bytes(b"x")
+        stream = tana.iter_files([str(library["source"])])
+        next(stream)
+        assert len(tana.list_files([str(library["source"])])) == 2
+        assert len(list(stream)) == 1
+
+
+# ---------------------------------------------------------------------------
+# walk_files
+# ---------------------------------------------------------------------------
+
+class TestWalkFiles:
+    @pytest.fixture
+    def tree(self, tmp_path):
+        for rel in ["b.cbz", "a.cbr", "x/2.cbz", "x/10.cbz", "y/z/deep.pdf",
+                    "y/notes.txt", ".trash/old.cbz", "x/.thumbnails/t.jpg", ".hidden.cbz"]:
+            p = tmp_path / rel
+            p.parent.mkdir(parents=True, exist_ok=True)
+            p.write_bytes(b"data")
+        return tmp_path
+
+    def test_skips_hidden_entries(self, tree):
+        rels = [rel for rel, _ in tana.walk_files(tree)]
+        assert rels == ["a.cbr", "b.cbz", "x/10.cbz", "x/2.cbz", "y/notes.txt", "y/z/deep.pdf"]
+
+    def test_extension_filter(self, tree):
+        rels = [rel for rel, _ in tana.walk_files(tree, extensions={".cbz"})]
+        assert rels == ["b.cbz", "x/10.cbz", "x/2.cbz"]
+
+    def test_include_hidden(self, tree):
+        rels = [rel for rel, _ in tana.walk_files(tree / ".trash", skip_hidden=False)]
+        assert rels == ["old.cbz"]
+
+    def test_parallel_matches_serial(self, tree):
+        serial = [rel for rel, _ in tana.walk_files(tree)]
+        parallel = [rel for rel, _ in tana.walk_files(tree, workers=4)]
+        assert parallel == serial
+
+    def test_stat_is_returned(self, tree):
+        stats = dict(tana.walk_files(tree))
+        assert stats["b.cbz"].st_size == 4
+
+    def test_missing_root(self, tmp_path):
+        assert tana.walk_files(tmp_path / "missing") == []
+
+
+# ---------------------------------------------------------------------------
+# source watcher
+# ---------------------------------------------------------------------------
+
+class TestWatcher:
+    @pytest.fixture
+    def events(self, library):
+        q = tana.queue.Queue()
+        tana._watch_subscribers.append(q)
+        yield q
+        tana.stop_watcher()
+        tana._watch_subscribers.remove(q)
+
+    @staticmethod
+    def wait_primed():
+        for _ in range(200):
+            if tana._watcher.get("primed"):
+                return
+            tana.time.sleep(0.01)
+        raise AssertionError("watcher did not start")
+
+    @staticmethod
+    def next_event(q, timeout=5):
+        event = q.get(timeout=timeout)
+        while event["type"] == "update":  # CLOSE_WRITE after MOVED_TO, etc.
+            event = q.get(timeout=timeout)
+        return event
+
+    def run_scenario(self, library, events):
+        tana.start_watcher()
+        self.wait_primed()
+        source = library["source"]
+
+        (source / "Naruto T01.cbz").write_bytes(b"x")
+        event = self.next_event(events)
+        assert event["type"] == "add"
+        assert event["file"]["series_match"]["name"] == "Naruto"
+        assert [f["name"] for f in tana.watcher_snapshot([str(source)])] == ["Naruto T01.cbz"]
+
+        (source / "Naruto T01.cbz").rename(source / "Naruto T02.cbz")
+        event = self.next_event(events)
+        assert event["type"] == "rename"
+        assert event["old"]["name"] == "Naruto T01.cbz"
+        assert event["file"]["tome"] == 2
+
+        (source / "Naruto T02.cbz").unlink()
+        event = self.next_event(events)
+        assert event == {"type": "remove", "source_dir": str(source), "name": "Naruto T02.cbz"}
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+    def test_inotify_events(self, library, events):
+        self.run_scenario(library, events)
+        assert tana._watcher["mode"] == "inotify"
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+    def test_idle_watcher_does_not_recompute_signature(self, library, events, monkeypatch):
+        tana.start_watcher()
+        self.wait_primed()
+        calls = []
+        monkeypatch.setattr(tana, "_watch_signature", lambda cfg: calls.append(cfg) or ("", 0))
+        tana._watch_inputs_changed.clear()
+        tana.time.sleep(1.5)
+        assert calls == []
+        tana.learn_aliases([("SNK T01.cbz", "Naruto", str(library["dest"]))])
+        for _ in range(200):
+            if calls:
+                break
+            tana.time.sleep(0.01)
+        assert calls
+
+    def test_superseded_rescan_publishes_nothing(self, library, events):
+        (library["source"] / "Naruto T01.cbz").write_bytes(b"x")
+        state = {"stop": tana.threading.Event(), "sources": [str(library["source"])], "primed": False, "files": {}}
+        state["stop"].set()
+        tana._watch_resync(state)
+        assert (state["primed"], state["files"]) == (False, {})
+        assert events.empty()
+
+    def test_polling_fallback(self, library, events, monkeypatch):
+        monkeypatch.setattr(tana, "_libc", lambda: None)
+        monkeypatch.setattr(tana, "WATCH_POLL_INTERVAL", 0.05)
+        self.run_scenario(library, events)
+        assert tana._watcher["mode"] == "polling"
+
+
+# ---------------------------------------------------------------------------
+# /api/files streaming and pagination
+# ---------------------------------------------------------------------------
+
+def _file(name, series="", score=0.0, ext=".cbz", duplicate=False, size=1, tome=None):
+    return {
+        "name": name, "source_dir": "/in", "size": size, "tome": tome, "extension": ext,
+        "series_guess": series, "series_match": {"name": series} if score else None,
+        "match_score": score, "duplicate": duplicate,
+    }
+
+
+class TestFilesPagination:
+    FILES = [
+        _file("c.cbz", "Naruto", 1.0, size=3),
+        _file("a.cbr", "Bleach", 0.7, ext=".cbr", size=1),
+        _file("b.pdf", "Other", 0.0, ext=".pdf", duplicate=True, size=2),
+        _file("d.cbz", "Naruto", 0.95, size=4),
+    ]
+
+    def test_pages_cover_everything_once(self):
+        names, cursor = [], ""
+        while True:
+            page, cursor = tana.paginate_files(self.FILES, "name", "asc", 3, cursor)
+            names += [f["name"] for f in page]
+            if cursor is None:
+                break
+        assert names == ["a.cbr", "b.pdf", "c.cbz", "d.cbz"]
+
+    def test_descending_order(self):
+        page, cursor = tana.paginate_files(self.FILES, "size", "desc", 2)
+        assert [f["name"] for f in page] == ["d.cbz", "c.cbz"]
+        page, cursor = tana.paginate_files(self.FILES, "size", "desc", 2, cursor)
+        assert [f["name"] for f in page] == ["b.pdf", "a.cbr"]
+        assert cursor is None
+
+    def test_cursor_survives_insertions(self):
+        page, cursor = tana.paginate_files(self.FILES, "name", "asc", 2)
+        grown = self.FILES + [_file("0.cbz")]
+        page, _ = tana.paginate_files(grown, "name", "asc", 2, cursor)
+        assert [f["name"] for f in page] == ["c.cbz", "d.cbz"]
+
+    def test_cursor_from_another_sort_is_rejected(self):
+        _page, cursor = tana.paginate_files(self.FILES, "name", "asc", 2)
+        with pytest.raises(ValueError):
+            tana.paginate_files(self.FILES, "size", "asc", 2, cursor)
+        with pytest.raises(ValueError):
+            tana.paginate_files(self.FILES, "name", "asc", 2, "garbage")
+
+    def test_filters(self):
+        def names(**args):
+            return sorted(f["name"] for f in tana.filter_files(self.FILES, args))
+        assert names(series="naru") == ["c.cbz", "d.cbz"]
+        assert names(ext="cbr,pdf") == ["a.cbr", "b.pdf"]
+        assert names(duplicate="1") == ["b.pdf"]
+        assert names(min_score="0.9") == ["c.cbz", "d.cbz"]
+        assert names(status="suggested") == ["a.cbr"]
+        assert names(status="unmatched") == ["b.pdf"]
+
+
+class TestFilesApi:
+    def test_stream(self, library):
+        for i in (1, 2):
+            (library["source"] / f"Naruto T0{i}.cbz").write_bytes(b"x")
+        res = tana.app.test_client().get("/api/files?stream=1")
+        lines = [json.loads(line) for line in res.get_data(as_text=True).splitlines()]
+        assert res.mimetype == "application/x-ndjson"
+        assert [line["file"]["name"] for line in lines[:-1]] == ["Naruto T01.cbz", "Naruto T02.cbz"]
+        assert lines[-1] == {"done": True, "total": 2, "sources": [str(library["source"])]}
+
+    def test_paginated(self, library):
+        for i in (1, 2, 3):
+            (library["source"] / f"Naruto T0{i}.cbz").write_bytes(b"x" * i)
+        client = tana.app.test_client()
+        data = client.get("/api/files?limit=2&sort=size&order=desc").get_json()
+        assert [f["tome"] for f in data["files"]] == [3, 2]
+        assert data["total"] == 3
+        data = client.get(f"/api/files?limit=2&sort=size&order=desc&cursor={data['next_cursor']}").get_json()
+        assert [f["tome"] for f in data["files"]] == [1]
+        assert data["next_cursor"] is None
+
+    def test_mismatched_cursor_is_rejected(self, library):
+        for i in (1, 2, 3):
+            (library["source"] / f"Naruto T0{i}.cbz").write_bytes(b"x" * i)
+        client = tana.app.test_client()
+        cursor = client.get("/api/files?limit=2&sort=size").get_json()["next_cursor"]
+        res = client.get(f"/api/files?limit=2&sort=name&cursor={cursor}")
+        assert res.status_code == 400
+
+
+# ---------------------------------------------------------------------------
+# find_best_match index
+# ---------------------------------------------------------------------------
+
+class TestMatchIndex:
+    SERIES = ["Naruto", "Naruto Gaiden", "One Piece", "One Punch Man", "L'Attaque des Titans",
+              "Attaque", "Les Légendaires", "Légendaires Origines", "Dragon Ball", "Dragon Ball Super",
+              "Le", "Blacksad", "Black Clover", "Spider-Man", "Spider Man Noir", "Thorgal"]
+    GUESSES = ["Naruto", "naruto", "Naruto Gai", "Nar", "One", "One Piece Color", "Attaque des Titans",
+               "attaque", "Legendaires", "Les Legendaires Origines", "Dragon", "Dragon Ball Z", "La",
+               "The", "Black", "Blacksad Integrale", "Spider Man", "spider-man", "Thor", "Unknown Series",
+               "Ball Dragon", "Man", ""]
+
+    def test_index_matches_linear_scan(self, library):
+        for name in self.SERIES:
+            (library["dest"] / name).mkdir(exist_ok=True)
+        existing = tana.get_existing_series()
+        for guess in self.GUESSES:
+            for threshold in (0.0, 0.6):
+                indexed = tana.find_best_match(guess, existing, threshold)
+                linear = tana.find_best_match(guess, dict(existing), threshold)
+                assert indexed == linear, guess
+
+    def test_candidates_skip_unrelated_series(self, library):
+        for name in self.SERIES:
+            (library["dest"] / name).mkdir(exist_ok=True)
+        tana.get_existing_series()
+        assert tana._match_candidates(tana._series_index, "Thorgal", normalize("Thorgal")) == ["thorgal"]
+
+    def test_ties_keep_catalog_order(self, library):
+        (library["dest"] / "Spider Man").mkdir()
+        (library["dest"] / "Spider-Man").mkdir()
+        existing = tana.get_existing_series()
+        first = next(k for k in existing if k.startswith("spider"))
+        entry, score = tana.find_best_match("Spider  Man", existing)
+        assert score == 0.95
+        assert entry["name"].lower() == first
+
+
+# ---------------------------------------------------------------------------
+# search_series
+# ---------------------------------------------------------------------------
+
+class TestSearchSeries:
+    SERIES = TestMatchIndex.SERIES
+    QUERIES = ["na", "Nar", "naruto gai", "narutp", "ball", "ball sup", "blaksad", "titans", "attaque",
+               "d", "la", "les leg", "légend", "spider-man", "spidr", "thorgl", "zzz", "   "]
+
+    @pytest.fixture
+    def catalog(self, library):
+        for name in self.SERIES:
+            (library["dest"] / name).mkdir(exist_ok=True)
+        return tana.get_existing_series()
+
+    @staticmethod
+    def _names(results):
+        return [r["name"] for r in results]
+
+    def test_index_matches_linear_scan(self, catalog):
+        for q in self.QUERIES:
+            for limit in (1, 3, 10):
+                assert tana.search_series(q, catalog, limit) == tana.search_series(q, dict(catalog), limit), q
+
+    def test_ranking(self, catalog):
+        # Prefix (accents and articles ignored) before word prefix
+        assert self._names(tana.search_series("legendaires", catalog)) == ["Les Légendaires", "Légendaires Origines"]
+        assert self._names(tana.search_series("man", catalog)) == ["One Punch Man", "Spider Man Noir", "Spider-Man"]
+        # Substring needs 3 characters
+        assert self._names(tana.search_series("ruto", catalog)) == ["Naruto", "Naruto Gaiden"]
+        assert tana.search_series("ru", catalog) == []
+
+    def test_typo_tolerant(self, catalog):
+        assert self._names(tana.search_series("blaksad", catalog))[0] == "Blacksad"
+        assert self._names(tana.search_series("thorgl", catalog)) == ["Thorgal"]
+
+    def test_limit(self, catalog):
+        assert len(tana.search_series("a", catalog, limit=2)) <= 2
+
+
+# ---------------------------------------------------------------------------
+# alias table
+# ---------------------------------------------------------------------------
+
+class TestAliases:
+    def test_organize_teaches_alias(self, library):
+        (library["source"] / "SNK T01.cbz").write_bytes(b"x")
+        (library["source"] / "SNK T02.cbz").write_bytes(b"y")
+        (library["dest"] / "L'Attaque des Titans").mkdir()
+        tana.invalidate_series_cache()
+        assert tana.list_files([str(library["source"])])[0]["series_match"] is None
+
+        res = tana.app.test_client().post("/api/organize", json={
+            "series_name": "L'Attaque des Titans", "destination": str(library["dest"]),
+            "source_dir": str(library["source"]), "files": [{"source": "SNK T01.cbz", "tome": 1}],
+            "force": True,
+        })
+        assert res.get_json()["results"][0]["success"]
+        files = tana.list_files([str(library["source"])])
+        assert files[0]["series_match"]["name"] == "L'Attaque des Titans"
+        assert files[0]["match_score"] == 1.0
+
+    def test_alias_skips_fuzzy_matching(self, library, monkeypatch):
+        tana.learn_aliases([("Naruto T01.cbz", "Naruto", str(library["dest"]))])
+        monkeypatch.setattr(tana, "find_best_match", lambda *a, **k: pytest.fail("fuzzy matching used"))
+        (library["source"] / "Naruto T02.cbz").write_bytes(b"x")
+        assert tana.list_files([str(library["source"])])[0]["match_score"] == 1.0
+
+    def test_stale_alias_ignored(self, library):
+        tana.learn_aliases([("Bleach T01.cbz", "Bleach", str(library["dest"]))])
+        (library["source"] / "Bleach T02.cbz").write_bytes(b"x")
+        assert tana.list_files([str(library["source"])])[0]["series_match"] is None
+
+    def test_rebuilt_from_history(self, library):
+        tana.HISTORY_PATH.write_text(json.dumps([
+            {"action": "organize", "source": "sub/SNK T02.cbz", "series": "Shingeki",
+             "destination": str(library["dest"] / "Shingeki" / "Shingeki - T02.cbz")},
+            {"action": "organize_batch", "source": "SNK T01.cbz", "series": "Naruto",
+             "destination": str(library["dest"] / "Naruto" / "Naruto - T01.cbz")},
+        ]))
+        # Latest entry wins (history is newest first)
+        assert tana._load_aliases() == {"snk": {"name": "Shingeki", "destination": str(library["dest"])}}
+        assert json.loads(tana.ALIASES_PATH.read_text())["snk"]["name"] == "Shingeki"
+
+    def test_undo_forgets_alias(self, library):
+        (library["dest"] / "Shingeki").mkdir()
+        (library["source"] / "SNK T01.cbz").write_bytes(b"x")
+        client = tana.app.test_client()
+        res = client.post("/api/organize", json={
+            "series_name": "Shingeki", "destination": str(library["dest"]), "force": True,
+            "source_dir": str(library["source"]), "files": [{"source": "SNK T01.cbz", "tome": 1}],
+        }).get_json()
+        assert tana._load_aliases()["snk"]["name"] == "Shingeki"
+        res = client.post("/api/undo", json={
+            "action": "organize", "destination": res["results"][0]["destination"],
+            "source": "SNK T01.cbz", "source_dir": str(library["source"]),
+        })
+        assert res.get_json()["success"]
+        assert "snk" not in tana._load_aliases()
+        assert "snk" not in tana._aliases_from_history()
+
+
+# ---------------------------------------------------------------------------
+# series catalog validation
+# ---------------------------------------------------------------------------
+
+class TestSeriesCatalog:
+    @staticmethod
+    def _settle(path):
+        os.utime(path, (1_000_000_000, 1_000_000_000))
+
+    @staticmethod
+    def _index_state():
+        index = tana._series_index
+        return (index.sig, index.norms, index.norm_keys, index.token_index, index.sorted_norms,
+                index.sorted_tokens, index.trigram_index, index.trigram_sizes)
+
+    def test_unchanged_destination_not_relisted(self, library, monkeypatch):
+        self._settle(library["dest"])
+        first = tana.get_existing_series()
+        monkeypatch.setattr(tana, "_catalog_series_dirs", lambda dest: pytest.fail("destination re-listed"))
+        assert tana.get_existing_series() is first
+
+    def test_refreshed_series_not_relisted(self, library, monkeypatch):
+        self._settle(library["dest"])
+        tana.get_existing_series()
+        (library["dest"] / "Bleach").mkdir()
+        tana.refresh_series(str(library["dest"]), "Bleach")
+        monkeypatch.setattr(tana, "_catalog_series_dirs", lambda dest: pytest.fail("destination re-listed"))
+        monkeypatch.setattr(tana, "list_catalog_destination", lambda dest: pytest.fail("destination re-listed"))
+        assert sorted(tana.get_existing_series()) == ["bleach", "naruto"]
+
+    def test_changed_destination_applied_incrementally(self, library):
+        self._settle(library["dest"])
+        tana.get_existing_series()
+        (library["dest"] / "Bleach").mkdir()
+        (library["dest"] / "Naruto").rmdir()
+        assert list(tana.get_existing_series()) == ["bleach"]
+
+    def test_incremental_index_matches_full_build(self, library):
+        for name in TestMatchIndex.SERIES[:8]:
+            (library["dest"] / name).mkdir(exist_ok=True)
+        tana.get_existing_series()
+        for name in TestMatchIndex.SERIES[8:]:
+            (library["dest"] / name).mkdir()
+        (library["dest"] / "Naruto Gaiden").rmdir()
+        (library["dest"] / "Attaque").rmdir()
+        tana.get_existing_series()
+        incremental = self._index_state()
+        tana.invalidate_series_cache()
+        tana.get_existing_series()
+        assert self._index_state() == incremental
+
+    def test_refresh_series_updates_one_entry(self, library, monkeypatch):
+        self._settle(library["dest"])
+        tana.get_existing_series()
+        (library["dest"] / "Bleach").mkdir()
+        self._settle(library["dest"])  # listing would be skipped: only refresh_series can add it
+        tana.refresh_series(str(library["dest"]), "Bleach")
+        monkeypatch.setattr(tana, "_catalog_series_dirs", lambda dest: pytest.fail("destination re-listed"))
+        existing = tana.get_existing_series()
+        assert sorted(existing) == ["bleach", "naruto"]
+        assert tana.find_best_match("Bleach", existing)[1] == 1.0
+
+    def test_removed_destination_dropped(self, library, tmp_path):
+        other = tmp_path / "comics"
+        (other / "Batman").mkdir(parents=True)
+        cfg = json.loads(tana.CONFIG_PATH.read_text())
+        cfg["destinations"].append(str(other))
+        tana.CONFIG_PATH.write_text(json.dumps(cfg))
+        assert sorted(tana.get_existing_series()) == ["batman", "naruto"]
+        cfg["destinations"] = [str(other)]
+        tana.CONFIG_PATH.write_text(json.dumps(cfg))
+        assert list(tana.get_existing_series()) == ["batman"]
+
+
+# ---------------------------------------------------------------------------
+# library catalog (SQLite)
+# ---------------------------------------------------------------------------
+
+class TestLibraryCatalog:
+    @staticmethod
+    def _settle(*paths):
+        for path in paths:
+            os.utime(path, (1_000_000_000, 1_000_000_000))
+
+    def test_old_schema_reset_once_across_threads(self, library):
+        import sqlite3
+        import threading
+        with sqlite3.connect(tana.LIBRARY_DB_PATH) as conn:
+            conn.execute("CREATE TABLE series (id INTEGER PRIMARY KEY)")
+            conn.execute("PRAGMA user_version = 1")
+        errors = []
+
+        def open_catalog():
+            try:
+                tana._catalog_db().execute("INSERT INTO destinations (path, mtime_ns) VALUES (?, 1)",
+                                           (threading.current_thread().name,))
+                tana._catalog_db().commit()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=open_catalog) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert errors == []
+        conn = tana._catalog_db()
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == tana.LIBRARY_DB_VERSION
+        assert conn.execute("SELECT COUNT(*) FROM destinations").fetchone()[0] == 8
+
+    def test_dashboard_and_audit_from_catalog(self, library):
+        naruto = library["dest"] / "Naruto"
+        for name in ("Naruto - T01.cbz", "Naruto - T03.cbz", "notes.txt"):
+            (naruto / name).write_bytes(b"xx")
+        client = tana.app.test_client()
+        dash = client.get("/api/dashboard").get_json()
+        assert (dash["total_series"], dash["total_volumes"], dash["total_size"]) == (1, 2, 4)
+        audit = client.get("/api/audit").get_json()
+        assert audit["series"][0]["missing_tomes"] == [2]
+
+        (naruto / "Naruto - T02.cbz").write_bytes(b"xx")
+        assert client.get("/api/audit").get_json()["series"][0]["missing_tomes"] == []
+        assert client.get("/api/dashboard").get_json()["total_volumes"] == 3
+
+    def test_unchanged_series_not_relisted(self, library, monkeypatch):
+        naruto = library["dest"] / "Naruto"
+        (naruto / "Naruto - T01.cbz").write_bytes(b"x")
+        self._settle(naruto, library["dest"])
+        tana.refresh_catalog()
+        monkeypatch.setattr(tana, "_list_volumes", lambda *a: pytest.fail("series folder re-listed"))
+        tana.refresh_catalog()
+        assert tana.audit_collections()["series"][0]["file_count"] == 1
+
+    def test_removed_series_dropped(self, library):
+        (library["dest"] / "Bleach").mkdir()
+        (library["dest"] / "Bleach" / "Bleach - T01.cbz").write_bytes(b"x")
+        tana.refresh_catalog()
+        (library["dest"] / "Bleach" / "Bleach - T01.cbz").unlink()
+        (library["dest"] / "Bleach").rmdir()
+        assert [s["series_name"] for s in tana.audit_collections()["series"]] == ["Naruto"]
+        assert tana._catalog_db().execute("SELECT COUNT(*) FROM volumes").fetchone()[0] == 0
+
+    def test_series_folders(self, library):
+        (library["dest"] / "Akira").mkdir()
+        folders = tana.app.test_client().get("/api/series-folders?q=aki").get_json()["folders"]
+        assert folders == [{"name": "Akira", "path": str(library["dest"] / "Akira"), "dest_label": "manga"}]
+
+
+# ---------------------------------------------------------------------------
+# history
+# ---------------------------------------------------------------------------
+
+class TestHistory:
+    @staticmethod
+    def _log(n, action="delete", series="", day="2026-01-01"):
+        with tana.app.test_request_context():
+            for i in range(n):
+                tana.log_action(action, {"filename": f"{i}.cbz", "series": series})
+                tana._history_pending[-1]["timestamp"] = f"{day}T00:00:{i % 60:02d}"
+
+    def test_group_commit_per_request(self, library):
+        with tana.app.test_request_context():
+            tana.log_action("delete", {"filename": "a.cbz"})
+            tana.log_action("delete", {"filename": "b.cbz"})
+            assert tana._history_db().execute("SELECT COUNT(*) FROM history").fetchone()[0] == 0
+        assert tana._history_db().execute("SELECT COUNT(*) FROM history").fetchone()[0] == 2
+
+    def test_newest_first_with_cursor(self, library):
+        self._log(5)
+        client = tana.app.test_client()
+        data = client.get("/api/history?limit=3").get_json()
+        assert [h["filename"] for h in data["history"]] == ["4.cbz", "3.cbz", "2.cbz"]
+        assert data["total"] == 5
+        data = client.get(f"/api/history?limit=3&cursor={data['next_cursor']}").get_json()
+        assert [h["filename"] for h in data["history"]] == ["1.cbz", "0.cbz"]
+        assert data["next_cursor"] is None
+
+    def test_invalid_cursor_rejected(self, library):
+        self._log(2)
+        client = tana.app.test_client()
+        files_cursor = tana._encode_cursor(("name", "a.cbz", "/src", "a.cbz"))
+        for cursor in ("garbage", files_cursor, tana._encode_cursor(("2026-01-01", "1"))):
+            res = client.get(f"/api/history?cursor={cursor}")
+            assert res.status_code == 400
+            assert res.get_json() == {"error": "Paramètre cursor invalide"}
+
+    def test_filters(self, library):
+        self._log(3, "organize", series="Naruto", day="2026-01-01")
+        self._log(2, "delete", day="2026-01-02")
+        client = tana.app.test_client()
+        data = client.get("/api/history?series=naruto").get_json()
+        assert (len(data["history"]), data["total"]) == (3, 3)
+        data = client.get("/api/history?action=delete").get_json()
+        assert (len(data["history"]), data["total"]) == (2, 2)
+        data = client.get("/api/history?since=2026-01-02").get_json()
+        assert [h["action"] for h in data["history"]] == ["delete", "delete"]
+        data = client.get("/api/history?until=2026-01-01T00:00:01").get_json()
+        assert [h["filename"] for h in data["history"]] == ["0.cbz"]
+
+    def test_stats(self, library):
+        self._log(3, "organize", day="2026-01-01")
+        self._log(2, "delete", day="2026-01-02")
+        stats = tana.history_stats()
+        assert stats["by_action"] == {"organize": 3, "delete": 2}
+        assert stats["by_day"] == [
+            {"day": "2026-01-01", "counts": {"organize": 3}, "total": 3},
+            {"day": "2026-01-02", "counts": {"delete": 2}, "total": 2},
+        ]
+
+    def test_legacy_json_imported(self, library):
+        tana.HISTORY_PATH.write_text(json.dumps([{"action": "delete", "filename": "new.cbz", "timestamp": "2026-01-02T00:00:00"},
+                                                 {"action": "delete", "filename": "old.cbz", "timestamp": "2026-01-01T00:00:00"}]))
+        assert [h["filename"] for h in tana.query_history()[0]] == ["new.cbz", "old.cbz"]
+        assert tana.HISTORY_PATH.with_name("history.json.bak").is_file()
+
+    def test_legacy_journal_imported(self, library):
+        tana.HISTORY_JOURNAL_PATH.write_text('{"action": "delete", "filename": "a.cbz", "timestamp": "2026-01-01T00:00:00"}\n{"act')
+        assert [h["filename"] for h in tana.iter_history()] == ["a.cbz"]
+        assert not tana.HISTORY_JOURNAL_PATH.exists()
+
+
+# ---------------------------------------------------------------------------
+# audit cache
+# ---------------------------------------------------------------------------
+
+class TestAuditCache:
+    @pytest.fixture
+    def series(self, library, monkeypatch):
+        monkeypatch.setattr(tana, "_audit_cache", {})
+        for name in ("Naruto", "Bleach"):
+            folder = library["dest"] / name
+            folder.mkdir(exist_ok=True)
+            for tome in (1, 3):
+                (folder / f"{name} - T{tome:02d}.cbz").write_bytes(b"x")
+            os.utime(folder, (1_000_000_000, 1_000_000_000))
+        os.utime(library["dest"], (1_000_000_000, 1_000_000_000))
+        calls = []
+        audit_series = tana._audit_series
+        monkeypatch.setattr(tana, "_audit_series", lambda name, *a, **k: calls.append(name) or audit_series(name, *a, **k))
+        return calls
+
+    def test_only_changed_series_reaudited(self, library, series):
+        first = tana.audit_collections()
+        assert sorted(series) == ["Bleach", "Naruto"]
+        series.clear()
+        (library["dest"] / "Naruto" / "Naruto - T02.cbz").write_bytes(b"x")
+        os.utime(library["dest"] / "Naruto", (1_000_000_100, 1_000_000_100))
+        second = tana.audit_collections()
+        assert series == ["Naruto"]
+        assert [s["missing_tomes"] for s in first["series"]] == [[2], [2]]
+        assert [s["missing_tomes"] for s in second["series"]] == [[2], []]
+
+    def test_template_change_reaudits(self, library, series):
+        tana.audit_collections()
+        series.clear()
+        cfg = json.loads(tana.CONFIG_PATH.read_text())
+        cfg["template"] = "{series} {tome:02d}{ext}"
+        tana.CONFIG_PATH.write_text(json.dumps(cfg))
+        result = tana.audit_collections()
+        assert sorted(series) == ["Bleach", "Naruto"]
+        assert all(s["naming_issues"] for s in result["series"])
+
+
+class TestAuditStream:
+    @pytest.fixture
+    def two_destinations(self, library, tmp_path):
+        comics = tmp_path / "comics"
+        (comics / "Batman").mkdir(parents=True)
+        (comics / "Batman" / "Batman - T01.cbz").write_bytes(b"x")
+        (library["dest"] / "Naruto" / "Naruto - T01.cbz").write_bytes(b"x")
+        cfg = json.loads(tana.CONFIG_PATH.read_text())
+        cfg["destinations"].append(str(comics))
+        tana.CONFIG_PATH.write_text(json.dumps(cfg))
+        return [library["dest"], comics]
+
+    def test_stream_reports_progress_and_summary(self, two_destinations):
+        res = tana.app.test_client().get("/api/audit?stream=1")
+        lines = [json.loads(line) for line in res.get_data(as_text=True).splitlines()]
+        assert "audit_id" in lines[0]
+        series = [line for line in lines if "series" in line]
+        assert sorted(s["series"]["series_name"] for s in series) == ["Batman", "Naruto"]
+        assert series[-1]["progress"] == {"done": 2, "total": 2}
+        assert lines[-1]["done"] is True and lines[-1]["cancelled"] is False
+        assert lines[-1]["summary"]["total_series"] == 2
+
+    def test_results_ordered_by_destination(self, two_destinations):
+        result = tana.audit_collections()
+        assert [s["dest_label"] for s in result["series"]] == ["manga", "comics"]
+
+    def test_cancelled_audit_stops(self, two_destinations):
+        cancel = tana.threading.Event()
+        cancel.set()
+        events = list(tana.iter_audit(cancel))
+        assert [kind for kind, _value in events] == ["total", "total"]
+        assert tana._catalog_db().execute("SELECT COUNT(*) FROM destinations").fetchone()[0] == 0
+
+    def test_cancel_unknown_audit(self, library):
+        res = tana.app.test_client().post("/api/audit/nope/cancel")
+        assert res.status_code == 404
+
+
+class TestAuditDetail:
+    def test_list_has_flags_only(self, library):
+        (library["dest"] / "Naruto" / "naruto t01.cbz").write_bytes(b"x")
+        row = tana.app.test_client().get("/api/audit").get_json()["series"][0]
+        assert "files" not in row and "naming_issues" not in row
+        assert (row["file_count"], row["naming_issue_count"], row["duplicate_tome_count"]) == (1, 1, 0)
+
+    def test_series_detail(self, library):
+        (library["dest"] / "Naruto" / "naruto t01.cbz").write_bytes(b"x")
+        res = tana.app.test_client().get("/api/audit/series", query_string={
+            "destination": str(library["dest"]), "series": "Naruto"})
+        detail = res.get_json()
+        assert [f["name"] for f in detail["files"]] == ["naruto t01.cbz"]
+        assert detail["naming_issues"][0]["expected"] == "Naruto - T01.cbz"
+
+    @pytest.mark.parametrize("destination,series,status", [
+        ("/elsewhere", "Naruto", 400),
+        (None, "Bleach", 404),
+        (None, "../manga", 404),
+    ])
+    def test_series_detail_errors(self, library, destination, series, status):
+        res = tana.app.test_client().get("/api/audit/series", query_string={
+            "destination": destination or str(library["dest"]), "series": series})
+        assert res.status_code == status
+        assert "error" in res.get_json()
+
+
+class TestDuplicates:
+    @pytest.fixture
+    def volumes(self, library, monkeypatch):
+        monkeypatch.setattr(tana, "HASH_BLOCK_SIZE", 4)
+        dest = library["dest"]
+        (dest / "Naruto" / "Naruto - T01.cbz").write_bytes(b"same-release-payload")
+        (dest / "Naruto (FR)").mkdir()
+        (dest / "Naruto (FR)" / "Naruto (FR) - T01.cbz").write_bytes(b"same-release-payload")
+        # same size, same head and tail blocks, different middle
+        (dest / "Naruto" / "Naruto - T02.cbz").write_bytes(b"same-XXXXXXX-payload")
+        return dest
+
+    def test_library_duplicates(self, volumes):
+        result = tana.app.test_client().get("/api/duplicates").get_json()
+        assert [[f["series_name"] for f in g["files"]] for g in result["groups"]] == [["Naruto", "Naruto (FR)"]]
+        assert result["reclaimable"] == len(b"same-release-payload")
+
+    def test_hashes_are_cached(self, volumes, monkeypatch):
+        tana.find_duplicates()
+        monkeypatch.setattr(tana, "_full_hash", lambda *a: pytest.fail("file re-hashed"))
+        monkeypatch.setattr(tana, "_partial_hash", lambda *a: pytest.fail("file re-hashed"))
+        assert len(tana.find_duplicates()["groups"]) == 1
+
+    def test_changed_file_rehashed(self, volumes):
+        tana.find_duplicates()
+        path = volumes / "Naruto (FR)" / "Naruto (FR) - T01.cbz"
+        path.write_bytes(b"same-release-PAYLOAD")
+        os.utime(path, ns=(1, 1))
+        assert tana.find_duplicates()["groups"] == []
+
+    def test_incoming_copy_needs_confirmation(self, library, volumes, monkeypatch):
+        tana.refresh_catalog()
+        tana.find_duplicates()  # library hashes cached
+        (library["source"] / "Naruto Vol 1.cbz").write_bytes(b"same-release-payload")
+        monkeypatch.setattr(tana, "_full_hash", lambda *a: pytest.fail("whole file hashed in the request"))
+        client = tana.app.test_client()
+        item = {"source": "Naruto Vol 1.cbz", "series_name": "Naruto", "destination": str(volumes), "tome": 3}
+        res = client.post("/api/organize-matched", json={"source_dir": str(library["source"]), "items": [item]}).get_json()
+        # partial hashes only: T02 (same head and tail) is a probable copy as well
+        assert res["results"][0]["duplicate_of"] in [str(p) for p in volumes.glob("*/*.cbz")]
+        assert "warning" in res["results"][0] and "error" not in res["results"][0]
+        assert (library["source"] / "Naruto Vol 1.cbz").exists()
+
+        res = client.post("/api/organize-matched", json={"source_dir": str(library["source"]),
+                                                         "items": [{**item, "force": True}]}).get_json()
+        assert res["results"][0]["success"]
+        assert (volumes / "Naruto" / "Naruto - T03.cbz").exists()
+
+
+class TestVerifier:
+    @staticmethod
+    def _cbz(path, payload=b"page-data" * 100):
+        import zipfile
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("001.jpg", payload)
+
+    @staticmethod
+    def _corrupt(path):
+        data = bytearray(path.read_bytes())
+        data[40] ^= 0xFF  # inside the compressed member: CRC mismatch
+        path.write_bytes(bytes(data))
+
+    def test_verify_archive(self, tmp_path):
+        good, bad = tmp_path / "good.cbz", tmp_path / "bad.cbz"
+        self._cbz(good)
+        self._cbz(bad)
+        self._corrupt(bad)
+        (tmp_path / "truncated.cbz").write_bytes(good.read_bytes()[:50])
+        assert tana.verify_archive(str(good)) is None
+        assert tana.verify_archive(str(bad))
+        assert tana.verify_archive(str(tmp_path / "truncated.cbz"))
+
+    def test_verdicts_cached(self, library, monkeypatch):
+        path = library["source"] / "Naruto T01.cbz"
+        self._cbz(path)
+        assert tana.verify_files([str(path)]) == 1
+        monkeypatch.setattr(tana, "verify_archive", lambda p: pytest.fail("archive verified twice"))
+        assert tana.verify_files([str(path)]) == 0
+
+    def test_unexpected_error_is_a_verdict(self, library, monkeypatch):
+        paths = [library["source"] / "Naruto T01.cbz", library["source"] / "Naruto T02.cbz"]
+        for path in paths:
+            self._cbz(path)
+
+        def verify(path):
+            if path.endswith("T01.cbz"):
+                raise NotImplementedError("compression type 9 (deflate64)")
+            return None
+
+        monkeypatch.setattr(tana, "verify_archive", verify)
+        assert tana.verify_files([str(p) for p in paths]) == 2
+        assert list(tana.corrupt_files()) == [str(paths[0])]
+
+    def test_corrupt_files_reported(self, library):
+        incoming = library["source"] / "Naruto T02.cbz"
+        volume = library["dest"] / "Naruto" / "Naruto - T01.cbz"
+        for path in (incoming, volume):
+            self._cbz(path)
+            self._corrupt(path)
+        tana.verify_files([str(incoming), str(volume)])
+        files = tana.list_files([str(library["source"])])
+        assert files[0]["corrupt"]
+        audit = tana.audit_collections()
+        assert [c["name"] for c in audit["series"][0]["corrupt_files"]] == ["Naruto - T01.cbz"]
+        assert audit["summary"]["corrupt_files"] == 1
+
+    def test_rewritten_file_reverified(self, library):
+        path = library["source"] / "Naruto T01.cbz"
+        self._cbz(path)
+        self._corrupt(path)
+        tana.verify_files([str(path)])
+        assert tana.list_files([str(library["source"])])[0]["corrupt"]
+        self._cbz(path)
+        os.utime(path, ns=(1, 1))
+        assert tana.list_files([str(library["source"])])[0]["corrupt"] is None
+        tana.verify_files([str(path)])
+        assert tana.corrupt_files() == {}
+
+
+class TestDashboardTotals:
+    def _totals(self):
+        return tana._catalog_db().execute(
+            "SELECT t.extension, SUM(t.volumes), SUM(t.bytes) FROM series_totals t GROUP BY t.extension"
+            " HAVING SUM(t.volumes) > 0 ORDER BY 1").fetchall()
+
+    def _recount(self):
+        return tana._catalog_db().execute(
+            "SELECT extension, COUNT(*), SUM(size) FROM volumes GROUP BY extension ORDER BY 1").fetchall()
+
+    def test_totals_follow_catalog_changes(self, library):
+        naruto = library["dest"] / "Naruto"
+        (naruto / "Naruto - T01.cbz").write_bytes(b"xx")
+        (naruto / "Naruto - T02.cbr").write_bytes(b"xxx")
+        tana.refresh_catalog()
+        assert self._totals() == self._recount() == [(".cbr", 1, 3), (".cbz", 1, 2)]
+        (naruto / "Naruto - T01.cbz").write_bytes(b"xxxxx")
+        (naruto / "Naruto - T02.cbr").unlink()
+        tana.refresh_catalog_series(str(library["dest"]), "Naruto")
+        assert self._totals() == self._recount() == [(".cbz", 1, 5)]
+        (naruto / "Naruto - T01.cbz").unlink()
+        naruto.rmdir()
+        tana.refresh_catalog()
+        assert self._totals() == []
+
+    def test_fix_naming_updates_dashboard(self, library):
+        naruto = library["dest"] / "Naruto"
+        (naruto / "naruto 1.cbz").write_bytes(b"xx")
+        client = tana.app.test_client()
+        assert client.get("/api/dashboard").get_json()["total_volumes"] == 1
+        client.post("/api/audit/fix-naming", json={"fixes": [{
+            "destination": str(library["dest"]), "series_name": "Naruto",
+            "current": "naruto 1.cbz", "expected": "Naruto - T01.cbz"}]})
+        names = [n for (n,) in tana._catalog_db().execute("SELECT name FROM volumes")]
+        assert names == ["Naruto - T01.cbz"]
+
+    def test_stale_while_revalidate(self, library, monkeypatch):
+        naruto = library["dest"] / "Naruto"
+        (naruto / "Naruto - T01.cbz").write_bytes(b"xx")
+        client = tana.app.test_client()
+        first = client.get("/api/dashboard").get_json()
+        assert (first["total_volumes"], first["reconciling"]) == (1, False)
+
+        (naruto / "Naruto - T02.cbz").write_bytes(b"xx")
+        monkeypatch.setattr(tana, "DASHBOARD_RECONCILE_INTERVAL", 0)
+        stale = client.get("/api/dashboard").get_json()
+        assert (stale["total_volumes"], stale["reconciling"]) == (1, True)
+        tana.reconcile_catalog_async().join()
+        assert client.get("/api/dashboard").get_json()["total_volumes"] == 2
+
+
+class TestPageStats:
+    @staticmethod
+    def _cbz(path, sizes):
+        import zipfile
+        from io import BytesIO
+        from PIL import Image
+        with zipfile.ZipFile(path, "w") as zf:
+            for i, size in enumerate(sizes):
+                buf = BytesIO()
+                Image.new("L", size).save(buf, "PNG")
+                zf.writestr(f"{i:03d}.png", buf.getvalue())
+            zf.writestr("info.txt", "not a page")
+
+    def test_archive_stats_from_headers(self, tmp_path, monkeypatch):
+        path = tmp_path / "v.cbz"
+        self._cbz(path, [(100, 150), (800, 1200), (800, 1200), (800, 1200), (800, 1200)])
+        monkeypatch.setattr(tana.Image.Image, "load", lambda self: pytest.fail("page decoded"))
+        assert tana.archive_stats(str(path)) == {"pages": 5, "formats": "png", "width": 800, "height": 1200}
+
+    def test_sampled_once_and_aggregated(self, library, monkeypatch):
+        naruto = library["dest"] / "Naruto"
+        self._cbz(naruto / "Naruto - T01.cbz", [(600, 900)] * 4)
+        self._cbz(naruto / "Naruto - T02.cbz", [(1000, 1500)] * 6)
+        tana.refresh_catalog()
+        assert tana.sample_archives() == 2
+        assert tana.sample_archives() == 0
+
+        stats = tana.app.test_client().get("/api/dashboard").get_json()["page_stats"]
+        assert (stats["sampled"], stats["pages"], stats["low_res"]) == (2, 10, 1)
+        row = tana.app.test_client().get("/api/audit").get_json()["series"][0]
+        assert row["page_stats"] == {"sampled": 2, "pages": 10, "avg_height": 1200, "low_res": 1}
+
+        # a renamed volume keeps its inode: statistics come from the cache
+        (naruto / "Naruto - T02.cbz").rename(naruto / "Naruto - T03.cbz")
+        tana.refresh_catalog_series(str(library["dest"]), "Naruto")
+        monkeypatch.setattr(tana, "archive_stats", lambda p: pytest.fail("archive read again"))
+        assert tana.sample_archives() == 1
+
+    def test_missing_volumes_do_not_stall_sampling(self, library):
+        naruto = library["dest"] / "Naruto"
+        for i in (1, 2, 3):
+            self._cbz(naruto / f"Naruto - T0{i}.cbz", [(600, 900)])
+        tana.refresh_catalog()
+        (naruto / "Naruto - T01.cbz").unlink()
+        (naruto / "Naruto - T02.cbz").unlink()
+        assert tana.sample_archives(limit=2) == 2
+        assert tana.sample_archives(limit=2) == 1
+        assert tana.sample_archives(limit=2) == 0
+
+
+class TestConvertCbr:
+    """The RAR side is played by zipfile, whose reader exposes the same interface as rarfile."""
+
+    @pytest.fixture
+    def cbr(self, tmp_path, monkeypatch):
+        import zipfile
+        path = tmp_path / "Naruto - T01.cbr"
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("Naruto/002.jpg", b"page two" * 1000)
+            zf.writestr("Naruto/001.jpg", b"page one" * 1000)
+            zf.writestr("Naruto/", b"")
+        monkeypatch.setattr(tana.rarfile, "RarFile", zipfile.ZipFile)
+        monkeypatch.setattr(tempfile, "TemporaryDirectory", lambda *a, **k: pytest.fail("extracted to disk"))
+        return path
+
+    def test_streamed_conversion(self, cbr):
+        import zipfile
+        result = tana.convert_cbr_to_cbz(cbr)
+        assert (result["verified"], result["files_count"]) == (True, 2)
+        with zipfile.ZipFile(result["cbz_path"]) as zf:
+            assert zf.namelist() == ["Naruto/001.jpg", "Naruto/002.jpg"]
+            assert zf.read("Naruto/002.jpg") == b"page two" * 1000
+            assert zf.infolist()[0].compress_type == zipfile.ZIP_STORED
+        assert cbr.exists()
+
+    def test_crc_mismatch_aborts(self, cbr, monkeypatch):
+        import zipfile
+
+        class BadCrc(zipfile.ZipFile):
+            def infolist(self):
+                infos = super().infolist()
+                infos[0].CRC ^= 1
+                return infos
+
+        monkeypatch.setattr(tana.rarfile, "RarFile", BadCrc)
+        with pytest.raises(ValueError, match="(?i)crc|corrompu"):  # the reader may catch it first
+            tana.convert_cbr_to_cbz(cbr)
+        assert not cbr.with_suffix(".cbz").exists()
+
+
+class TestConvertPdf:
+    @pytest.fixture
+    def pdf(self, tmp_path, monkeypatch):
+        import fitz
+        monkeypatch.setattr(tempfile, "TemporaryDirectory", lambda *a, **k: pytest.fail("rendered to disk"))
+        monkeypatch.setattr(zipfile.ZipFile, "testzip", lambda self: pytest.fail("CBZ re-read"))
+        path = tmp_path / "Artbook.pdf"
+        doc = fitz.open()
+        for i in range(20):
+            page = doc.new_page(width=100, height=150)
+            page.insert_text((10, 50), str(i + 1))
+        doc.save(str(path))
+        doc.close()
+        return path
+
+    def test_parallel_render_keeps_page_order(self, pdf):
+        import zipfile
+        sequential = tana.convert_pdf_to_cbz(pdf, dpi=150)["cbz_path"]
+        with zipfile.ZipFile(sequential) as zf:
+            expected = [(i.filename, zf.read(i)) for i in zf.infolist()]
+        sequential.unlink()
+
+        result = tana.convert_pdf_to_cbz(pdf, dpi=150, workers=2)
+        assert (result["files_count"], result["pages"]) == (20, 20)
+        with zipfile.ZipFile(result["cbz_path"]) as zf:
+            assert [(i.filename, zf.read(i)) for i in zf.infolist()] == expected
+        assert expected[0][0] == "page_0001.jpg" and expected[-1][0] == "page_0020.jpg"
+
+
+    def test_full_page_images_are_copied(self, tmp_path):
+        import zipfile
+        from io import BytesIO
+        import fitz
+        from PIL import Image
+        buf = BytesIO()
+        Image.new("RGB", (200, 300), (200, 10, 10)).save(buf, "JPEG")
+        jpeg = buf.getvalue()
+        path = tmp_path / "Scan.pdf"
+        doc = fitz.open()
+        for mixed in (False, True):
+            page = doc.new_page(width=100, height=150)
+            page.insert_image(page.rect, stream=jpeg)
+            if mixed:
+                page.insert_text((10, 50), "Chapitre 2")
+        page = doc.new_page(width=100, height=150)
+        page.insert_image(page.rect, stream=jpeg, rotate=90)
+        doc.save(str(path))
+        doc.close()
+
+        result = tana.convert_pdf_to_cbz(path, dpi=150)
+        assert (result["pages_copied"], result["pages_rendered"]) == (1, 2)
+        with zipfile.ZipFile(result["cbz_path"]) as zf:
+            assert zf.read("page_0001.jpg") == jpeg
+            assert zf.read("page_0002.jpg") != jpeg
+
+
+class TestConversionJobs:
+    @pytest.fixture
+    def pdf(self, library):
+        import fitz
+        path = library["dest"] / "Naruto" / "Naruto - T01.pdf"
+        doc = fitz.open()
+        for _ in range(2):
+            doc.new_page(width=100, height=150)
+        doc.save(str(path))
+        doc.close()
+        return path
+
+    def test_job_runs_in_background(self, library, pdf):
+        import time
+        client = tana.app.test_client()
+        res = client.post("/api/convert", json={"items": [{"path": str(pdf)}, {"path": "/etc/passwd"}]})
+        data = res.get_json()
+        assert [r["error"] for r in data["results"]] == ["Chemin non autorisé"]
+        deadline = time.monotonic() + 60
+        while (job := client.get(f"/api/convert/jobs/{data['job_id']}").get_json())["status"] == "running":
+            assert time.monotonic() < deadline
+            time.sleep(0.1)
+        assert (job["status"], job["done"], job["total"]) == ("done", 1, 1)
+        item = job["items"][0]
+        assert (item["status"], item["destination"], item["files_count"]) == ("done", "Naruto - T01.cbz", 2)
+        assert pdf.with_suffix(".cbz").is_file()
+        assert tana.query_history(action="convert")[0][0]["source"] == str(pdf)
+
+    def test_page_workers_share_the_cpus(self, library, pdf, monkeypatch):
+        monkeypatch.setattr(tana.os, "cpu_count", lambda: 8)
+        assert tana.page_workers(16, {"convert_workers": 2}) == 4
+        assert tana.page_workers(16, {"convert_workers": 16}) == 1
+        assert tana.page_workers(0, {"convert_workers": 1}) == 1
+        monkeypatch.setattr(tana, "start_converter", lambda: None)
+        client = tana.app.test_client()
+        for bad in ({"render_workers": "many"}, {"dpi": "high"}, {"jpeg_quality": None}, {"image_format": "gif"}):
+            res = client.post("/api/convert", json={"items": [{"path": str(pdf)}], **bad})
+            assert res.status_code == 400, bad
+
+    def test_cancel_drops_queued_items(self, library, pdf, monkeypatch):
+        monkeypatch.setattr(tana, "start_converter", lambda: None)
+        job_id = tana.submit_conversion([str(pdf), str(pdf)], {"delete_original": False})
+        assert tana._claim_conversion()[:2] == (job_id, 0)
+        res = tana.app.test_client().post(f"/api/convert/jobs/{job_id}/cancel")
+        assert [i["status"] for i in res.get_json()["items"]] == ["running", "cancelled"]
+        assert tana.app.test_client().post("/api/convert/jobs/999/cancel").status_code == 404
+
+    def test_restart_requeues_interrupted_items(self, library, pdf, monkeypatch):
+        monkeypatch.setattr(tana, "start_converter", lambda: None)
+        job_id = tana.submit_conversion([str(pdf)], {"delete_original": False})
+        tana._claim_conversion()
+        part = pdf.with_suffix(".cbz.part")
+        part.write_bytes(b"half")
+        tana._converting.clear()  # as after a restart
+        tana._resume_conversions()
+        assert tana.conversion_job(job_id)["items"][0]["status"] == "queued"
+        assert not part.exists()
+
+
+class TestRecompress:
+    @staticmethod
+    def make_cbz(path):
+        from io import BytesIO
+        from PIL import Image
+        img = Image.new("RGB", (300, 450))
+        img.putdata([((x * 7) % 256, (y * 3) % 256, (x * y) % 256) for y in range(450) for x in range(300)])
+        buf = BytesIO()
+        img.save(buf, "PNG")
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("ComicInfo.xml", "<ComicInfo/>")
+            zf.writestr("001.png", buf.getvalue())
+            zf.writestr("002.jpg", b"not an image")
+        return path
+
+    def test_pages_reencoded_when_smaller(self, tmp_path):
+        cbz = self.make_cbz(tmp_path / "Naruto - T01.cbz")
+        before = cbz.stat().st_size
+        result = tana.recompress_cbz(cbz, "webp", 80)
+        assert (result["files_count"], result["pages_recompressed"]) == (3, 1)
+        assert result["bytes_before"] == before and result["bytes_after"] == cbz.stat().st_size < before
+        with zipfile.ZipFile(cbz) as zf:
+            assert zf.namelist() == ["ComicInfo.xml", "001.webp", "002.jpg"]
+            assert zf.read("002.jpg") == b"not an image"
+        assert not cbz.with_name(cbz.name + ".part").exists()
+
+    def test_original_kept_when_nothing_shrinks(self, tmp_path):
+        cbz = tmp_path / "Naruto - T02.cbz"
+        with zipfile.ZipFile(cbz, "w") as zf:
+            zf.writestr("ComicInfo.xml", "<ComicInfo/>")
+            zf.writestr("001.jpg", b"not an image")
+        content = cbz.read_bytes()
+        result = tana.recompress_cbz(cbz, "webp", 80)
+        assert (result["pages_recompressed"], result["bytes_after"]) == (0, result["bytes_before"])
+        assert cbz.read_bytes() == content
+        assert not cbz.with_name(cbz.name + ".part").exists()
+
+    def test_target_format_pages_not_reencoded(self):
+        from io import BytesIO
+        from PIL import Image
+        buf = BytesIO()
+        Image.new("RGB", (300, 450), (200, 10, 10)).save(buf, "WEBP", quality=100, lossless=True)
+        assert tana._recompress_page("001.webp", buf.getvalue(), "webp", 30) == ("001.webp", buf.getvalue(), False)
+
+    def test_color_profile_and_exif_kept(self):
+        from io import BytesIO
+        from PIL import Image, ImageCms
+        icc = ImageCms.ImageCmsProfile(ImageCms.createProfile("sRGB")).tobytes()
+        exif = Image.Exif()
+        exif[0x0131] = "scanner"
+        img = Image.new("RGB", (300, 450))
+        img.putdata([((x * 7) % 256, (y * 3) % 256, (x * y) % 256) for y in range(450) for x in range(300)])
+        buf = BytesIO()
+        img.save(buf, "PNG", icc_profile=icc, exif=exif)
+        name, data, changed = tana._recompress_page("001.png", buf.getvalue(), "webp", 80)
+        assert changed
+        with Image.open(BytesIO(data)) as out:
+            assert out.info["icc_profile"] == icc
+            assert out.getexif()[0x0131] == "scanner"
+
+    def test_library_job_reports_savings_per_series(self, library):
+        import time
+        self.make_cbz(library["dest"] / "Naruto" / "Naruto - T01.cbz")
+        client = tana.app.test_client()
+        assert client.post("/api/recompress", json={"image_format": "bmp"}).status_code == 400
+        assert client.post("/api/recompress", json={"image_format": "webp", "quality": "high"}).status_code == 400
+        assert client.post("/api/recompress", json={"image_format": "webp", "workers": None}).status_code == 400
+        data = client.post("/api/recompress", json={"image_format": "webp", "quality": 80}).get_json()
+        assert data["volumes"] == 1
+        deadline = time.monotonic() + 60
+        while (job := client.get(f"/api/convert/jobs/{data['job_id']}").get_json())["status"] == "running":
+            assert time.monotonic() < deadline
+            time.sleep(0.1)
+        assert job["items"][0]["status"] == "done" and job["saved"] > 0
+        report = client.get("/api/recompress/report").get_json()
+        assert [(s["series"], s["volumes"], s["saved"]) for s in report["series"]] == [("Naruto", 1, job["saved"])]
+        assert tana.query_history(action="recompress")[0][0]["series"] == "Naruto"
+